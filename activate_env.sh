@@ -8,11 +8,21 @@ LOADSPIKER_ROOT="$SCRIPT_DIR"
 export PYTHONPATH="$LOADSPIKER_ROOT:$PYTHONPATH"
 export PATH="$LOADSPIKER_ROOT:$PATH"
 
+# Runtime tuning for the engine's worker threads (override by exporting first)
+export MALLOC_ARENA_MAX="${MALLOC_ARENA_MAX:-2}"
+export OMP_NUM_THREADS="${OMP_NUM_THREADS:-1}"
+
 echo "🚀 LoadSpiker environment activated"
 echo "   LoadSpiker root: $LOADSPIKER_ROOT"
 echo "   PYTHONPATH includes: $LOADSPIKER_ROOT"
+echo "   MALLOC_ARENA_MAX=$MALLOC_ARENA_MAX OMP_NUM_THREADS=$OMP_NUM_THREADS"
+echo "   Set LOADSPIKER_PIN_CPUS (e.g. 2-7) to pin the shell to those CPUs"
 echo "   You can now run: python3 cli.py [args]"
 echo "   Or import loadspiker in Python scripts"
 
-# Start a new shell with the environment
-exec "$SHELL"
+# Start a new shell with the environment, optionally pinned with taskset
+if [ -n "$LOADSPIKER_PIN_CPUS" ]; then
+    exec taskset -c "$LOADSPIKER_PIN_CPUS" "$SHELL"
+else
+    exec "$SHELL"
+fi
@@ -4,11 +4,14 @@ Supports CSV, JSON, and other data formats for data-driven testing
 """
 
 import csv
+import functools
+import itertools
 import json
+import os
 import random
 import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from enum import Enum
 
 
@@ -21,6 +24,97 @@ class DataStrategy(Enum):
     SHARED = "shared"
 
 
+def _convert_csv_value(value: str) -> Any:
+    """Convert a CSV cell to None, bool, int or float where it looks like one"""
+    # The cases are disjoint, so test the most common (digits) first
+    if value.isdigit():
+        return int(value)
+    if not value:
+        return None
+    if '.' in value:
+        # Try to convert to float
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    if len(value) <= 5:
+        lowered = value.lower()
+        if lowered == "true":
+            return True
+        if lowered == "false":
+            return False
+    return value
+
+
+def _process_csv_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
+    """Process and convert row data types"""
+    processed = {}
+    
+    for key, value in row.items():
+        # Clean up key names
+        clean_key = key.strip()
+        
+        # Convert value types
+        processed[clean_key] = _convert_csv_value(value)
+                
+    # Add metadata
+    processed['_row_number'] = row_num
+    return processed
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_csv(path: str, mtime_ns: int, size: int, encoding: str,
+               delimiter: str, skip_empty_rows: bool) -> Tuple[Dict[str, Any], ...]:
+    """
+    Parse and convert a CSV file's rows
+    
+    mtime_ns and size are only part of the cache key, so an edited file is
+    parsed again. Callers must copy the returned rows before handing them out.
+    """
+    with open(path, 'r', encoding=encoding, newline='') as csvfile:
+        # csv.reader rows are zipped with header keys stripped once,
+        # instead of building a DictReader dict and re-stripping per row
+        reader = csv.reader(csvfile, delimiter=delimiter)
+        data = []
+        fieldnames = next(reader, None)
+        
+        if fieldnames is not None:
+            keys = [key.strip() for key in fieldnames]
+            width = len(keys)
+            convert = _convert_csv_value
+            append = data.append
+            row_num = 0
+            
+            for row in reader:
+                # Blank lines are not rows (as with DictReader)
+                if not row:
+                    continue
+                row_num += 1
+                
+                if len(row) != width:
+                    # Ragged row: same dict DictReader would build
+                    raw = dict(zip(fieldnames, row))
+                    if len(row) < width:
+                        raw.update(dict.fromkeys(fieldnames[len(row):]))
+                    else:
+                        raw[None] = row[width:]
+                    if skip_empty_rows and not any(raw.values()):
+                        continue
+                    append(_process_csv_row(raw, row_num))
+                    continue
+                
+                # Skip empty rows if configured
+                if skip_empty_rows and not any(row):
+                    continue
+                
+                # Convert data types
+                processed_row = {key: convert(value) for key, value in zip(keys, row)}
+                processed_row['_row_number'] = row_num
+                append(processed_row)
+    
+    return tuple(data)
+
+
 class DataSource(ABC):
     """Abstract base class for data sources"""
     
@@ -65,28 +159,17 @@ class CSVDataSource(DataSource):
     def load_data(self) -> List[Dict[str, Any]]:
         """Load data from CSV file"""
         try:
-            with open(self.file_path, 'r', encoding=self.encoding, newline='') as csvfile:
-                # Detect delimiter if not specified
-                if self.delimiter == "auto":
+            # Detect delimiter if not specified
+            if self.delimiter == "auto":
+                with open(self.file_path, 'r', encoding=self.encoding, newline='') as csvfile:
                     sample = csvfile.read(1024)
-                    csvfile.seek(0)
                     sniffer = csv.Sniffer()
                     self.delimiter = sniffer.sniff(sample).delimiter
-                
-                reader = csv.DictReader(csvfile, delimiter=self.delimiter)
-                self.data = []
-                
-                for row_num, row in enumerate(reader, 1):
-                    # Skip empty rows if configured
-                    if self.skip_empty_rows and not any(row.values()):
-                        continue
-                        
-                    # Convert data types
-                    processed_row = self._process_row(row, row_num)
-                    self.data.append(processed_row)
-                
-                self.loaded = True
-                return self.data
+            
+            # Parsed rows are cached until the file's mtime or size changes
+            stat = os.stat(self.file_path)
+            rows = _parse_csv(os.path.abspath(self.file_path), stat.st_mtime_ns, stat.st_size,
+                              self.encoding, self.delimiter, self.skip_empty_rows)
                 
         except FileNotFoundError:
             raise FileNotFoundError(f"CSV data file not found: {self.file_path}")
@@ -94,35 +177,15 @@ class CSVDataSource(DataSource):
             raise ValueError(f"CSV parsing error in {self.file_path}: {e}")
         except UnicodeDecodeError as e:
             raise ValueError(f"Encoding error in {self.file_path}: {e}. Try different encoding.")
+        
+        # Each source gets its own row dicts, so the cached rows never change
+        self.data = [dict(row) for row in rows]
+        self.loaded = True
+        return self.data
             
     def _process_row(self, row: Dict[str, str], row_num: int) -> Dict[str, Any]:
         """Process and convert row data types"""
-        processed = {}
-        
-        for key, value in row.items():
-            # Clean up key names
-            clean_key = key.strip()
-            
-            # Convert value types
-            if value == "":
-                processed[clean_key] = None
-            elif value.lower() in ("true", "false"):
-                processed[clean_key] = value.lower() == "true"
-            elif value.isdigit():
-                processed[clean_key] = int(value)
-            else:
-                # Try to convert to float
-                try:
-                    if '.' in value:
-                        processed[clean_key] = float(value)
-                    else:
-                        processed[clean_key] = value
-                except ValueError:
-                    processed[clean_key] = value
-                    
-        # Add metadata
-        processed['_row_number'] = row_num
-        return processed
+        return _process_csv_row(row, row_num)
         
     def validate_data(self) -> bool:
         """Validate CSV data"""
@@ -148,7 +211,8 @@ class DataDistributor:
     def __init__(self, data_source: DataSource, strategy: DataStrategy = DataStrategy.SEQUENTIAL):
         self.data_source = data_source
         self.strategy = strategy
-        self.current_index = 0
+        # CIRCULAR position; next() on itertools.count is atomic under the GIL
+        self._circular_counter = itertools.count()
         self.used_indices = set()
         self.lock = threading.Lock()
         
@@ -158,40 +222,59 @@ class DataDistributor:
         data_source.validate_data()
         
     def get_data_for_user(self, user_id: int) -> Dict[str, Any]:
-        """Get data row for specific user"""
-        with self.lock:
-            data_count = self.data_source.get_row_count()
+        """
+        Get data row for specific user
+        
+        The row is shared with every user that draws it; copy it before
+        modifying.
+        """
+        # Only UNIQUE has a check-then-update step that needs the lock
+        if self.strategy is DataStrategy.UNIQUE:
+            with self.lock:
+                return self._next_row(user_id)
+        return self._next_row(user_id)
             
-            if data_count == 0:
-                raise ValueError("No data available")
-                
-            if self.strategy == DataStrategy.SEQUENTIAL:
-                index = user_id % data_count
-                
-            elif self.strategy == DataStrategy.RANDOM:
-                index = random.randint(0, data_count - 1)
-                
-            elif self.strategy == DataStrategy.CIRCULAR:
-                index = self.current_index % data_count
-                self.current_index += 1
-                
-            elif self.strategy == DataStrategy.UNIQUE:
-                if len(self.used_indices) >= data_count:
-                    raise ValueError("No more unique data available")
-                    
-                # Find unused index
-                available_indices = set(range(data_count)) - self.used_indices
-                index = min(available_indices)  # Take first available
-                self.used_indices.add(index)
-                
-            elif self.strategy == DataStrategy.SHARED:
-                # All users get the same first row
-                index = 0
-                
-            else:
-                raise ValueError(f"Unknown data strategy: {self.strategy}")
+    def get_data_for_users(self, user_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get data rows for a batch of users (UNIQUE takes the lock once)"""
+        if self.strategy is DataStrategy.UNIQUE:
+            with self.lock:
+                return [self._next_row(user_id) for user_id in user_ids]
+        return [self._next_row(user_id) for user_id in user_ids]
+            
+    def _next_row(self, user_id: int) -> Dict[str, Any]:
+        """Pick the row for a user; caller holds the lock for UNIQUE"""
+        rows = self.data_source.data
+        data_count = len(rows)
+        
+        if data_count == 0:
+            raise ValueError("No data available")
+            
+        if self.strategy == DataStrategy.SEQUENTIAL:
+            index = user_id % data_count
+            
+        elif self.strategy == DataStrategy.RANDOM:
+            index = random.randint(0, data_count - 1)
+            
+        elif self.strategy == DataStrategy.CIRCULAR:
+            index = next(self._circular_counter) % data_count
+            
+        elif self.strategy == DataStrategy.UNIQUE:
+            if len(self.used_indices) >= data_count:
+                raise ValueError("No more unique data available")
                 
-            return self.data_source.data[index].copy()
+            # Rows are handed out in order, so the first unused index is
+            # always the number used so far
+            index = len(self.used_indices)
+            self.used_indices.add(index)
+            
+        elif self.strategy == DataStrategy.SHARED:
+            # All users get the same first row
+            index = 0
+            
+        else:
+            raise ValueError(f"Unknown data strategy: {self.strategy}")
+            
+        return rows[index]
             
     def get_stats(self) -> Dict[str, Any]:
         """Get distribution statistics"""
@@ -230,6 +313,21 @@ class DataManager:
             
         return self.data_sources[source_name].get_data_for_user(user_id)
         
+    def get_user_data_batch(self, user_ids: List[int],
+                            source_names: Optional[List[str]] = None) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """Get data from all (or the named) sources for a batch of users, one pass per source"""
+        user_ids = list(user_ids)
+        batch: Dict[int, Dict[str, Dict[str, Any]]] = {user_id: {} for user_id in user_ids}
+        
+        for source_name in (self.data_sources if source_names is None else source_names):
+            if source_name not in self.data_sources:
+                raise ValueError(f"Data source '{source_name}' not found")
+            distributor = self.data_sources[source_name]
+            for user_id, row in zip(user_ids, distributor.get_data_for_users(user_ids)):
+                batch[user_id][source_name] = row
+                
+        return batch
+        
     def get_all_user_data(self, user_id: int) -> Dict[str, Dict[str, Any]]:
         """Get data from all sources for user"""
         all_data = {}
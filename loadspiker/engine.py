@@ -26,6 +26,7 @@ Example usage:
 import sys
 import os
 import importlib.util
+import itertools
 import time
 from typing import List, Dict, Any, Optional, Callable, Union, TYPE_CHECKING, TypedDict
 
@@ -50,10 +51,23 @@ class MetricsDict(TypedDict, total=False):
     max_response_time_ms: float
     avg_response_time_ms: float
     requests_per_second: float
+    p50_us: int
     p95_us: int
     p99_us: int
 
 
+class MetricsSnapshot(dict):
+    """
+    Metrics dict returned by Engine.get_metrics()
+    
+    ``version`` only changes when one of the metric values does, so consumers
+    can skip re-evaluating an unchanged snapshot. It is an attribute rather
+    than a key so it never shows up when the metrics are iterated or reported.
+    """
+    
+    __slots__ = ('version',)
+
+
 class ProtocolDataDict(TypedDict, total=False):
     """Type definition for protocol-specific data in responses."""
     # TCP/UDP specific
@@ -201,6 +215,9 @@ if not _c_extension_available:
     print("ℹ️  C extension not available")
     print("   Falling back to Python-only implementation")
 
+# Process-wide so a version number never identifies snapshots from two engines
+_metrics_versions = itertools.count(1)
+
 
 # Fallback Python implementation when C extension is not available
 class _PythonEngine:
@@ -292,6 +309,21 @@ class _PythonEngine:
                 'error_message': str(e)
             }
     
+    def execute_requests(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute requests in order, sleeping delay_ms after each"""
+        responses = []
+        for req in requests:
+            responses.append(self.execute_request(
+                url=req['url'],
+                method=req.get('method', 'GET'),
+                headers=req.get('headers', ''),
+                body=req.get('body', ''),
+                timeout_ms=req.get('timeout_ms', 30000)
+            ))
+            if req.get('delay_ms'):
+                time.sleep(req['delay_ms'] / 1000.0)
+        return responses
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
         return self._metrics.copy()
@@ -1020,6 +1052,8 @@ class Engine:
         
         self.max_connections = max_connections
         self.worker_threads = worker_threads
+        self._last_metrics: Optional[Dict[str, Any]] = None
+        self._metrics_version = 0
     
     def execute_request(self, url: str, method: str = "GET", 
                        headers: Optional[Dict[str, str]] = None,
@@ -1049,6 +1083,39 @@ class Engine:
             timeout_ms=timeout_ms
         )
     
+    def execute_requests(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute a list of HTTP requests in order in a single engine call
+        
+        Args:
+            requests: Request dictionaries with url and optional method,
+                headers (dictionary or string), body, timeout_ms and
+                delay_ms (pause after the request)
+            
+        Returns:
+            List of response dictionaries, one per request
+            
+        Raises:
+            RuntimeError: If the engine fails to execute a request. The
+                session stops there, and the exception's ``responses``
+                attribute holds the responses of the requests before it.
+        """
+        batch = []
+        for req in requests:
+            headers = req.get('headers')
+            if isinstance(headers, dict):
+                headers = "\n".join([f"{k}: {v}" for k, v in headers.items()])
+            batch.append({
+                'url': req['url'],
+                'method': req.get('method', 'GET'),
+                'headers': headers or "",
+                'body': req.get('body', ''),
+                'timeout_ms': req.get('timeout_ms', 30000),
+                'delay_ms': req.get('delay_ms', 0),
+            })
+        
+        return self._engine.execute_requests(batch)
+    
     def run_scenario(self, scenario: "Scenario", users: int = 10, 
                     duration: int = 60, ramp_up_duration: int = 0) -> Dict[str, Any]:
         """
@@ -1101,9 +1168,20 @@ class Engine:
             
             time.sleep(1)
     
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get current performance metrics"""
-        return self._engine.get_metrics()
+    def get_metrics(self) -> MetricsSnapshot:
+        """
+        Get current performance metrics
+        
+        The returned dict's ``version`` attribute only changes when one of the
+        metric values does (see MetricsSnapshot).
+        """
+        metrics = self._engine.get_metrics()
+        if metrics != self._last_metrics:
+            self._last_metrics = metrics.copy()
+            self._metrics_version = next(_metrics_versions)
+        snapshot = MetricsSnapshot(metrics)
+        snapshot.version = self._metrics_version
+        return snapshot
     
     def reset_metrics(self):
         """Reset performance metrics"""
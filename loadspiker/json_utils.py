@@ -0,0 +1,33 @@
+"""
+JSON encoding helpers shared by scenario builders and session utilities
+"""
+
+import json
+from typing import Any
+
+# Optional fast JSON encoder/decoder for request bodies and HAR files
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
+
+def dumps_json(data: Any) -> str:
+    """
+    Serialize a request body, using orjson when it is installed
+    
+    Input orjson rejects but json accepts (such as integers wider than
+    64 bits) is serialized with json, so orjson never turns a valid body
+    into an error. Both produce compact output, so the body does not
+    depend on which encoder ran.
+    """
+    if _orjson_available:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(data, separators=(',', ':'))
+
+
+loads_json = orjson.loads if _orjson_available else json.loads
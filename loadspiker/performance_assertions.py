@@ -6,14 +6,26 @@ rather than individual request responses.
 """
 
 import statistics
-from typing import Any, Dict, List, Callable, Optional, Union
+from typing import Any, Dict, List, Callable, Optional, Tuple, Union
 
 # Base class for performance assertions (standalone, doesn't depend on regular assertions)
 class PerformanceAssertion:
     """Base class for performance assertions that work with aggregated metrics"""
     
+    __slots__ = ('message', '_cached_version', '_cached_result')
+    
+    # Whether results may be reused for an unchanged metrics snapshot. Only
+    # classes that set this themselves opt in; subclasses never inherit it
+    _cacheable = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._cacheable = cls.__dict__.get('_cacheable', False)
+    
     def __init__(self, message: str = ""):
         self.message = message
+        self._cached_version = None
+        self._cached_result = None
     
     def check(self, response: Dict[str, Any]) -> bool:
         """
@@ -29,21 +41,48 @@ class PerformanceAssertion:
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
         """Get detailed error message for failed metric assertion"""
         return self.message or "Performance assertion failed"
+    
+    def _evaluate_cached(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        _evaluate_metrics() memoized on the snapshot's ``version`` attribute.
+        
+        Engine.get_metrics() only bumps the version when a value changes, so
+        periodic checks during quiet periods, and the error message for a
+        failed check, reuse the previous (passed, actual_value) pair. Plain
+        dicts carry no version and are always evaluated.
+        """
+        version = getattr(metrics, 'version', None)
+        if version is None or not self._cacheable:
+            return self._evaluate_metrics(metrics)
+        if version == self._cached_version:
+            return self._cached_result
+        result = self._evaluate_metrics(metrics)
+        self._cached_version = version
+        self._cached_result = result
+        return result
 
 
 class ThroughputAssertion(PerformanceAssertion):
     """Assert minimum requests per second"""
     
+    __slots__ = ('min_rps',)
+    _cacheable = True
+    
     def __init__(self, min_rps: float, message: str = ""):
         super().__init__(message)
         self.min_rps = min_rps
     
     def check_metrics(self, metrics: Dict[str, Any]) -> bool:
-        actual_rps = metrics.get('requests_per_second', 0.0)
-        return actual_rps >= self.min_rps
+        return self._evaluate_cached(metrics)[0]
     
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
+        return self._format_metrics_error(self._evaluate_cached(metrics)[1])
+    
+    def _evaluate_metrics(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
         actual_rps = metrics.get('requests_per_second', 0.0)
+        return actual_rps >= self.min_rps, actual_rps
+    
+    def _format_metrics_error(self, actual_rps: Any) -> str:
         return (self.message or 
                 f"Throughput {actual_rps:.2f} RPS is below minimum {self.min_rps} RPS")
 
@@ -51,16 +90,24 @@ class ThroughputAssertion(PerformanceAssertion):
 class AverageResponseTimeAssertion(PerformanceAssertion):
     """Assert maximum average response time"""
     
+    __slots__ = ('max_avg_ms',)
+    _cacheable = True
+    
     def __init__(self, max_avg_ms: float, message: str = ""):
         super().__init__(message)
         self.max_avg_ms = max_avg_ms
     
     def check_metrics(self, metrics: Dict[str, Any]) -> bool:
-        actual_avg_ms = metrics.get('avg_response_time_ms', 0.0)
-        return actual_avg_ms <= self.max_avg_ms
+        return self._evaluate_cached(metrics)[0]
     
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
+        return self._format_metrics_error(self._evaluate_cached(metrics)[1])
+    
+    def _evaluate_metrics(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
         actual_avg_ms = metrics.get('avg_response_time_ms', 0.0)
+        return actual_avg_ms <= self.max_avg_ms, actual_avg_ms
+    
+    def _format_metrics_error(self, actual_avg_ms: Any) -> str:
         return (self.message or 
                 f"Average response time {actual_avg_ms:.2f}ms exceeds limit {self.max_avg_ms}ms")
 
@@ -68,29 +115,30 @@ class AverageResponseTimeAssertion(PerformanceAssertion):
 class ErrorRateAssertion(PerformanceAssertion):
     """Assert maximum error rate percentage"""
     
+    __slots__ = ('max_error_rate',)
+    _cacheable = True
+    
     def __init__(self, max_error_rate: float, message: str = ""):
         super().__init__(message)
         self.max_error_rate = max_error_rate
     
     def check_metrics(self, metrics: Dict[str, Any]) -> bool:
-        total_requests = metrics.get('total_requests', 0) or 0
-        failed_requests = metrics.get('failed_requests', 0) or 0
-        
-        if total_requests == 0:
-            return True  # No requests means no errors
-        
-        error_rate = (failed_requests / total_requests) * 100
-        return error_rate <= self.max_error_rate
+        return self._evaluate_cached(metrics)[0]
     
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
+        return self._format_metrics_error(self._evaluate_cached(metrics)[1])
+    
+    def _evaluate_metrics(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
         total_requests = metrics.get('total_requests', 0) or 0
         failed_requests = metrics.get('failed_requests', 0) or 0
         
         if total_requests == 0:
-            error_rate = 0.0
-        else:
-            error_rate = (failed_requests / total_requests) * 100
+            return True, 0.0  # No requests means no errors
         
+        error_rate = (failed_requests / total_requests) * 100
+        return error_rate <= self.max_error_rate, error_rate
+    
+    def _format_metrics_error(self, error_rate: Any) -> str:
         return (self.message or 
                 f"Error rate {error_rate:.2f}% exceeds limit {self.max_error_rate}%")
 
@@ -98,18 +146,25 @@ class ErrorRateAssertion(PerformanceAssertion):
 class MaxResponseTimeAssertion(PerformanceAssertion):
     """Assert maximum response time is below threshold"""
     
+    __slots__ = ('max_time_ms',)
+    _cacheable = True
+    
     def __init__(self, max_time_ms: float, message: str = ""):
         super().__init__(message)
         self.max_time_ms = max_time_ms
     
     def check_metrics(self, metrics: Dict[str, Any]) -> bool:
-        max_time_us = metrics.get('max_response_time_us', 0)
-        max_time_ms = max_time_us / 1000
-        return max_time_ms <= self.max_time_ms
+        return self._evaluate_cached(metrics)[0]
     
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
+        return self._format_metrics_error(self._evaluate_cached(metrics)[1])
+    
+    def _evaluate_metrics(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
         max_time_us = metrics.get('max_response_time_us', 0)
         max_time_ms = max_time_us / 1000
+        return max_time_ms <= self.max_time_ms, max_time_ms
+    
+    def _format_metrics_error(self, max_time_ms: Any) -> str:
         return (self.message or 
                 f"Maximum response time {max_time_ms:.2f}ms exceeds limit {self.max_time_ms}ms")
 
@@ -117,29 +172,30 @@ class MaxResponseTimeAssertion(PerformanceAssertion):
 class SuccessRateAssertion(PerformanceAssertion):
     """Assert minimum success rate percentage"""
     
+    __slots__ = ('min_success_rate',)
+    _cacheable = True
+    
     def __init__(self, min_success_rate: float, message: str = ""):
         super().__init__(message)
         self.min_success_rate = min_success_rate
     
     def check_metrics(self, metrics: Dict[str, Any]) -> bool:
-        total_requests = metrics.get('total_requests', 0) or 0
-        successful_requests = metrics.get('successful_requests', 0) or 0
-        
-        if total_requests == 0:
-            return True  # No requests means 100% success rate
-        
-        success_rate = (successful_requests / total_requests) * 100
-        return success_rate >= self.min_success_rate
+        return self._evaluate_cached(metrics)[0]
     
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
+        return self._format_metrics_error(self._evaluate_cached(metrics)[1])
+    
+    def _evaluate_metrics(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
         total_requests = metrics.get('total_requests', 0) or 0
         successful_requests = metrics.get('successful_requests', 0) or 0
         
         if total_requests == 0:
-            success_rate = 100.0
-        else:
-            success_rate = (successful_requests / total_requests) * 100
+            return True, 100.0  # No requests means 100% success rate
         
+        success_rate = (successful_requests / total_requests) * 100
+        return success_rate >= self.min_success_rate, success_rate
+    
+    def _format_metrics_error(self, success_rate: Any) -> str:
         return (self.message or 
                 f"Success rate {success_rate:.2f}% is below minimum {self.min_success_rate}%")
 
@@ -147,16 +203,24 @@ class SuccessRateAssertion(PerformanceAssertion):
 class TotalRequestsAssertion(PerformanceAssertion):
     """Assert minimum total number of requests processed"""
     
+    __slots__ = ('min_requests',)
+    _cacheable = True
+    
     def __init__(self, min_requests: int, message: str = ""):
         super().__init__(message)
         self.min_requests = min_requests
     
     def check_metrics(self, metrics: Dict[str, Any]) -> bool:
-        total_requests = metrics.get('total_requests', 0)
-        return total_requests >= self.min_requests
+        return self._evaluate_cached(metrics)[0]
     
     def get_metrics_error_message(self, metrics: Dict[str, Any]) -> str:
+        return self._format_metrics_error(self._evaluate_cached(metrics)[1])
+    
+    def _evaluate_metrics(self, metrics: Dict[str, Any]) -> Tuple[bool, Any]:
         total_requests = metrics.get('total_requests', 0)
+        return total_requests >= self.min_requests, total_requests
+    
+    def _format_metrics_error(self, total_requests: Any) -> str:
         return (self.message or 
                 f"Total requests {total_requests} is below minimum {self.min_requests}")
 
@@ -164,6 +228,8 @@ class TotalRequestsAssertion(PerformanceAssertion):
 class CustomPerformanceAssertion(PerformanceAssertion):
     """Custom performance assertion using user-defined function"""
     
+    __slots__ = ('assertion_func',)
+    
     def __init__(self, assertion_func: Callable[[Dict[str, Any]], bool], message: str = ""):
         super().__init__(message)
         self.assertion_func = assertion_func
@@ -181,8 +247,12 @@ class CustomPerformanceAssertion(PerformanceAssertion):
 class PerformanceAssertionGroup:
     """Group of performance assertions with AND/OR logic"""
     
+    __slots__ = ('logic', 'assertions', 'failed_assertions')
+    
     def __init__(self, logic: str = "AND"):
         self.logic = logic.upper()
+        if self.logic not in ("AND", "OR"):
+            raise ValueError(f"Unknown logic operator: {self.logic}")
         self.assertions: List[PerformanceAssertion] = []
         self.failed_assertions: List[tuple] = []  # (assertion, error_message)
     
@@ -192,23 +262,33 @@ class PerformanceAssertionGroup:
         return self
     
     def check_all_metrics(self, metrics: Dict[str, Any]) -> bool:
-        """Check all assertions in group against metrics"""
-        self.failed_assertions = []
-        results = []
-        
-        for assertion in self.assertions:
-            passed = assertion.check_metrics(metrics)
-            if not passed:
-                error_msg = assertion.get_metrics_error_message(metrics)
-                self.failed_assertions.append((assertion, error_msg))
-            results.append(passed)
+        """
+        Check assertions in group against metrics, stopping as soon as the
+        group outcome is known.
         
+        An AND group stops at the first failure and records only that
+        failure. An OR group stops at the first pass and clears the
+        recorded failures, since a passing group has nothing to report.
+        """
         if self.logic == "AND":
-            return all(results)
-        elif self.logic == "OR":
-            return any(results)
-        else:
-            raise ValueError(f"Unknown logic operator: {self.logic}")
+            for assertion in self.assertions:
+                if not assertion.check_metrics(metrics):
+                    error_msg = assertion.get_metrics_error_message(metrics)
+                    self.failed_assertions = [(assertion, error_msg)]
+                    return False
+            self.failed_assertions = []
+            return True
+        
+        # An OR group only reaches the end when every assertion failed, so the
+        # list is sized up front and filled by index
+        failed = [None] * len(self.assertions)
+        for i, assertion in enumerate(self.assertions):
+            if assertion.check_metrics(metrics):
+                self.failed_assertions = []
+                return True
+            failed[i] = (assertion, assertion.get_metrics_error_message(metrics))
+        self.failed_assertions = failed
+        return False
     
     def get_failure_report(self) -> str:
         """Get detailed failure report"""
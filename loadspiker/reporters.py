@@ -3,10 +3,91 @@ Result reporting and visualization utilities
 """
 
 import json
+import math
+import sys
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+# Optional fast JSON encoder/decoder
+try:
+    import orjson
+    _orjson_available = True
+except ImportError:
+    _orjson_available = False
+
+# Optional Numba JIT for progress aggregation
+try:
+    import numpy as np
+    from numba import njit
+    _numba_available = True
+except ImportError:
+    _numba_available = False
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize to JSON with orjson when installed, compact unless indent is set
+    
+    Anything orjson rejects but json accepts (such as integers wider than
+    64 bits) is written with json instead, so a report never fails just
+    because orjson is installed.
+    """
+    if _orjson_available:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            pass
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+_json_loads = orjson.loads if _orjson_available else json.loads
+
+
+class FixedWidthHistogram:
+    """
+    Bounded log-scale histogram for response time percentiles
+    
+    Recording is O(1) and memory is fixed at ``bucket_count`` counters no
+    matter how many samples are seen. Percentiles are resolved to the upper
+    edge of the matching bucket, so they are approximate but never low.
+    """
+    
+    def __init__(self, max_expected_us: float = 60_000_000, bucket_count: int = 1000):
+        self.max_expected_us = max_expected_us
+        self.bucket_count = bucket_count
+        self.scale = (bucket_count - 1) / math.log1p(max_expected_us)
+        self.counts = array('q', [0]) * bucket_count
+        self.count = 0
+        
+    def record(self, us: float):
+        """Record a single response time in microseconds"""
+        idx = int(math.log1p(max(us, 0)) * self.scale)
+        self.counts[min(self.bucket_count - 1, idx)] += 1
+        self.count += 1
+        
+    def percentile(self, p: float) -> float:
+        """Approximate the given percentile (0-100) in microseconds"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100))
+        running = 0
+        for idx, bucket in enumerate(self.counts):
+            running += bucket
+            if running >= target:
+                return min(self.max_expected_us, math.expm1((idx + 1) / self.scale))
+        return float(self.max_expected_us)
+        
+    def reset(self):
+        """Discard all recorded samples"""
+        self.counts = array('q', [0]) * self.bucket_count
+        self.count = 0
+
 
 class BaseReporter:
     """Base class for test result reporters"""
@@ -14,6 +95,7 @@ class BaseReporter:
     def __init__(self):
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
+        self.response_times = FixedWidthHistogram()
         
     def start_reporting(self):
         """Called when test starts"""
@@ -30,6 +112,19 @@ class BaseReporter:
     def report_progress(self, elapsed_time: float, metrics: Dict[str, Any]):
         """Report progress during test execution"""
         pass
+    
+    def record_response_time(self, response_time_us: float):
+        """Record an individual response time for percentile reporting"""
+        self.response_times.record(response_time_us)
+
+
+# Success rate thresholds for the console status line, highest first
+_STATUS_TIERS = (
+    (95, "🟢 Test Status: EXCELLENT"),
+    (90, "🟡 Test Status: GOOD"),
+    (80, "🟠 Test Status: FAIR"),
+    (float('-inf'), "🔴 Test Status: POOR"),
+)
 
 
 class ConsoleReporter(BaseReporter):
@@ -54,37 +149,45 @@ class ConsoleReporter(BaseReporter):
         
     def report_metrics(self, metrics: Dict[str, Any]):
         """Print formatted metrics to console"""
-        print("\n📊 Final Test Results")
-        print("=" * 40)
-        
         # Request statistics
         total = metrics.get('total_requests', 0)
         successful = metrics.get('successful_requests', 0)
         failed = metrics.get('failed_requests', 0)
         success_rate = (successful / total * 100) if total > 0 else 0
         
-        print(f"Total Requests:     {total:,}")
-        print(f"Successful:         {successful:,}")
-        print(f"Failed:             {failed:,}")
-        print(f"Success Rate:       {success_rate:.2f}%")
-        
-        # Performance metrics
-        print(f"\nRequests/sec:       {metrics.get('requests_per_second', 0):.2f}")
-        print(f"Avg Response Time:  {metrics.get('avg_response_time_ms', 0):.2f} ms")
-        print(f"Min Response Time:  {metrics.get('min_response_time_us', 0) / 1000:.2f} ms")
-        print(f"Max Response Time:  {metrics.get('max_response_time_us', 0) / 1000:.2f} ms")
-        print(f"P95 Response Time:  {metrics.get('p95_us', 0) / 1000:.2f} ms")
-        print(f"P99 Response Time:  {metrics.get('p99_us', 0) / 1000:.2f} ms")
-
-        # Status indicators
-        if success_rate >= 95:
-            print("🟢 Test Status: EXCELLENT")
-        elif success_rate >= 90:
-            print("🟡 Test Status: GOOD")
-        elif success_rate >= 80:
-            print("🟠 Test Status: FAIR")
+        # Prefer locally recorded samples, otherwise use the engine's percentiles.
+        # P50 is only reported by the C engine, so it is left out when missing
+        if self.response_times.count:
+            p50, p95, p99 = (self.response_times.percentile(p) for p in (50, 95, 99))
         else:
-            print("🔴 Test Status: POOR")
+            p50 = metrics.get('p50_us')
+            p95 = metrics.get('p95_us', 0)
+            p99 = metrics.get('p99_us', 0)
+        
+        status = next(label for threshold, label in _STATUS_TIERS if success_rate >= threshold)
+        
+        # Emitted with a single write instead of one print per line
+        lines = [
+            "\n📊 Final Test Results",
+            "=" * 40,
+            f"Total Requests:     {total:,}",
+            f"Successful:         {successful:,}",
+            f"Failed:             {failed:,}",
+            f"Success Rate:       {success_rate:.2f}%",
+            "",
+            f"Requests/sec:       {metrics.get('requests_per_second', 0):.2f}",
+            f"Avg Response Time:  {metrics.get('avg_response_time_ms', 0):.2f} ms",
+            f"Min Response Time:  {metrics.get('min_response_time_us', 0) / 1000:.2f} ms",
+            f"Max Response Time:  {metrics.get('max_response_time_us', 0) / 1000:.2f} ms",
+        ]
+        if p50 is not None:
+            lines.append(f"P50 Response Time:  {p50 / 1000:.2f} ms")
+        lines += [
+            f"P95 Response Time:  {p95 / 1000:.2f} ms",
+            f"P99 Response Time:  {p99 / 1000:.2f} ms",
+            status,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
             
     def report_progress(self, elapsed_time: float, metrics: Dict[str, Any]):
         """Show progress updates during test"""
@@ -104,74 +207,231 @@ class ConsoleReporter(BaseReporter):
         print(f"⏱️  {elapsed_time:.0f}s | Requests: {total:,} | RPS: {rps:.1f} | Avg: {avg_time:.1f}ms")
 
 
-class JSONReporter(BaseReporter):
-    """Reporter that outputs results to JSON file"""
+class _FileReporter(BaseReporter):
+    """Reporter whose final report is a file write followed by one status line"""
     
-    def __init__(self, output_file: str):
+    def report_metrics(self, metrics: Dict[str, Any]):
+        print(self._write_report(metrics))
+        
+    def _write_report(self, metrics: Dict[str, Any]) -> str:
+        """Write the report file and return the status line to print"""
+        raise NotImplementedError
+
+
+class JSONReporter(_FileReporter):
+    """
+    Reporter that outputs results to JSON file
+    
+    Progress entries are streamed as NDJSON to ``<output_file>.progress.ndjson``
+    while the test runs instead of being held in memory. Pass
+    ``embed_progress=True`` to also copy them into the final JSON document.
+    """
+    
+    def __init__(self, output_file: str, embed_progress: bool = False):
         super().__init__()
         self.output_file = output_file
+        self.progress_file = output_file + '.progress.ndjson'
+        self.embed_progress = embed_progress
+        self._progress_fp = None
+        self._has_progress = False
         self.test_data = {
             'test_info': {},
-            'progress': [],
             'final_metrics': {}
         }
         
     def start_reporting(self):
         super().start_reporting()
         self.test_data['test_info'] = {
-            'start_time': datetime.fromtimestamp(self.start_time).isoformat(),
             'start_timestamp': self.start_time
         }
+        self._has_progress = False
         
     def end_reporting(self):
         super().end_reporting()
         self.test_data['test_info'].update({
-            'end_time': datetime.fromtimestamp(self.end_time).isoformat(),
             'end_timestamp': self.end_time,
             'duration_seconds': self.end_time - self.start_time
         })
+        if self._progress_fp is not None:
+            self._progress_fp.close()
+            self._progress_fp = None
         
-    def report_metrics(self, metrics: Dict[str, Any]):
+    def _write_report(self, metrics: Dict[str, Any]) -> str:
         """Save final metrics to JSON. Includes p95_us and p99_us when present."""
         self.test_data['final_metrics'] = metrics
         
+        # Timestamps are kept as floats and only rendered as ISO strings here
+        test_info = self.test_data['test_info']
+        for prefix in ('start', 'end'):
+            timestamp = test_info.get(f'{prefix}_timestamp')
+            if timestamp is not None:
+                test_info[f'{prefix}_time'] = datetime.fromtimestamp(timestamp).isoformat()
+        
+        if self._has_progress:
+            if self._progress_fp is not None:
+                self._progress_fp.flush()
+            self.test_data['progress_file'] = self.progress_file
+            if self.embed_progress:
+                with open(self.progress_file, 'r') as progress_fp:
+                    self.test_data['progress'] = [_json_loads(line) for line in progress_fp]
+        
         with open(self.output_file, 'w') as f:
-            json.dump(self.test_data, f, indent=2)
+            f.write(_json_dumps(self.test_data, indent=True))
             
-        print(f"📄 Results saved to: {self.output_file}")
+        return f"📄 Results saved to: {self.output_file}"
         
     def report_progress(self, elapsed_time: float, metrics: Dict[str, Any]):
-        """Save progress data"""
+        """Append a progress entry to the NDJSON progress file"""
+        if self._progress_fp is None:
+            # Truncates output from a previous run on first write
+            self._progress_fp = open(self.progress_file, 'w', buffering=1 << 16)
+            self._has_progress = True
         progress_entry = {
             'elapsed_time': elapsed_time,
             'timestamp': time.time(),
-            'metrics': metrics.copy()
+            'metrics': metrics
         }
-        self.test_data['progress'].append(progress_entry)
+        self._progress_fp.write(_json_dumps(progress_entry) + '\n')
+
+
+_PROGRESS_COLUMNS = ('time', 'requests_per_second', 'avg_response_time', 'total_requests')
 
 
-class HTMLReporter(BaseReporter):
+def _aggregate(times, rps, rt, total):
+    """Single pass summary over progress columns (JIT compiled when Numba is present)"""
+    n = len(times)
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+    
+    rps_sum = 0.0
+    rps_sq_sum = 0.0
+    rps_max = rps[0]
+    rt_min = rt[0]
+    rt_max = rt[0]
+    for i in range(n):
+        value = rps[i]
+        rps_sum += value
+        rps_sq_sum += value * value
+        if value > rps_max:
+            rps_max = value
+        if rt[i] < rt_min:
+            rt_min = rt[i]
+        if rt[i] > rt_max:
+            rt_max = rt[i]
+    
+    rps_mean = rps_sum / n
+    rps_std = math.sqrt(max(rps_sq_sum / n - rps_mean * rps_mean, 0.0))
+    ordered = sorted(rt)
+    rt_p99 = ordered[min(n - 1, int(n * 0.99))]
+    span = times[n - 1] - times[0]
+    window_rps = (total[n - 1] - total[0]) / span if span > 0 else 0.0
+    return rps_mean, rps_std, rps_max, rt_min, rt_max, rt_p99, window_rps
+
+
+if _numba_available:
+    _aggregate = njit(cache=True, fastmath=True)(_aggregate)
+
+# Static chart script written after the embedded progress data
+_HTML_REPORT_SCRIPT = """;
+        
+        // RPS Chart
+        const rpsCtx = document.getElementById('rpsChart').getContext('2d');
+        new Chart(rpsCtx, {
+            type: 'line',
+            data: {
+                labels: progressData.time.map(t => t.toFixed(0) + 's'),
+                datasets: [{
+                    label: 'Requests per Second',
+                    data: progressData.requests_per_second,
+                    borderColor: '#007acc',
+                    backgroundColor: 'rgba(0, 122, 204, 0.1)',
+                    fill: true
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    title: {
+                        display: true,
+                        text: 'Requests per Second Over Time'
+                    }
+                }
+            }
+        });
+        
+        // Response Time Chart
+        const rtCtx = document.getElementById('responseTimeChart').getContext('2d');
+        new Chart(rtCtx, {
+            type: 'line',
+            data: {
+                labels: progressData.time.map(t => t.toFixed(0) + 's'),
+                datasets: [{
+                    label: 'Average Response Time (ms)',
+                    data: progressData.avg_response_time,
+                    borderColor: '#28a745',
+                    backgroundColor: 'rgba(40, 167, 69, 0.1)',
+                    fill: true
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    title: {
+                        display: true,
+                        text: 'Average Response Time Over Time'
+                    }
+                }
+            }
+        });
+    </script>
+</body>
+</html>
+"""
+
+
+class HTMLReporter(_FileReporter):
     """Reporter that generates HTML report with charts"""
     
     def __init__(self, output_file: str):
         super().__init__()
         self.output_file = output_file
-        self.progress_data: List[Dict[str, Any]] = []
+        # One packed column per chart series instead of a dict per sample
+        self.progress_columns: Dict[str, array] = {
+            name: array('d') for name in _PROGRESS_COLUMNS
+        }
+        
+    @property
+    def progress_data(self) -> List[Dict[str, float]]:
+        """Collected progress samples as a list of dicts"""
+        columns = [self.progress_columns[name] for name in _PROGRESS_COLUMNS]
+        return [dict(zip(_PROGRESS_COLUMNS, row)) for row in zip(*columns)]
+        
+    def progress_summary(self) -> Dict[str, float]:
+        """Aggregate statistics over the collected progress samples"""
+        columns = [self.progress_columns[name] for name in _PROGRESS_COLUMNS]
+        if _numba_available:
+            columns = [np.frombuffer(column, dtype=np.float64) for column in columns]
+        keys = ('rps_mean', 'rps_std', 'rps_max', 'avg_response_time_min',
+                'avg_response_time_max', 'avg_response_time_p99', 'window_rps')
+        return dict(zip(keys, (float(value) for value in _aggregate(*columns))))
         
     def report_progress(self, elapsed_time: float, metrics: Dict[str, Any]):
         """Collect progress data for charts"""
-        self.progress_data.append({
-            'time': elapsed_time,
-            'requests_per_second': metrics.get('requests_per_second', 0),
-            'avg_response_time': metrics.get('avg_response_time_ms', 0),
-            'total_requests': metrics.get('total_requests', 0)
-        })
+        columns = self.progress_columns
+        columns['time'].append(elapsed_time)
+        columns['requests_per_second'].append(metrics.get('requests_per_second', 0))
+        columns['avg_response_time'].append(metrics.get('avg_response_time_ms', 0))
+        columns['total_requests'].append(metrics.get('total_requests', 0))
         
-    def report_metrics(self, metrics: Dict[str, Any]):
+    def _write_report(self, metrics: Dict[str, Any]) -> str:
         """Generate HTML report"""
         duration = self.end_time - self.start_time if self.start_time else 0
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        summary = self.progress_summary()
         
-        html_content = f"""
+        html_head = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -191,7 +451,7 @@ class HTMLReporter(BaseReporter):
     <div class="header">
         <h1>🚀 Load Test Report</h1>
         <p><strong>Duration:</strong> {duration:.2f} seconds</p>
-        <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p><strong>Generated:</strong> {generated_at}</p>
     </div>
     
     <div class="metrics">
@@ -219,6 +479,14 @@ class HTMLReporter(BaseReporter):
             <h3>P99 Response Time</h3>
             <div class="value">{metrics.get('p99_us', 0) / 1000:.1f} ms</div>
         </div>
+        <div class="metric">
+            <h3>Peak Requests/sec</h3>
+            <div class="value">{summary['rps_max']:.1f}</div>
+        </div>
+        <div class="metric">
+            <h3>Requests/sec Std Dev</h3>
+            <div class="value">{summary['rps_std']:.1f}</div>
+        </div>
     </div>
     
     <div class="chart-container">
@@ -230,76 +498,42 @@ class HTMLReporter(BaseReporter):
     </div>
     
     <script>
-        const progressData = {json.dumps(self.progress_data)};
-        
-        // RPS Chart
-        const rpsCtx = document.getElementById('rpsChart').getContext('2d');
-        new Chart(rpsCtx, {{
-            type: 'line',
-            data: {{
-                labels: progressData.map(d => d.time.toFixed(0) + 's'),
-                datasets: [{{
-                    label: 'Requests per Second',
-                    data: progressData.map(d => d.requests_per_second),
-                    borderColor: '#007acc',
-                    backgroundColor: 'rgba(0, 122, 204, 0.1)',
-                    fill: true
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Requests per Second Over Time'
-                    }}
-                }}
-            }}
-        }});
-        
-        // Response Time Chart
-        const rtCtx = document.getElementById('responseTimeChart').getContext('2d');
-        new Chart(rtCtx, {{
-            type: 'line',
-            data: {{
-                labels: progressData.map(d => d.time.toFixed(0) + 's'),
-                datasets: [{{
-                    label: 'Average Response Time (ms)',
-                    data: progressData.map(d => d.avg_response_time),
-                    borderColor: '#28a745',
-                    backgroundColor: 'rgba(40, 167, 69, 0.1)',
-                    fill: true
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Average Response Time Over Time'
-                    }}
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>
-        """
+        const progressData = """
         
+        # Stream the document so the progress JSON is never embedded in an
+        # intermediate copy of the whole page
         with open(self.output_file, 'w') as f:
-            f.write(html_content)
+            f.write(html_head)
+            f.write(_json_dumps({name: column.tolist() for name, column in self.progress_columns.items()}))
+            f.write(_HTML_REPORT_SCRIPT)
             
-        print(f"📊 HTML report saved to: {self.output_file}")
+        return f"📊 HTML report saved to: {self.output_file}"
 
 
 class MultiReporter(BaseReporter):
-    """Reporter that combines multiple reporters"""
+    """
+    Reporter that combines multiple reporters
+    
+    With two or more file reporters, their final report files are written
+    on a thread pool so the writes overlap. Everything else, including all
+    console output, runs in reporter order on the calling thread, so output
+    is the same as reporting to each child in turn.
+    """
     
     def __init__(self, reporters: List[BaseReporter]):
         super().__init__()
         self.reporters = reporters
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+    def _pooled_writes(self, metrics: Dict[str, Any]) -> Dict[int, Any]:
+        """Start the report file writes of file reporters that can overlap"""
+        writers = [i for i, reporter in enumerate(self.reporters)
+                   if type(reporter).report_metrics is _FileReporter.report_metrics]
+        if len(writers) < 2:
+            return {}
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=len(writers))
+        return {i: self._pool.submit(self.reporters[i]._write_report, metrics) for i in writers}
         
     def start_reporting(self):
         super().start_reporting()
@@ -310,11 +544,28 @@ class MultiReporter(BaseReporter):
         super().end_reporting()
         for reporter in self.reporters:
             reporter.end_reporting()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
             
     def report_metrics(self, metrics: Dict[str, Any]):
-        for reporter in self.reporters:
-            reporter.report_metrics(metrics)
+        writes = self._pooled_writes(metrics)
+        try:
+            for i, reporter in enumerate(self.reporters):
+                if i in writes:
+                    print(writes[i].result())
+                else:
+                    reporter.report_metrics(metrics)
+        finally:
+            # Never return while a report file is still being written
+            for future in writes.values():
+                future.exception()
             
     def report_progress(self, elapsed_time: float, metrics: Dict[str, Any]):
         for reporter in self.reporters:
-            reporter.report_progress(elapsed_time, metrics)
\ No newline at end of file
+            reporter.report_progress(elapsed_time, metrics)
+            
+    def record_response_time(self, response_time_us: float):
+        super().record_response_time(response_time_us)
+        for reporter in self.reporters:
+            reporter.record_response_time(response_time_us)
\ No newline at end of file
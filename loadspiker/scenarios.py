@@ -2,11 +2,11 @@
 Test scenario definitions and request builders
 """
 
-from typing import List, Dict, Any, Optional, Callable
-import json
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union, Iterable
+from functools import lru_cache
 import random
-import time
 import re
+import sys
 # Import data sources with fallback to avoid circular import issues
 try:
     from .data_sources import DataManager, DataStrategy
@@ -41,29 +41,123 @@ except ImportError:
             def __call__(cls, value):
                 return value
 
+# Optional streaming JSON parser for large HAR captures
+try:
+    import ijson
+    _ijson_available = True
+except ImportError:
+    _ijson_available = False
+
+# Shared JSON helpers, with the same fallback as data_sources above
+try:
+    from .json_utils import dumps_json, loads_json
+except ImportError:
+    from json_utils import dumps_json, loads_json
+
+# Optional native template renderer from the engine extension
+try:
+    from .loadspiker_c import render_template as _c_render_template
+except ImportError:
+    _c_render_template = None
+
+# Default headers for JSON bodies; copied per request since headers are public
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Resolved once: whether DataStrategy (real enum or fallback stub) converts strings
+_DATASTRATEGY_CALLABLE = callable(DataStrategy)
+
+# Strategies whose row depends only on user_id, so a source can be read as columns
+_COLUMN_STRATEGIES = (DataStrategy.SEQUENTIAL, DataStrategy.SHARED)
+
+# Operation fields that may contain ${var} templates, per scenario type
+_MIXED_TEMPLATE_FIELDS = ("url", "query", "message", "body")
+_SOCKET_TEMPLATE_FIELDS = ("data", "hostname")
+_MQTT_TEMPLATE_FIELDS = ("topic", "payload", "client_id", "username", "password", "broker_host")
+
+_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
+
+@lru_cache(maxsize=4096)
+def _template_parts(text: str) -> Tuple[str, ...]:
+    """
+    Split a ${var} template into alternating literal and variable name parts
+    
+    Even indexes are literals and odd indexes are variable names, so a
+    template without variables is a single literal.
+    """
+    if '${' not in text:
+        return (text,)
+    return tuple(_VAR_RE.split(text))
+
+
+def _template_source(parts: Tuple[str, ...]) -> str:
+    """Python expression rendering template parts, used by Scenario.compile()"""
+    pieces = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            pieces.append(f"lookup({part!r}, user_data)")
+        elif part:
+            pieces.append(repr(part))
+    return " + ".join(pieces) or "''"
+
 
 class HTTPRequest:
-    """Represents an HTTP request configuration"""
+    """Represents an HTTP request configuration
+    
+    The engine dict is built once at construction, so treat instances as
+    immutable after they have been added to a scenario.
+    """
+    
+    __slots__ = ('url', 'method', 'headers', 'body', 'timeout_ms', 'think_time_ms',
+                 '_has_vars', '_headers_str', '_dict_template',
+                 '_url_parts', '_body_parts', '_header_parts', '_key', '_hash')
     
     def __init__(self, url: str, method: str = "GET", 
                  headers: Optional[Dict[str, str]] = None,
-                 body: str = "", timeout_ms: int = 30000):
+                 body: str = "", timeout_ms: int = 30000, think_time_ms: int = 0):
         self.url = url
-        self.method = method.upper()
+        # Interned so every request shares one object per verb
+        self.method = sys.intern(method.upper())
         self.headers = headers or {}
         self.body = body
         self.timeout_ms = timeout_ms
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary format expected by C engine"""
-        headers_str = "\n".join([f"{k}: {v}" for k, v in self.headers.items()])
-        return {
+        # Pause after this request, applied by the engine rather than at build time
+        self.think_time_ms = think_time_ms
+        # Scanned once so static requests, and static bodies or header
+        # blocks of templated ones, can skip substitution entirely
+        body_has_vars = bool(body) and '${' in body
+        headers_have_vars = any('${' in str(v) for v in self.headers.values())
+        self._has_vars = '${' in url or body_has_vars or headers_have_vars
+        self._url_parts = _template_parts(url) if self._has_vars else None
+        self._body_parts = _template_parts(body) if body_has_vars else None
+        self._header_parts = ({k: _template_parts(str(v)) for k, v in self.headers.items()}
+                              if headers_have_vars else None)
+        self._headers_str = "\n".join(f"{k}: {v}" for k, v in self.headers.items())
+        self._dict_template = {
             "url": self.url,
             "method": self.method,
-            "headers": headers_str,
+            "headers": self._headers_str,
             "body": self.body,
-            "timeout_ms": self.timeout_ms
+            "timeout_ms": self.timeout_ms,
+            "think_time_ms": self.think_time_ms
         }
+        # Identity is what the engine would receive, so equal requests build equally
+        self._key = (self.url, self.method, self._headers_str, self.body,
+                     self.timeout_ms, self.think_time_ms)
+        self._hash = hash(self._key)
+    
+    def __eq__(self, other):
+        if not isinstance(other, HTTPRequest):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+    
+    def __hash__(self):
+        return self._hash
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary format expected by C engine"""
+        return self._dict_template.copy()
 
 
 class Scenario:
@@ -76,6 +170,14 @@ class Scenario:
         self.teardown_func: Optional[Callable] = None
         self.variables: Dict[str, Any] = {}
         self.data_manager = DataManager()
+        self._processed_cache: Optional[Tuple[Tuple[HTTPRequest, ...], Dict[str, Any],
+                                              List[Dict[str, Any]]]] = None
+        self._operation_splits: Dict[tuple, tuple] = {}
+        self._user_cols_key: Optional[tuple] = None
+        self._user_cols: Dict[str, List[Any]] = {}
+        self._row_sources: List[str] = []
+        self._primed_rows: Dict[int, Dict[str, Any]] = {}
+        self._compiled_build: Optional[Tuple[Tuple[HTTPRequest, ...], Callable]] = None
     
     def add_request(self, request: HTTPRequest):
         """Add a request to the scenario"""
@@ -119,7 +221,7 @@ class Scenario:
                       strategy: str = "sequential", **options):
         """Load data file for data-driven testing"""
         # Convert string strategy to enum - DataStrategy is now available from module imports
-        strategy_enum = DataStrategy(strategy.lower()) if hasattr(DataStrategy, '__call__') else strategy.lower()
+        strategy_enum = DataStrategy(strategy.lower()) if _DATASTRATEGY_CALLABLE else strategy.lower()
         
         # Add CSV data source
         self.data_manager.add_csv_source(file_path, name, strategy_enum, **options)
@@ -139,58 +241,287 @@ class Scenario:
         self.teardown_func = func
         return self
     
+    def _prepare_user_columns(self):
+        """
+        Materialize data sources as columns keyed by their template name
+        
+        Sequential and shared sources pick a row from user_id alone, so they
+        are read column-wise as ``"source.field" -> values``. Other strategies
+        keep per-call state and are listed in _row_sources to be fetched from
+        the data manager. Rebuilt whenever the set of sources changes.
+        """
+        sources = getattr(self.data_manager, 'data_sources', {})
+        key = tuple((name, id(distributor)) for name, distributor in sources.items())
+        if key == self._user_cols_key:
+            return
+        
+        columns: Dict[str, List[Any]] = {}
+        row_sources: List[str] = []
+        for name, distributor in sources.items():
+            rows = distributor.data_source.data
+            if distributor.strategy not in _COLUMN_STRATEGIES or not rows:
+                row_sources.append(name)
+                continue
+            if distributor.strategy == DataStrategy.SHARED:
+                rows = rows[:1]
+            for field in rows[0]:
+                columns[f"{name}.{field}"] = [row.get(field) for row in rows]
+        
+        self._user_cols = columns
+        self._row_sources = row_sources
+        self._primed_rows = {}
+        self._user_cols_key = key
+    
+    def _get_user_data(self, user_id: int) -> Dict[str, Any]:
+        """Data source values for a user as a flat ``{"source.field": value}`` dict"""
+        self._prepare_user_columns()
+        user_data = {name: column[user_id % len(column)] for name, column in self._user_cols.items()}
+        primed = self._primed_rows.pop(user_id, None)
+        if primed is not None:
+            user_data.update(primed)
+            return user_data
+        for source_name in self._row_sources:
+            for field, value in self.data_manager.get_user_data(user_id, source_name).items():
+                user_data[f"{source_name}.{field}"] = value
+        return user_data
+    
+    def prime_user_data(self, user_ids: Iterable[int]):
+        """
+        Fetch data source rows for a batch of users ahead of building
+        
+        Only stateful sources (random, circular, unique) need fetching; they
+        are read in one pass per source instead of once per user. A primed
+        row is used by the next build for that user and then discarded.
+        """
+        self._prepare_user_columns()
+        if not self._row_sources:
+            return self
+        
+        batch = self.data_manager.get_user_data_batch(list(user_ids), self._row_sources)
+        for user_id, sources in batch.items():
+            self._primed_rows[user_id] = {f"{source_name}.{field}": value
+                                          for source_name, row in sources.items()
+                                          for field, value in row.items()}
+        return self
+    
+    def _split_operations(self, operations: List[Dict[str, Any]],
+                          fields: Tuple[str, ...]) -> List[Tuple[Dict[str, Any], Tuple[str, ...]]]:
+        """
+        Pair each operation with the fields that actually contain ${var}
+        
+        Cached per operation list until it grows, so builds only touch the
+        fields that need substitution. Like requests, operations should be
+        treated as immutable once added: operations without templated fields
+        are shared by every build, so built operations are read-only too.
+        """
+        cached = self._operation_splits.get(fields)
+        if cached is not None and cached[0] is operations and cached[1] == len(operations):
+            return cached[2]
+        split = [(operation, tuple(key for key in fields
+                                   if key in operation and '${' in str(operation[key])))
+                 for operation in operations]
+        self._operation_splits[fields] = (operations, len(operations), split)
+        return split
+    
+    def _render_operation(self, operation: Dict[str, Any], keys: Tuple[str, ...],
+                          user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy an operation with its templated fields substituted"""
+        if not keys:
+            return operation
+        processed_op = operation.copy()
+        for key in keys:
+            processed_op[key] = self._substitute_variables(processed_op[key], user_data)
+        return processed_op
+    
     def build_requests(self, user_id: int = 0) -> List[Dict[str, Any]]:
         """Build requests list for the C engine with user-specific data"""
         if self.setup_func:
             self.setup_func(self)
         
+        # Without data sources or a setup function the output only depends on
+        # the request objects and the variables, so it is reused while both
+        # are unchanged (setup functions may change anything, so never cache)
+        has_sources = bool(self.data_manager.list_sources())
+        cacheable = not self.setup_func and not has_sources
+        if cacheable:
+            cached = self._processed_cache
+            if (cached is not None and self._same_requests(cached[0])
+                    and cached[1] == self.variables):
+                return [request_dict.copy() for request_dict in cached[2]]
+        
         # Get user-specific data
         user_data = {}
+        if has_sources:
+            user_data = self._get_user_data(user_id)
+        
+        compiled = self._compiled_build
+        if compiled is not None and self._same_requests(compiled[0]):
+            processed_requests = compiled[1](user_data, self._lookup_variable, self.variables)
+        else:
+            # Apply variable substitution with user data; identical requests
+            # (common in HAR captures) are only substituted once. With nothing
+            # to substitute every ${var} is left in place, so templates pass through
+            has_substitutions = bool(user_data or self.variables)
+            processed_requests = []
+            rendered: Dict[HTTPRequest, Dict[str, Any]] = {}
+            for request in self.requests:
+                if not request._has_vars or not has_substitutions:
+                    processed_requests.append(request.to_dict())
+                elif request in rendered:
+                    processed_requests.append(rendered[request].copy())
+                else:
+                    request_dict = self._render_request(request, user_data)
+                    rendered[request] = request_dict
+                    processed_requests.append(request_dict)
+        
+        if cacheable:
+            self._processed_cache = (tuple(self.requests), self.variables.copy(), processed_requests)
+            return [request_dict.copy() for request_dict in processed_requests]
+        
+        return processed_requests
+    
+    def _same_requests(self, requests: Tuple[HTTPRequest, ...]) -> bool:
+        """Whether self.requests still holds exactly these request objects"""
+        return len(requests) == len(self.requests) and all(
+            a is b for a, b in zip(requests, self.requests))
+    
+    def build_requests_batch(self, user_ids: Iterable[int]) -> List[List[Dict[str, Any]]]:
+        """
+        Build the request list for each of a batch of users
+        
+        Stateful data source rows are fetched for the whole batch first (see
+        prime_user_data()), and each user's list is then built as with
+        build_requests(), through the compiled builder if compile() was called.
+        """
+        user_ids = list(user_ids)
         if self.data_manager.list_sources():
-            user_data = self.data_manager.get_all_user_data(user_id)
+            self.prime_user_data(user_ids)
+        return [self.build_requests(user_id) for user_id in user_ids]
+    
+    def compile(self):
+        """
+        Generate a builder specialised to the current request list
+        
+        The generated function returns every engine dict in one list literal,
+        with template literals inlined and ${var} references emitted as direct
+        lookups, or as one native render call per template when the C
+        extension is built. build_requests() uses it until the request list
+        changes, then falls back to the generic path until compile() is called
+        again.
+        """
+        constants: List[Any] = []
+        
+        def value_source(value):
+            if type(value) in (str, int):
+                return repr(value)
+            constants.append(value)
+            return f"constants[{len(constants) - 1}]"
         
-        # Apply variable substitution with user data
-        processed_requests = []
+        def template_source(parts):
+            if _c_render_template is None or len(parts) == 1:
+                return _template_source(parts)
+            constants.append(parts)
+            return f"render(constants[{len(constants) - 1}], user_data, variables)"
+        
+        entries = []
         for request in self.requests:
-            processed_request = self._process_request(request, user_data)
-            processed_requests.append(processed_request.to_dict())
+            if request._has_vars:
+                url = template_source(request._url_parts)
+                body = template_source(request._body_parts) if request._body_parts else value_source(request.body)
+                if request._header_parts is None:
+                    headers = value_source(request._headers_str)
+                else:
+                    # One template for the whole header block, merging
+                    # adjacent literals across header lines
+                    parts: Tuple[str, ...] = ("",)
+                    for i, (name, header_parts) in enumerate(request._header_parts.items()):
+                        prefix = ("\n" if i else "") + f"{name}: "
+                        parts = parts[:-1] + (parts[-1] + prefix + header_parts[0],) + header_parts[1:]
+                    headers = template_source(parts)
+            else:
+                url = value_source(request.url)
+                body = value_source(request.body)
+                headers = value_source(request._headers_str)
+            entries.append(
+                f'{{"url": {url}, "method": {value_source(request.method)}, '
+                f'"headers": {headers}, "body": {body}, '
+                f'"timeout_ms": {value_source(request.timeout_ms)}, '
+                f'"think_time_ms": {value_source(request.think_time_ms)}}}'
+            )
         
-        return processed_requests
+        source = ("def build(user_data, lookup, variables):\n    return [\n" +
+                  "".join(f"        {entry},\n" for entry in entries) + "    ]\n")
+        namespace = {"constants": tuple(constants), "render": _c_render_template}
+        exec(compile(source, f"<scenario {self.name!r}>", "exec"), namespace)
+        self._compiled_build = (tuple(self.requests), namespace["build"])
+        return self
     
-    def _process_request(self, request: HTTPRequest, user_data: Dict[str, Dict[str, Any]] = None) -> HTTPRequest:
+    def _process_request(self, request: HTTPRequest, user_data: Dict[str, Any] = None) -> HTTPRequest:
         """Process request with variable substitution"""
-        url = self._substitute_variables(request.url, user_data)
-        body = self._substitute_variables(request.body, user_data)
+        if not request._has_vars:
+            return request
+        url = self._render_parts(request._url_parts, user_data)
+        body = self._render_parts(request._body_parts, user_data) if request._body_parts else request.body
         
-        headers = {}
-        for k, v in request.headers.items():
-            headers[k] = self._substitute_variables(v, user_data)
+        # Static headers are shared with the original request
+        headers = request.headers
+        if request._header_parts is not None:
+            headers = {k: self._render_parts(parts, user_data)
+                       for k, parts in request._header_parts.items()}
         
-        return HTTPRequest(url, request.method, headers, body, request.timeout_ms)
+        return HTTPRequest(url, request.method, headers, body, request.timeout_ms, request.think_time_ms)
+    
+    def _render_request(self, request: HTTPRequest, user_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Substitute variables straight into the engine dict for a request"""
+        render = self._render_parts
+        headers = request._headers_str
+        if request._header_parts is not None:
+            headers = "\n".join(f"{k}: {render(parts, user_data)}"
+                                 for k, parts in request._header_parts.items())
+        return {
+            "url": render(request._url_parts, user_data),
+            "method": request.method,
+            "headers": headers,
+            "body": render(request._body_parts, user_data) if request._body_parts else request.body,
+            "timeout_ms": request.timeout_ms,
+            "think_time_ms": request.think_time_ms
+        }
     
-    def _substitute_variables(self, text: str, user_data: Dict[str, Dict[str, Any]] = None) -> str:
+    def _substitute_variables(self, text: str, user_data: Dict[str, Any] = None) -> str:
         """Substitute variables in text using ${var} syntax"""
-        if not text:
+        if not text or '${' not in text or not (user_data or self.variables):
             return text
-            
-        def replace_var(match):
-            var_name = match.group(1)
-            
-            # Check for data source variables (e.g., ${data.username}, ${users.email})
-            if user_data and '.' in var_name:
-                source_name, field_name = var_name.split('.', 1)
-                if source_name in user_data and field_name in user_data[source_name]:
-                    value = user_data[source_name][field_name]
-                    return str(value) if value is not None else ""
-            
-            # Check scenario variables
-            if var_name in self.variables:
-                return str(self.variables[var_name])
-                
-            # Return original if not found
-            return match.group(0)
+        return self._render_parts(_template_parts(text), user_data)
+    
+    def _render_parts(self, parts: Tuple[str, ...], user_data: Dict[str, Any] = None) -> str:
+        """Render a template split by _template_parts()"""
+        if len(parts) == 1:
+            return parts[0]
+        if _c_render_template is not None:
+            return _c_render_template(parts, user_data, self.variables)
+        
+        # Walk (name, following literal) pairs; parts always has odd length
+        lookup = self._lookup_variable
+        rendered = [parts[0]]
+        for i in range(1, len(parts), 2):
+            rendered.append(lookup(parts[i], user_data))
+            rendered.append(parts[i + 1])
+        return "".join(rendered)
+    
+    def _lookup_variable(self, var_name: str, user_data: Dict[str, Any] = None) -> str:
+        """Resolve a single ${var} reference, leaving unknown names in place"""
+        # Check for data source variables (e.g., ${data.username}, ${users.email}),
+        # keyed flat as "source.field" by _get_user_data()
+        if user_data and var_name in user_data:
+            value = user_data[var_name]
+            return str(value) if value is not None else ""
         
-        return re.sub(r'\$\{([^}]+)\}', replace_var, text)
+        # Check scenario variables
+        if var_name in self.variables:
+            return str(self.variables[var_name])
+        
+        # Return original if not found
+        return "${" + var_name + "}"
 
 
 class RESTAPIScenario(Scenario):
@@ -199,33 +530,36 @@ class RESTAPIScenario(Scenario):
     def __init__(self, base_url: str, name: str = "REST API Test"):
         super().__init__(name)
         self.base_url = base_url.rstrip('/')
+        self._base_url_slash = self.base_url + '/'
         
     def get_resource(self, path: str, headers: Optional[Dict[str, str]] = None):
         """GET a resource"""
-        url = f"{self.base_url}/{path.lstrip('/')}"
+        url = self._base_url_slash + path.lstrip('/')
         return self.get(url, headers)
     
-    def create_resource(self, path: str, data: Dict[str, Any], 
+    def create_resource(self, path: str, data: Union[Dict[str, Any], str], 
                        headers: Optional[Dict[str, str]] = None):
-        """POST to create a resource"""
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        default_headers = {"Content-Type": "application/json"}
-        if headers:
-            default_headers.update(headers)
-        return self.post(url, json.dumps(data), default_headers)
-    
-    def update_resource(self, path: str, data: Dict[str, Any], 
+        """POST to create a resource
+        
+        ``data`` may be an already serialized JSON string, which is sent as-is;
+        serialize constant payloads once and reuse the string.
+        """
+        url = self._base_url_slash + path.lstrip('/')
+        request_headers = dict(_JSON_HEADERS, **(headers or {}))
+        body = data if isinstance(data, str) else dumps_json(data)
+        return self.post(url, body, request_headers)
+    
+    def update_resource(self, path: str, data: Union[Dict[str, Any], str], 
                        headers: Optional[Dict[str, str]] = None):
-        """PUT to update a resource"""
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        default_headers = {"Content-Type": "application/json"}
-        if headers:
-            default_headers.update(headers)
-        return self.put(url, json.dumps(data), default_headers)
+        """PUT to update a resource (``data`` may be a pre-serialized JSON string)"""
+        url = self._base_url_slash + path.lstrip('/')
+        request_headers = dict(_JSON_HEADERS, **(headers or {}))
+        body = data if isinstance(data, str) else dumps_json(data)
+        return self.put(url, body, request_headers)
     
     def delete_resource(self, path: str, headers: Optional[Dict[str, str]] = None):
         """DELETE a resource"""
-        url = f"{self.base_url}/{path.lstrip('/')}"
+        url = self._base_url_slash + path.lstrip('/')
         return self.delete(url, headers)
 
 
@@ -235,14 +569,13 @@ class WebsiteScenario(Scenario):
     def __init__(self, base_url: str, name: str = "Website Test"):
         super().__init__(name)
         self.base_url = base_url.rstrip('/')
+        self._base_url_slash = self.base_url + '/'
         
     def browse_page(self, path: str, think_time: float = 0):
-        """Browse to a page with optional think time"""
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        self.get(url, headers={"User-Agent": "LoadTest/1.0"})
-        if think_time > 0:
-            time.sleep(think_time)
-        return self
+        """Browse to a page with optional think time (seconds) after it"""
+        url = self._base_url_slash + path.lstrip('/')
+        return self.add_request(HTTPRequest(url, "GET", {"User-Agent": "LoadTest/1.0"},
+                                            think_time_ms=int(think_time * 1000)))
     
     def search(self, query: str, search_path: str = "/search"):
         """Perform a search"""
@@ -324,10 +657,10 @@ class DatabaseScenario(Scenario):
             "db_type": self.db_type
         })
         
-        # Add query operations
+        # Add query operations; all queries for a user share one row per source
+        user_data = self._get_user_data(user_id) if self.data_manager.list_sources() else {}
         for query in self.queries:
-            processed_query = self._substitute_variables(query, 
-                self.data_manager.get_all_user_data(user_id) if self.data_manager.list_sources() else {})
+            processed_query = self._substitute_variables(query, user_data)
             operations.append({
                 "type": "database_query",
                 "connection_string": self.connection_string,
@@ -356,7 +689,7 @@ class MixedProtocolScenario(Scenario):
         self.operations.append({
             "type": "http",
             "url": url,
-            "method": method,
+            "method": sys.intern(method),
             "headers": headers or {},
             "body": body
         })
@@ -387,25 +720,12 @@ class MixedProtocolScenario(Scenario):
     
     def build_mixed_operations(self, user_id: int = 0) -> List[Dict[str, Any]]:
         """Build mixed protocol operations for execution"""
-        processed_operations = []
-        user_data = self.data_manager.get_all_user_data(user_id) if self.data_manager.list_sources() else {}
-        
-        for operation in self.operations:
-            processed_op = operation.copy()
-            
-            # Apply variable substitution to relevant fields
-            if "url" in processed_op:
-                processed_op["url"] = self._substitute_variables(processed_op["url"], user_data)
-            if "query" in processed_op:
-                processed_op["query"] = self._substitute_variables(processed_op["query"], user_data)
-            if "message" in processed_op:
-                processed_op["message"] = self._substitute_variables(processed_op["message"], user_data)
-            if "body" in processed_op:
-                processed_op["body"] = self._substitute_variables(processed_op["body"], user_data)
-            
-            processed_operations.append(processed_op)
+        user_data = self._get_user_data(user_id) if self.data_manager.list_sources() else {}
         
-        return processed_operations
+        # Apply variable substitution to relevant fields
+        render = self._render_operation
+        return [render(operation, keys, user_data)
+                for operation, keys in self._split_operations(self.operations, _MIXED_TEMPLATE_FIELDS)]
 
 
 class TCPScenario(Scenario):
@@ -413,7 +733,8 @@ class TCPScenario(Scenario):
     
     def __init__(self, hostname: str, port: int, name: str = "TCP Socket Test"):
         super().__init__(name)
-        self.hostname = hostname
+        # Normalized once so builds never need to coerce it per operation
+        self.hostname = str(hostname)
         self.port = port
         self.tcp_operations: List[Dict[str, Any]] = []
         
@@ -467,22 +788,12 @@ class TCPScenario(Scenario):
     
     def build_tcp_operations(self, user_id: int = 0) -> List[Dict[str, Any]]:
         """Build TCP operations for execution"""
-        processed_operations = []
-        user_data = self.data_manager.get_all_user_data(user_id) if self.data_manager.list_sources() else {}
+        user_data = self._get_user_data(user_id) if self.data_manager.list_sources() else {}
         
-        for operation in self.tcp_operations:
-            processed_op = operation.copy()
-            
-            # Apply variable substitution to data field
-            if "data" in processed_op:
-                processed_op["data"] = self._substitute_variables(processed_op["data"], user_data)
-            
-            # Apply variable substitution to hostname (in case it's parameterized)
-            processed_op["hostname"] = self._substitute_variables(str(processed_op["hostname"]), user_data)
-            
-            processed_operations.append(processed_op)
-        
-        return processed_operations
+        # Apply variable substitution to data and hostname (in case it's parameterized)
+        render = self._render_operation
+        return [render(operation, keys, user_data)
+                for operation, keys in self._split_operations(self.tcp_operations, _SOCKET_TEMPLATE_FIELDS)]
 
 
 class UDPScenario(Scenario):
@@ -490,7 +801,8 @@ class UDPScenario(Scenario):
     
     def __init__(self, hostname: str, port: int, name: str = "UDP Socket Test"):
         super().__init__(name)
-        self.hostname = hostname
+        # Normalized once so builds never need to coerce it per operation
+        self.hostname = str(hostname)
         self.port = port
         self.udp_operations: List[Dict[str, Any]] = []
         
@@ -550,22 +862,12 @@ class UDPScenario(Scenario):
     
     def build_udp_operations(self, user_id: int = 0) -> List[Dict[str, Any]]:
         """Build UDP operations for execution"""
-        processed_operations = []
-        user_data = self.data_manager.get_all_user_data(user_id) if self.data_manager.list_sources() else {}
-        
-        for operation in self.udp_operations:
-            processed_op = operation.copy()
-            
-            # Apply variable substitution to data field
-            if "data" in processed_op:
-                processed_op["data"] = self._substitute_variables(processed_op["data"], user_data)
-            
-            # Apply variable substitution to hostname (in case it's parameterized)
-            processed_op["hostname"] = self._substitute_variables(str(processed_op["hostname"]), user_data)
-            
-            processed_operations.append(processed_op)
+        user_data = self._get_user_data(user_id) if self.data_manager.list_sources() else {}
         
-        return processed_operations
+        # Apply variable substitution to data and hostname (in case it's parameterized)
+        render = self._render_operation
+        return [render(operation, keys, user_data)
+                for operation, keys in self._split_operations(self.udp_operations, _SOCKET_TEMPLATE_FIELDS)]
 
 
 class MQTTScenario(Scenario):
@@ -574,7 +876,8 @@ class MQTTScenario(Scenario):
     def __init__(self, broker_host: str, broker_port: int = 1883, 
                  client_id: str = "loadspiker_client", name: str = "MQTT Test"):
         super().__init__(name)
-        self.broker_host = broker_host
+        # Normalized once so builds never need to coerce it per operation
+        self.broker_host = str(broker_host)
         self.broker_port = broker_port
         self.client_id = client_id
         self.mqtt_operations: List[Dict[str, Any]] = []
@@ -675,9 +978,17 @@ class MQTTScenario(Scenario):
         """Add a burst publish test (connect, multiple publishes, disconnect)"""
         self.add_connect(username, password, keep_alive)
         
-        for i in range(message_count):
-            payload = f"{base_payload} #{i+1}"
-            self.add_publish(topic, payload, qos, retain)
+        # Same fields as add_publish(), built in one pass for large bursts
+        self.mqtt_operations.extend({
+            "type": "mqtt_publish",
+            "broker_host": self.broker_host,
+            "broker_port": self.broker_port,
+            "client_id": self.client_id,
+            "topic": topic,
+            "payload": f"{base_payload} #{i}",
+            "qos": qos,
+            "retain": retain
+        } for i in range(1, message_count + 1))
         
         self.add_disconnect()
         return self
@@ -691,11 +1002,21 @@ class MQTTScenario(Scenario):
         # Subscribe to pattern (using + or # wildcards)
         self.add_subscribe(topic_pattern, qos)
         
-        # Publish to multiple specific topics that match the pattern
-        for i in range(topic_count):
-            # Replace wildcards with specific values for publishing
-            specific_topic = topic_pattern.replace('+', f'topic{i}').replace('#', f'subtopic{i}/data')
-            self.add_publish(specific_topic, f"{payload} for {specific_topic}", qos, retain)
+        # Publish to multiple specific topics that match the pattern,
+        # replacing wildcards with specific values for publishing
+        topics = [topic_pattern.replace('+', f'topic{i}').replace('#', f'subtopic{i}/data')
+                  for i in range(topic_count)]
+        payload_prefix = f"{payload} for "
+        self.mqtt_operations.extend({
+            "type": "mqtt_publish",
+            "broker_host": self.broker_host,
+            "broker_port": self.broker_port,
+            "client_id": self.client_id,
+            "topic": specific_topic,
+            "payload": payload_prefix + specific_topic,
+            "qos": qos,
+            "retain": retain
+        } for specific_topic in topics)
         
         self.add_unsubscribe(topic_pattern)
         self.add_disconnect()
@@ -703,54 +1024,34 @@ class MQTTScenario(Scenario):
     
     def build_mqtt_operations(self, user_id: int = 0) -> List[Dict[str, Any]]:
         """Build MQTT operations for execution"""
-        processed_operations = []
-        user_data = self.data_manager.get_all_user_data(user_id) if self.data_manager.list_sources() else {}
-        
-        for operation in self.mqtt_operations:
-            processed_op = operation.copy()
-            
-            # Apply variable substitution to relevant fields
-            if "topic" in processed_op:
-                processed_op["topic"] = self._substitute_variables(processed_op["topic"], user_data)
-            if "payload" in processed_op:
-                processed_op["payload"] = self._substitute_variables(processed_op["payload"], user_data)
-            if "client_id" in processed_op:
-                processed_op["client_id"] = self._substitute_variables(processed_op["client_id"], user_data)
-            if "username" in processed_op:
-                processed_op["username"] = self._substitute_variables(processed_op["username"], user_data)
-            if "password" in processed_op:
-                processed_op["password"] = self._substitute_variables(processed_op["password"], user_data)
-            
-            # Apply variable substitution to broker_host (in case it's parameterized)
-            processed_op["broker_host"] = self._substitute_variables(str(processed_op["broker_host"]), user_data)
-            
-            processed_operations.append(processed_op)
+        user_data = self._get_user_data(user_id) if self.data_manager.list_sources() else {}
         
-        return processed_operations
+        # Apply variable substitution to relevant fields, including broker_host
+        render = self._render_operation
+        return [render(operation, keys, user_data)
+                for operation, keys in self._split_operations(self.mqtt_operations, _MQTT_TEMPLATE_FIELDS)]
 
 
 def create_scenario_from_har(har_file_path: str) -> Scenario:
-    """Create a scenario from a HAR (HTTP Archive) file"""
-    import json
-    
-    with open(har_file_path, 'r') as f:
-        har_data = json.load(f)
+    """Create a scenario from a HAR (HTTP Archive) file
     
+    When ijson is installed entries are parsed incrementally, so only the
+    current entry is held in memory rather than the whole capture.
+    """
     scenario = Scenario("HAR-based scenario")
     
-    for entry in har_data['log']['entries']:
-        request = entry['request']
-        url = request['url']
-        method = request['method']
-        
-        headers = {}
-        for header in request['headers']:
-            headers[header['name']] = header['value']
-        
-        body = ""
-        if 'postData' in request and 'text' in request['postData']:
-            body = request['postData']['text']
+    with open(har_file_path, 'rb') as f:
+        if _ijson_available:
+            entries = ijson.items(f, 'log.entries.item')
+        else:
+            entries = loads_json(f.read())['log']['entries']
         
-        scenario.add_request(HTTPRequest(url, method, headers, body))
-    
+        new_requests = [
+            HTTPRequest(request['url'], request['method'],
+                        {header['name']: header['value'] for header in request['headers']},
+                        request.get('postData', {}).get('text', ""))
+            for request in (entry['request'] for entry in entries)
+        ]
+    
+    scenario.requests.extend(new_requests)
     return scenario
@@ -12,106 +12,186 @@ import json
 import re
 import threading
 import time
-from typing import Dict, Any, Optional, List, Union, Callable
-from urllib.parse import urlparse, parse_qs
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Union, Callable, Tuple
+from urllib.parse import unquote_plus
 from http.cookies import SimpleCookie
 
 
+# Set-Cookie attribute names, never cookie names themselves
+_COOKIE_ATTRIBUTES = frozenset({
+    "expires", "path", "comment", "domain", "max-age", "secure", "httponly", "version", "samesite"
+})
+
+
+def _parse_header_string(headers: str) -> Dict[str, str]:
+    """Parse a raw header block into a dict keyed by lower-cased name"""
+    headers_dict = {}
+    for line in headers.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers_dict[key.strip().lower()] = value.strip()
+    return headers_dict
+
+
+@lru_cache(maxsize=512)
+def _compile_regex(pattern: str) -> "re.Pattern":
+    """Compile an extraction pattern once"""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=512)
+def _compile_path(path: str) -> Tuple[Tuple[Optional[str], Optional[int]], ...]:
+    """Parse a dot/index path once into (key, index) steps"""
+    steps = []
+    for part in path.split('.'):
+        if '[' in part and ']' in part:
+            key, index_part = part.split('[', 1)
+            steps.append((key or None, int(index_part.rstrip(']'))))
+        else:
+            steps.append((part, None))
+    return tuple(steps)
+
+
 class SessionStore:
-    """Thread-safe storage for session data"""
+    """Thread-safe storage for session data
     
-    def __init__(self):
+    Writers take the lock; readers rely on single dict operations being
+    atomic and read without it.
+    """
+    
+    def __init__(self, manager: Optional['SessionManager'] = None):
         self._data: Dict[str, Any] = {}
         self._cookies: Dict[str, str] = {}
         self._tokens: Dict[str, str] = {}
         self._custom_data: Dict[str, Any] = {}
-        self._lock = threading.RLock()
+        # Not reentrant: locked methods touch the dicts directly rather than
+        # calling each other
+        self._lock = threading.Lock()
         self._created_at = time.time()
         self._last_accessed = time.time()
+        # When the manager last moved this session to the end of its LRU
+        # order; store methods refresh _last_accessed without reordering
+        self._ordered_at = self._last_accessed
+        # Bumped on every mutation so derived values (request headers) can be cached
+        self._version = 0
+        self._headers_cache: Optional[tuple] = None
+        self._cookie_header = ""
+        # Owning manager, told about cookie/token count changes for its stats
+        self._manager = weakref.ref(manager) if manager is not None else None
+    
+    def _report_counts(self, cookies_delta: int, tokens_delta: int) -> None:
+        """Forward cookie/token count changes to the owning manager"""
+        manager = self._manager() if self._manager is not None else None
+        if manager is not None and (cookies_delta or tokens_delta):
+            manager._adjust_totals(cookies_delta, tokens_delta)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a value from session storage"""
-        with self._lock:
-            self._last_accessed = time.time()
-            return self._data.get(key, default)
+        self._last_accessed = time.time()
+        return self._data.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
         """Set a value in session storage"""
         with self._lock:
             self._data[key] = value
+            self._version += 1
             self._last_accessed = time.time()
     
     def delete(self, key: str) -> None:
         """Delete a value from session storage"""
         with self._lock:
             self._data.pop(key, None)
+            self._version += 1
             self._last_accessed = time.time()
     
     def get_cookie(self, name: str) -> Optional[str]:
         """Get a cookie value"""
-        with self._lock:
-            return self._cookies.get(name)
+        return self._cookies.get(name)
     
     def set_cookie(self, name: str, value: str, domain: str = "", path: str = "/") -> None:
         """Set a cookie value"""
         with self._lock:
+            is_new = name not in self._cookies
             self._cookies[name] = value
+            self._cookie_header = '; '.join(f"{n}={v}" for n, v in self._cookies.items())
+            self._version += 1
             # Store additional cookie metadata if needed
             if domain or path != "/":
-                self.set(f"_cookie_meta_{name}", {"domain": domain, "path": path})
+                self._data[f"_cookie_meta_{name}"] = {"domain": domain, "path": path}
             self._last_accessed = time.time()
+            if is_new:
+                self._report_counts(1, 0)
     
     def get_all_cookies(self) -> Dict[str, str]:
         """Get all cookies"""
-        with self._lock:
-            return self._cookies.copy()
+        return self._cookies.copy()
+    
+    def get_cookie_header(self) -> str:
+        """Get all cookies as a Cookie header value ("" when there are none)"""
+        return self._cookie_header
     
     def clear_cookies(self) -> None:
         """Clear all cookies"""
         with self._lock:
+            removed = len(self._cookies)
             self._cookies.clear()
+            self._cookie_header = ""
+            self._version += 1
             self._last_accessed = time.time()
+            self._report_counts(-removed, 0)
     
     def get_token(self, token_type: str) -> Optional[str]:
         """Get an authentication token"""
-        with self._lock:
-            return self._tokens.get(token_type)
+        return self._tokens.get(token_type)
     
     def set_token(self, token_type: str, token_value: str, expires_at: Optional[float] = None) -> None:
         """Set an authentication token"""
         with self._lock:
+            is_new = token_type not in self._tokens
             self._tokens[token_type] = token_value
+            self._version += 1
             if expires_at:
-                self.set(f"_token_expires_{token_type}", expires_at)
+                self._data[f"_token_expires_{token_type}"] = expires_at
             self._last_accessed = time.time()
+            if is_new:
+                self._report_counts(0, 1)
     
     def get_all_tokens(self) -> Dict[str, str]:
         """Get all tokens"""
-        with self._lock:
-            return self._tokens.copy()
+        return self._tokens.copy()
     
     def clear_tokens(self) -> None:
         """Clear all tokens"""
         with self._lock:
+            removed = len(self._tokens)
             self._tokens.clear()
+            self._version += 1
             self._last_accessed = time.time()
+            self._report_counts(0, -removed)
     
     def is_token_expired(self, token_type: str) -> bool:
         """Check if a token is expired"""
-        with self._lock:
-            expires_at = self.get(f"_token_expires_{token_type}")
-            if expires_at is None:
-                return False
-            return time.time() > expires_at
+        self._last_accessed = time.time()
+        expires_at = self._data.get(f"_token_expires_{token_type}")
+        if expires_at is None:
+            return False
+        return time.time() > expires_at
     
     def clear(self) -> None:
         """Clear all session data"""
         with self._lock:
+            removed_cookies, removed_tokens = len(self._cookies), len(self._tokens)
             self._data.clear()
             self._cookies.clear()
+            self._cookie_header = ""
             self._tokens.clear()
             self._custom_data.clear()
+            self._version += 1
             self._last_accessed = time.time()
+            self._report_counts(-removed_cookies, -removed_tokens)
     
     def get_session_info(self) -> Dict[str, Any]:
         """Get session information"""
@@ -137,22 +217,25 @@ class ResponseExtractor:
         except (json.JSONDecodeError, KeyError, TypeError, IndexError):
             return None
     
+    @staticmethod
+    def compile_path(path: str) -> Tuple[Tuple[Optional[str], Optional[int]], ...]:
+        """Compile a path like 'items[0].id' into ((key, index), ...) steps
+        
+        Compiled paths are cached, so repeated extractions skip the parsing.
+        """
+        return _compile_path(path)
+    
     @staticmethod
     def _get_nested_value(data: Any, path: str) -> Any:
         """Get nested value using dot notation (e.g., 'user.name' or 'items[0].id')"""
-        parts = path.split('.')
         current = data
         
-        for part in parts:
-            if '[' in part and ']' in part:
-                # Handle array indexing like 'items[0]'
-                key, index_part = part.split('[', 1)
-                index = int(index_part.rstrip(']'))
-                if key:
-                    current = current[key]
+        for key, index in _compile_path(path):
+            if key is not None:
+                current = current[key]
+            # Handle array indexing like 'items[0]'
+            if index is not None:
                 current = current[index]
-            else:
-                current = current[part]
         
         return current
     
@@ -160,7 +243,7 @@ class ResponseExtractor:
     def extract_regex(response_body: str, pattern: str, group: int = 1) -> Optional[str]:
         """Extract value using regular expression"""
         try:
-            match = re.search(pattern, response_body)
+            match = _compile_regex(pattern).search(response_body)
             if match and len(match.groups()) >= group:
                 return match.group(group)
             elif match and group == 0:
@@ -173,13 +256,7 @@ class ResponseExtractor:
     def extract_header(headers: Union[Dict[str, str], str], header_name: str) -> Optional[str]:
         """Extract value from response headers"""
         if isinstance(headers, str):
-            # Parse header string
-            headers_dict = {}
-            for line in headers.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    headers_dict[key.strip().lower()] = value.strip()
-            headers = headers_dict
+            headers = _parse_header_string(headers)
         
         return headers.get(header_name.lower())
     
@@ -190,6 +267,18 @@ class ResponseExtractor:
         if not set_cookie_header:
             return None
         
+        # Unquoted headers are scanned for "name=" directly; quoted values
+        # need SimpleCookie's unquoting
+        if isinstance(set_cookie_header, str) and '"' not in set_cookie_header:
+            if cookie_name.lower() in _COOKIE_ATTRIBUTES:
+                return None
+            needle = cookie_name + '='
+            for part in set_cookie_header.split(';'):
+                part = part.strip()
+                if part.startswith(needle):
+                    return part[len(needle):]
+            return None
+        
         try:
             cookie = SimpleCookie()
             cookie.load(set_cookie_header)
@@ -209,65 +298,114 @@ class ResponseExtractor:
     def extract_url_parameter(url: str, param_name: str) -> Optional[str]:
         """Extract parameter from URL query string"""
         try:
-            parsed_url = urlparse(url)
-            params = parse_qs(parsed_url.query)
-            values = params.get(param_name, [])
-            return values[0] if values else None
+            # Scan the query for the first non-blank value, as parse_qs would
+            query = url.partition('#')[0].partition('?')[2]
+            for pair in query.split('&'):
+                name, _, value = pair.partition('=')
+                if not value:
+                    continue
+                if name == param_name or (('%' in name or '+' in name) and unquote_plus(name) == param_name):
+                    return unquote_plus(value)
+            return None
         except Exception:
             return None
 
 
+# Extraction rule type -> extractor(response, rule)
+_EXTRACTORS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Any]] = {
+    'json_path': lambda response, rule: ResponseExtractor.extract_json_path(
+        response.get('body', ''), rule.get('path', rule.get('json_path'))),
+    'regex': lambda response, rule: ResponseExtractor.extract_regex(
+        response.get('body', ''), rule.get('pattern', rule.get('regex')), rule.get('group', 1)),
+    'header': lambda response, rule: ResponseExtractor.extract_header(
+        response.get('headers', {}), rule.get('header_name', rule.get('name'))),
+    'cookie': lambda response, rule: ResponseExtractor.extract_cookie_from_headers(
+        response.get('headers', {}), rule.get('cookie_name', rule.get('name'))),
+    'status_code': lambda response, rule: response.get('status_code'),
+    'response_time': lambda response, rule: response.get(
+        'response_time_ms', response.get('response_time_us', 0) / 1000),
+}
+
+
 class SessionManager:
     """Manages user sessions for load testing scenarios"""
     
     def __init__(self):
-        self._sessions: Dict[str, SessionStore] = {}
-        self._lock = threading.RLock()
+        # Ordered least to most recently used, so expiry scans stop early
+        self._sessions: "OrderedDict[str, SessionStore]" = OrderedDict()
+        self._lock = threading.Lock()
         self._default_session_timeout = 3600  # 1 hour
         self._cleanup_interval = 300  # 5 minutes
         self._last_cleanup = time.time()
+        # Running totals across live sessions, kept up to date by the sessions
+        self._stats_lock = threading.Lock()
+        self._total_cookies = 0
+        self._total_tokens = 0
+    
+    def _adjust_totals(self, cookies_delta: int, tokens_delta: int) -> None:
+        """Apply a session's cookie/token count change to the running totals"""
+        with self._stats_lock:
+            self._total_cookies += cookies_delta
+            self._total_tokens += tokens_delta
+    
+    def _detach(self, session: SessionStore) -> None:
+        """Drop a removed session's counts and stop it reporting further changes"""
+        session._manager = None
+        self._adjust_totals(-len(session._cookies), -len(session._tokens))
     
     def get_session(self, user_id: Union[str, int]) -> SessionStore:
         """Get or create a session for a user"""
         user_key = str(user_id)
         
         with self._lock:
-            if user_key not in self._sessions:
-                self._sessions[user_key] = SessionStore()
+            current_time = time.time()
+            session = self._sessions.get(user_key)
+            if session is None:
+                session = self._sessions[user_key] = SessionStore(self)
+            else:
+                self._sessions.move_to_end(user_key)
+                session._last_accessed = session._ordered_at = current_time
             
             # Periodic cleanup
-            if time.time() - self._last_cleanup > self._cleanup_interval:
+            if current_time - self._last_cleanup > self._cleanup_interval:
                 self._cleanup_expired_sessions()
             
-            return self._sessions[user_key]
+            return session
     
     def clear_session(self, user_id: Union[str, int]) -> None:
         """Clear a specific user session"""
         user_key = str(user_id)
         with self._lock:
-            if user_key in self._sessions:
-                self._sessions[user_key].clear()
-                del self._sessions[user_key]
+            session = self._sessions.pop(user_key, None)
+            if session is not None:
+                session.clear()
+                self._detach(session)
     
     def clear_all_sessions(self) -> None:
         """Clear all user sessions"""
         with self._lock:
             for session in self._sessions.values():
                 session.clear()
+                self._detach(session)
             self._sessions.clear()
     
     def _cleanup_expired_sessions(self) -> None:
-        """Remove expired sessions"""
+        """Remove expired sessions, oldest first"""
         current_time = time.time()
-        expired_users = []
-        
-        for user_id, session in self._sessions.items():
-            session_info = session.get_session_info()
-            if current_time - session_info['last_accessed'] > self._default_session_timeout:
-                expired_users.append(user_id)
+        timeout = self._default_session_timeout
+        sessions = self._sessions
         
-        for user_id in expired_users:
-            self._sessions.pop(user_id, None)
+        # Sessions are in _ordered_at order and _last_accessed is never older,
+        # so everything from the first recently ordered session on is live.
+        # Earlier ones may still have been used through their stores.
+        expired = []
+        for user_key, session in sessions.items():
+            if current_time - session._ordered_at <= timeout:
+                break
+            if current_time - session._last_accessed > timeout:
+                expired.append(user_key)
+        for user_key in expired:
+            self._detach(sessions.pop(user_key))
         
         self._last_cleanup = current_time
     
@@ -279,6 +417,10 @@ class SessionManager:
         
         session = self.get_session(user_id)
         
+        # Parse a raw header block once for all rules rather than once per rule
+        if isinstance(response.get('headers'), str):
+            response = dict(response, headers=_parse_header_string(response['headers']))
+        
         for rule in extract_rules:
             try:
                 value = self._extract_value_by_rule(response, rule)
@@ -293,52 +435,52 @@ class SessionManager:
     def _extract_value_by_rule(self, response: Dict[str, Any], rule: Dict[str, Any]) -> Any:
         """Extract value from response using extraction rule"""
         extract_type = rule.get('type', 'json_path')
-        
-        if extract_type == 'json_path':
-            path = rule.get('path', rule.get('json_path'))
-            return ResponseExtractor.extract_json_path(response.get('body', ''), path)
-        
-        elif extract_type == 'regex':
-            pattern = rule.get('pattern', rule.get('regex'))
-            group = rule.get('group', 1)
-            return ResponseExtractor.extract_regex(response.get('body', ''), pattern, group)
-        
-        elif extract_type == 'header':
-            header_name = rule.get('header_name', rule.get('name'))
-            return ResponseExtractor.extract_header(response.get('headers', {}), header_name)
-        
-        elif extract_type == 'cookie':
-            cookie_name = rule.get('cookie_name', rule.get('name'))
-            return ResponseExtractor.extract_cookie_from_headers(response.get('headers', {}), cookie_name)
-        
-        elif extract_type == 'status_code':
-            return response.get('status_code')
-        
-        elif extract_type == 'response_time':
-            return response.get('response_time_ms', response.get('response_time_us', 0) / 1000)
-        
-        else:
+        extractor = _EXTRACTORS.get(extract_type)
+        if extractor is None:
             raise ValueError(f"Unknown extraction type: {extract_type}")
+        return extractor(response, rule)
     
     def prepare_request_headers(self, user_id: Union[str, int], 
                                base_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """Prepare request headers with session cookies and tokens"""
         headers = base_headers.copy() if base_headers else {}
-        session = self.get_session(user_id)
+        session_headers = self._session_headers(self.get_session(user_id))
+        
+        cookie_header = session_headers.get('Cookie')
+        base_cookie = headers.get('Cookie')
+        headers.update(session_headers)
+        if cookie_header and base_cookie is not None:
+            headers['Cookie'] = f"{base_cookie}; {cookie_header}"
+        
+        return headers
+    
+    def _session_headers(self, session: SessionStore) -> Dict[str, str]:
+        """
+        Headers contributed by a session's cookies and tokens
+        
+        Cached on the session until it is mutated or the earliest expiry of
+        an included token passes. The returned dict is shared; do not modify.
+        The version is read before building, so a concurrent mutation only
+        makes the cache miss on the next call.
+        """
+        version = session._version
+        cached = session._headers_cache
+        if cached is not None and cached[0] == version and time.time() <= cached[1]:
+            return cached[2]
+        
+        headers: Dict[str, str] = {}
+        expires_at = float('inf')
         
         # Add cookies
-        cookies = session.get_all_cookies()
-        if cookies:
-            cookie_header = '; '.join([f"{name}={value}" for name, value in cookies.items()])
-            if 'Cookie' in headers:
-                headers['Cookie'] = f"{headers['Cookie']}; {cookie_header}"
-            else:
-                headers['Cookie'] = cookie_header
+        cookie_header = session.get_cookie_header()
+        if cookie_header:
+            headers['Cookie'] = cookie_header
         
         # Add authorization token if available
         bearer_token = session.get_token('bearer')
         if bearer_token and not session.is_token_expired('bearer'):
             headers['Authorization'] = f"Bearer {bearer_token}"
+            expires_at = min(expires_at, session.get('_token_expires_bearer') or expires_at)
         
         # Add API key if available
         api_key = session.get_token('api_key')
@@ -351,7 +493,9 @@ class SessionManager:
             if token_type not in ['bearer', 'api_key'] and not session.is_token_expired(token_type):
                 header_name = session.get(f'{token_type}_header', f'X-{token_type.title()}-Token')
                 headers[header_name] = token_value
+                expires_at = min(expires_at, session.get(f'_token_expires_{token_type}') or expires_at)
         
+        session._headers_cache = (version, expires_at, headers)
         return headers
     
     def auto_handle_cookies(self, user_id: Union[str, int], response: Dict[str, Any]) -> None:
@@ -378,6 +522,26 @@ class SessionManager:
     
     def _parse_and_store_cookie(self, user_id: Union[str, int], cookie_header: str) -> None:
         """Parse and store a cookie from Set-Cookie header"""
+        # Plain name=value cookies are split directly; quoted values go
+        # through SimpleCookie for its unquoting
+        if '"' not in cookie_header:
+            name_value, _, attributes = cookie_header.partition(';')
+            name, has_value, value = name_value.partition('=')
+            name = name.strip()
+            if not has_value or not name:
+                return
+            domain, path = "", "/"
+            if attributes:
+                for attribute in attributes.split(';'):
+                    key, _, attribute_value = attribute.partition('=')
+                    key = key.strip().lower()
+                    if key == 'domain':
+                        domain = attribute_value.strip()
+                    elif key == 'path':
+                        path = attribute_value.strip()
+            self.get_session(user_id).set_cookie(name, value.strip(), domain, path)
+            return
+        
         try:
             cookie = SimpleCookie()
             cookie.load(cookie_header)
@@ -395,15 +559,11 @@ class SessionManager:
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get statistics about all sessions"""
-        with self._lock:
-            active_sessions = len(self._sessions)
-            total_cookies = sum(len(session.get_all_cookies()) for session in self._sessions.values())
-            total_tokens = sum(len(session.get_all_tokens()) for session in self._sessions.values())
-            
+        with self._stats_lock:
             return {
-                'active_sessions': active_sessions,
-                'total_cookies': total_cookies,
-                'total_tokens': total_tokens,
+                'active_sessions': len(self._sessions),
+                'total_cookies': self._total_cookies,
+                'total_tokens': self._total_tokens,
                 'last_cleanup': self._last_cleanup
             }
 
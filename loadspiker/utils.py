@@ -2,10 +2,30 @@
 Utility functions for load testing
 """
 
+import re
 import time
 import random
-from typing import Callable, Any, Dict, List
+from array import array
+from functools import lru_cache, partial
+from typing import Callable, Any, Dict, Iterable, List, Tuple, Union
 from .engine import Engine
+from .json_utils import dumps_json
+
+# Optional numpy for selection-based percentiles
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+# Placeholders understood by generate_test_data()
+_TEST_DATA_TOKEN_RE = re.compile(r'\$\{(INDEX|UUID|TIMESTAMP|DATETIME|RANDOM_INT)\}')
+
+# "type:n:n[:n[:n]]" load pattern strings accepted by parse_load_pattern()
+_PATTERN_RE = re.compile(r'^(\w+):(\d+):(\d+)(?::(\d+))?(?::(\d+))?$')
+
+# Number of integer fields each load pattern type accepts (min, max)
+_PATTERN_ARITY = {'constant': (2, 2), 'ramp': (3, 3), 'spike': (3, 4)}
 
 
 def ramp_up(start_users: int, end_users: int, duration: int, step_duration: int = 5):
@@ -22,12 +42,11 @@ def ramp_up(start_users: int, end_users: int, duration: int, step_duration: int
         Generator yielding (users, duration) tuples
     """
     steps = duration // step_duration
-    user_increment = (end_users - start_users) / steps
+    user_delta = end_users - start_users
     
-    current_users = start_users
-    for _ in range(steps):
-        yield int(current_users), step_duration
-        current_users += user_increment
+    # Integer interpolation: no float accumulator, so no rounding drift
+    for step in range(steps):
+        yield start_users + user_delta * step // steps, step_duration
     
     # Final step to reach exact end_users
     remaining_time = duration % step_duration
@@ -80,10 +99,8 @@ def stress_test(max_users: int, step_size: int = 10, step_duration: int = 30):
     Returns:
         Generator yielding (users, duration) tuples
     """
-    current_users = step_size
-    while current_users <= max_users:
+    for current_users in range(step_size, max_users + 1, step_size):
         yield current_users, step_duration
-        current_users += step_size
 
 
 def wait_for_condition(condition_func: Callable[[], bool], 
@@ -94,17 +111,22 @@ def wait_for_condition(condition_func: Callable[[], bool],
     Args:
         condition_func: Function that returns boolean
         timeout: Maximum wait time in seconds
-        check_interval: Time between checks in seconds
+        check_interval: Longest time between checks in seconds; checks start
+            at 1/32 of it and back off exponentially
         
     Returns:
         True if condition met, False if timeout
     """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    deadline = time.monotonic() + timeout
+    delay = check_interval / 32
+    while True:
         if condition_func():
             return True
-        time.sleep(check_interval)
-    return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, check_interval)
 
 
 def random_delay(min_ms: int, max_ms: int):
@@ -152,23 +174,70 @@ def validate_response(response: Dict[str, Any],
     Returns:
         True if response is valid, False otherwise
     """
+    get = response.get
+    
     # Check status code
-    if response.get('status_code') != expected_status:
+    if get('status_code') != expected_status:
         return False
     
-    # Check content if specified
-    if expected_content and expected_content not in response.get('body', ''):
+    # Check response time if specified (integer compare, before the body scan)
+    if max_response_time_ms and get('response_time_us', 0) > max_response_time_ms * 1000:
         return False
     
-    # Check response time if specified
-    if max_response_time_ms:
-        response_time_ms = response.get('response_time_us', 0) / 1000
-        if response_time_ms > max_response_time_ms:
-            return False
+    # Check content if specified
+    if expected_content and expected_content not in get('body', ''):
+        return False
     
     return True
 
 
+def validate_responses(responses: List[Dict[str, Any]],
+                       expected_status: int = 200,
+                       expected_content: str = None,
+                       max_response_time_ms: int = None) -> List[bool]:
+    """
+    Validate a batch of responses, same checks as validate_response()
+    
+    Args:
+        responses: Response dictionaries from engine
+        expected_status: Expected HTTP status code
+        expected_content: Expected content in response body
+        max_response_time_ms: Maximum acceptable response time
+        
+    Returns:
+        One bool per response, in order
+    """
+    get = dict.get
+    
+    # Common case: status code only
+    if not expected_content and not max_response_time_ms:
+        return [get(r, 'status_code') == expected_status for r in responses]
+    
+    max_us = max_response_time_ms * 1000 if max_response_time_ms else None
+    results = []
+    append = results.append
+    for r in responses:
+        append(get(r, 'status_code') == expected_status
+               and not (max_us is not None and get(r, 'response_time_us', 0) > max_us)
+               and not (expected_content and expected_content not in get(r, 'body', '')))
+    return results
+
+
+def _session_body(req: Dict[str, Any]) -> str:
+    """Return a session request's body, serializing dict/list bodies as JSON"""
+    body = req.get('body', '')
+    if isinstance(body, (dict, list)):
+        return dumps_json(body)
+    return body
+
+
+def _encode_session_body(req: Dict[str, Any]) -> Dict[str, Any]:
+    """Return req with a JSON-serialized body, copying only when needed"""
+    if isinstance(req.get('body'), (dict, list)):
+        return {**req, 'body': dumps_json(req['body'])}
+    return req
+
+
 def create_user_session(engine: Engine, session_requests: List[Dict[str, Any]]):
     """
     Create a user session that executes multiple requests in sequence
@@ -179,17 +248,31 @@ def create_user_session(engine: Engine, session_requests: List[Dict[str, Any]]):
         
     Returns:
         List of responses
+        
+    Raises:
+        RuntimeError: If a request cannot be executed; its ``responses``
+            attribute holds the responses completed before the failure
     """
+    # A LoadSpiker engine runs the whole session in one engine call; other
+    # engine objects are driven one request at a time
+    if isinstance(engine, Engine):
+        return engine.execute_requests([_encode_session_body(req) for req in session_requests])
+    
     responses = []
     
     for req in session_requests:
-        response = engine.execute_request(
-            url=req['url'],
-            method=req.get('method', 'GET'),
-            headers=req.get('headers'),
-            body=req.get('body', ''),
-            timeout_ms=req.get('timeout_ms', 30000)
-        )
+        try:
+            response = engine.execute_request(
+                url=req['url'],
+                method=req.get('method', 'GET'),
+                headers=req.get('headers'),
+                body=_session_body(req),
+                timeout_ms=req.get('timeout_ms', 30000)
+            )
+        except RuntimeError as e:
+            # Same contract as Engine.execute_requests()
+            e.responses = responses
+            raise
         responses.append(response)
         
         # Add realistic delay between requests
@@ -199,13 +282,71 @@ def create_user_session(engine: Engine, session_requests: List[Dict[str, Any]]):
     return responses
 
 
-def generate_test_data(count: int, data_template: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def create_user_session_async(engine: Engine, session_requests: List[Dict[str, Any]],
+                                    max_concurrency: int = 16) -> List[Dict[str, Any]]:
+    """
+    Create a user session that overlaps independent requests
+    
+    Consecutive requests marked with ``"parallel": True`` run concurrently
+    (at most max_concurrency at a time); all other requests run in order
+    as in create_user_session. Requests run in worker threads, and
+    ``delay_ms`` is awaited rather than slept.
+    
+    Args:
+        engine: Load test engine instance
+        session_requests: List of request dictionaries
+        max_concurrency: Maximum requests in flight at once
+        
+    Returns:
+        List of responses, in request order
+    """
+    import asyncio
+    
+    responses: List[Dict[str, Any]] = [None] * len(session_requests)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+    loop = asyncio.get_running_loop()
+    
+    async def run(index: int, req: Dict[str, Any]) -> None:
+        async with semaphore:
+            responses[index] = await loop.run_in_executor(None, partial(
+                engine.execute_request,
+                url=req['url'],
+                method=req.get('method', 'GET'),
+                headers=req.get('headers'),
+                body=_session_body(req),
+                timeout_ms=req.get('timeout_ms', 30000)
+            ))
+        
+        # Add realistic delay between requests
+        if 'delay_ms' in req:
+            await asyncio.sleep(req['delay_ms'] / 1000.0)
+    
+    batch = []
+    for index, req in enumerate(session_requests):
+        if req.get('parallel', False):
+            batch.append(run(index, req))
+            continue
+        if batch:
+            await asyncio.gather(*batch)
+            batch = []
+        await run(index, req)
+    if batch:
+        await asyncio.gather(*batch)
+    
+    return responses
+
+
+def generate_test_data(count: int, data_template: Dict[str, Any],
+                       fresh_datetime: bool = False) -> List[Dict[str, Any]]:
     """
     Generate test data based on a template
     
     Args:
         count: Number of data items to generate
         data_template: Template with placeholders
+        fresh_datetime: Read the clock for every item instead of stamping
+            all items with the time generation started
         
     Returns:
         List of generated data items
@@ -213,21 +354,42 @@ def generate_test_data(count: int, data_template: Dict[str, Any]) -> List[Dict[s
     import uuid
     import datetime
     
+    generators = {
+        'UUID': lambda: str(uuid.uuid4()),
+        'RANDOM_INT': lambda: str(random.randint(1, 1000)),
+    }
+    if fresh_datetime:
+        generators['TIMESTAMP'] = lambda: str(int(time.time()))
+        generators['DATETIME'] = lambda: datetime.datetime.now().isoformat()
+    else:
+        # Rows are generated microseconds apart; snapshot the clock once
+        timestamp = str(int(time.time()))
+        now = datetime.datetime.now().isoformat()
+        generators['TIMESTAMP'] = lambda: timestamp
+        generators['DATETIME'] = lambda: now
+    
+    # Split each string once into literals and placeholder names, so rows
+    # only generate the values their templates actually use
+    plan = []
+    for key, value in data_template.items():
+        parts = _TEST_DATA_TOKEN_RE.split(value) if isinstance(value, str) and '${' in value else None
+        if parts is not None and len(parts) > 1:
+            plan.append((key, parts, frozenset(parts[1::2])))
+        else:
+            plan.append((key, value, None))
+    
     generated_data = []
     
     for i in range(count):
+        index = str(i)
         data_item = {}
-        for key, value in data_template.items():
-            if isinstance(value, str):
-                # Replace placeholders
-                processed_value = value.replace('${INDEX}', str(i))
-                processed_value = processed_value.replace('${UUID}', str(uuid.uuid4()))
-                processed_value = processed_value.replace('${TIMESTAMP}', str(int(time.time())))
-                processed_value = processed_value.replace('${DATETIME}', datetime.datetime.now().isoformat())
-                processed_value = processed_value.replace('${RANDOM_INT}', str(random.randint(1, 1000)))
-                data_item[key] = processed_value
-            else:
+        for key, value, tokens in plan:
+            if tokens is None:
                 data_item[key] = value
+                continue
+            # Each placeholder gets one value per string, like str.replace
+            values = {token: index if token == 'INDEX' else generators[token]() for token in tokens}
+            data_item[key] = "".join([part if j % 2 == 0 else values[part] for j, part in enumerate(value)])
         
         generated_data.append(data_item)
     
@@ -249,42 +411,98 @@ def parse_load_pattern(pattern_string: str):
     Returns:
         Generator yielding (users, duration) tuples
     """
-    parts = pattern_string.split(':')
-    pattern_type = parts[0].lower()
+    pattern_type, *args = _parse_pattern_parts(pattern_string)
     
     if pattern_type == 'constant':
-        users, duration = int(parts[1]), int(parts[2])
-        return constant_load(users, duration)
+        return constant_load(*args)
     
     elif pattern_type == 'ramp':
-        start_users, end_users, duration = int(parts[1]), int(parts[2]), int(parts[3])
-        return ramp_up(start_users, end_users, duration)
-    
-    elif pattern_type == 'spike':
-        normal_users, spike_users, spike_duration = int(parts[1]), int(parts[2]), int(parts[3])
-        normal_duration = 60  # Default normal duration
-        if len(parts) > 4:
-            normal_duration = int(parts[4])
-        return spike_test(normal_users, spike_users, normal_duration, spike_duration)
+        return ramp_up(*args)
     
     else:
+        normal_users, spike_users, spike_duration = args[:3]
+        normal_duration = args[3] if len(args) > 3 else 60  # Default normal duration
+        return spike_test(normal_users, spike_users, normal_duration, spike_duration)
+
+
+@lru_cache(maxsize=1024)
+def _parse_pattern_parts(pattern_string: str) -> Tuple:
+    """Validate a load pattern string and return (type, *ints)"""
+    match = _PATTERN_RE.match(pattern_string)
+    if not match:
+        raise ValueError(f"Invalid load pattern: {pattern_string!r}")
+    
+    pattern_type = match.group(1).lower()
+    if pattern_type not in _PATTERN_ARITY:
         raise ValueError(f"Unknown load pattern type: {pattern_type}")
+    
+    args = tuple(int(v) for v in match.groups()[1:] if v is not None)
+    min_args, max_args = _PATTERN_ARITY[pattern_type]
+    if not min_args <= len(args) <= max_args:
+        raise ValueError(f"Invalid load pattern: {pattern_string!r}")
+    
+    return (pattern_type,) + args
 
 
-def calculate_percentiles(values: List[float], percentiles: List[int] = [50, 90, 95, 99]) -> Dict[int, float]:
+class LatencyAccumulator:
+    """
+    Append-only store for latency samples
+    
+    Samples are kept as contiguous float64 values rather than a list of
+    Python floats, so calculate_percentiles() can read them without
+    unboxing.
+    """
+    
+    __slots__ = ('samples',)
+    
+    def __init__(self, values: Iterable[float] = ()):
+        self.samples = array('d', values)
+    
+    def add(self, value: float):
+        """Record one sample"""
+        self.samples.append(value)
+    
+    def extend(self, values: Iterable[float]):
+        """Record several samples"""
+        self.samples.extend(values)
+    
+    def clear(self):
+        """Drop all samples"""
+        del self.samples[:]
+    
+    def __len__(self) -> int:
+        return len(self.samples)
+
+
+def calculate_percentiles(values: Union[List[float], LatencyAccumulator],
+                          percentiles: List[int] = [50, 90, 95, 99]) -> Dict[int, float]:
     """
     Calculate percentiles from a list of values
     
     Args:
-        values: List of numeric values
+        values: List of numeric values or a LatencyAccumulator
         percentiles: List of percentile values to calculate
         
     Returns:
         Dictionary mapping percentile to value
     """
+    if isinstance(values, LatencyAccumulator):
+        values = values.samples
+    
     if not values:
         return {p: 0.0 for p in percentiles}
     
+    if _numpy_available:
+        # Only the requested order statistics are needed, so partition
+        # around them instead of sorting everything (array('d') samples
+        # are wrapped without a copy)
+        arr = np.asarray(values, dtype=np.float64)
+        n = len(arr)
+        indices = {p: int((p / 100.0) * (n - 1)) for p in percentiles}
+        if indices:
+            arr = np.partition(arr, sorted(set(indices.values())))
+        return {p: float(arr[index]) for p, index in indices.items()}
+    
     sorted_values = sorted(values)
     n = len(sorted_values)
     
@@ -293,4 +511,47 @@ def calculate_percentiles(values: List[float], percentiles: List[int] = [50, 90,
         index = int((p / 100.0) * (n - 1))
         result[p] = sorted_values[index]
     
-    return result
\ No newline at end of file
+    return result
+
+
+def calculate_percentiles_batch(metrics: Dict[str, Union[List[float], LatencyAccumulator]],
+                                percentiles: List[int] = [50, 90, 95, 99]) -> Dict[str, Dict[int, float]]:
+    """
+    Calculate the same percentiles for several metrics at once
+    
+    With numpy, metrics with the same number of samples are stacked and
+    partitioned together in one call.
+    
+    Args:
+        metrics: Mapping of metric name to its values
+        percentiles: List of percentile values to calculate
+        
+    Returns:
+        Dictionary mapping metric name to calculate_percentiles() result
+    """
+    if not _numpy_available or not percentiles:
+        return {name: calculate_percentiles(values, percentiles) for name, values in metrics.items()}
+    
+    # Group metrics by sample count; each group shares its order statistics
+    groups: Dict[int, List[Tuple[str, Any]]] = {}
+    for name, values in metrics.items():
+        if isinstance(values, LatencyAccumulator):
+            values = values.samples
+        groups.setdefault(len(values), []).append((name, values))
+    
+    results = {}
+    for n, members in groups.items():
+        if n == 0 or len(members) == 1:
+            for name, values in members:
+                results[name] = calculate_percentiles(values, percentiles)
+            continue
+        
+        indices = {p: int((p / 100.0) * (n - 1)) for p in percentiles}
+        kth = sorted(set(indices.values()))
+        stacked = np.partition(np.array([np.asarray(v, dtype=np.float64) for _, v in members]), kth, axis=1)
+        for (name, _), row in zip(members, stacked[:, kth].tolist()):
+            by_index = dict(zip(kth, row))
+            results[name] = {p: by_index[index] for p, index in indices.items()}
+    
+    # Preserve the caller's metric order
+    return {name: results[name] for name in metrics}
@@ -1,4 +1,6 @@
 from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
+from functools import lru_cache
 import subprocess
 import sys
 import os
@@ -14,27 +16,47 @@ DEBUG_MODE = os.environ.get('LOADSPIKER_DEBUG', '0') == '1'
 # Verbose mode: Set LOADSPIKER_VERBOSE=1 for detailed build output
 VERBOSE_MODE = os.environ.get('LOADSPIKER_VERBOSE', '0') == '1'
 
+# Portable mode: Set LOADSPIKER_PORTABLE=1 to skip -march=native (e.g. for wheels)
+PORTABLE_MODE = os.environ.get('LOADSPIKER_PORTABLE', '0') == '1'
+
+# Profile-guided optimization: build with --pgo=generate (or LOADSPIKER_PGO=generate),
+# run a workload, then rebuild with --pgo=use. Profiles go to LOADSPIKER_PGO_DIR.
+# `make pgo` runs all three steps.
+PGO_MODE = os.environ.get('LOADSPIKER_PGO', '').lower()
+PGO_DIR = os.path.abspath(os.environ.get('LOADSPIKER_PGO_DIR', 'pgo'))
+
 
 # =============================================================================
 # Dependency Checking
 # =============================================================================
 
-def check_pkg_config_available():
-    """Check if pkg-config is available on the system"""
+@lru_cache(maxsize=None)
+def run_pkg_config(*args):
+    """
+    Run pkg-config once per distinct argument list.
+    
+    Returns:
+        Stripped stdout, or None if pkg-config is missing or fails
+    """
     try:
-        subprocess.check_output(['pkg-config', '--version'], stderr=subprocess.DEVNULL)
-        return True
+        return subprocess.check_output(
+            ['pkg-config', *args],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        return None
+
+
+def check_pkg_config_available():
+    """Check if pkg-config is available on the system"""
+    return run_pkg_config('--version') is not None
 
 
 def check_libcurl_available():
     """Check if libcurl is available via pkg-config"""
-    try:
-        subprocess.check_output(['pkg-config', '--exists', 'libcurl'], stderr=subprocess.DEVNULL)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    # --cflags fails for missing packages just like --exists, and its
+    # output is reused by get_pkg_config_flags()
+    return run_pkg_config('--cflags', 'libcurl') is not None
 
 
 def check_dependencies():
@@ -96,15 +118,11 @@ def get_pkg_config_flags(package):
     Returns:
         Tuple of (cflags, libs) lists
     """
-    try:
-        cflags = subprocess.check_output(
-            ['pkg-config', '--cflags', package],
-            stderr=subprocess.DEVNULL
-        ).decode().strip().split()
-        libs = subprocess.check_output(
-            ['pkg-config', '--libs', package],
-            stderr=subprocess.DEVNULL
-        ).decode().strip().split()
+    cflags_output = run_pkg_config('--cflags', package)
+    libs_output = run_pkg_config('--libs', package) if cflags_output is not None else None
+    
+    if libs_output is not None:
+        cflags, libs = cflags_output.split(), libs_output.split()
         
         if VERBOSE_MODE:
             print(f"📦 {package} found via pkg-config")
@@ -112,7 +130,7 @@ def get_pkg_config_flags(package):
             print(f"   LIBS:   {' '.join(libs)}")
         
         return cflags, libs
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         if VERBOSE_MODE:
             print(f"⚠️  {package}: using fallback configuration")
         
@@ -168,8 +186,14 @@ if DEBUG_MODE:
     OPTIMIZATION_FLAGS = ['-g', '-O0', '-DDEBUG']
     LINK_FLAGS = ['-g']
 else:
-    OPTIMIZATION_FLAGS = ['-O2', '-DNDEBUG']
-    LINK_FLAGS = []
+    OPTIMIZATION_FLAGS = ['-O3', '-DNDEBUG', '-flto', '-fno-plt']
+    LINK_FLAGS = ['-O3', '-flto']
+    
+    if not PORTABLE_MODE:
+        OPTIMIZATION_FLAGS += ['-march=native', '-mtune=native']
+    
+    if sys.platform.startswith('linux'):
+        LINK_FLAGS += ['-Wl,-O1', '-Wl,--as-needed']
 
 # Combine all compile arguments
 extra_compile_args = (
@@ -187,6 +211,51 @@ if VERBOSE_MODE:
     print(f"🔗 Link flags: {' '.join(extra_link_args)}")
 
 
+def get_pgo_flags(mode):
+    """
+    Get compile and link flags for a profile-guided optimization stage.
+    
+    Args:
+        mode: 'generate' to instrument, 'use' to apply collected profiles,
+              or '' for a normal build
+        
+    Returns:
+        Tuple of (compile_flags, link_flags) lists
+    """
+    if mode == 'generate':
+        print(f"📈 Building with PGO instrumentation (profiles in {PGO_DIR})")
+        return [f'-fprofile-generate={PGO_DIR}'], [f'-fprofile-generate={PGO_DIR}']
+    if mode == 'use':
+        print(f"📈 Building with PGO profiles from {PGO_DIR}")
+        return ([f'-fprofile-use={PGO_DIR}', '-fprofile-correction'],
+                [f'-fprofile-use={PGO_DIR}'])
+    if mode:
+        sys.exit(f"❌ Unknown PGO mode '{mode}' (expected 'generate' or 'use')")
+    return [], []
+
+
+class BuildExtWithPGO(build_ext):
+    """build_ext with a --pgo=generate|use option"""
+    
+    user_options = build_ext.user_options + [
+        ('pgo=', None, "profile-guided optimization stage: 'generate' or 'use'"),
+    ]
+    
+    def initialize_options(self):
+        super().initialize_options()
+        self.pgo = PGO_MODE
+    
+    def build_extensions(self):
+        if DEBUG_MODE:
+            compile_flags, link_flags = [], []
+        else:
+            compile_flags, link_flags = get_pgo_flags((self.pgo or '').lower())
+        for ext in self.extensions:
+            ext.extra_compile_args = ext.extra_compile_args + compile_flags
+            ext.extra_link_args = ext.extra_link_args + link_flags
+        super().build_extensions()
+
+
 # =============================================================================
 # Extension Module Definition
 # =============================================================================
@@ -208,17 +277,25 @@ loadspiker_c_extension = Extension(
     define_macros=[('_GNU_SOURCE', None)]
 )
 
+def read_readme():
+    """Read README.md for the package long description."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'README.md'),
+              encoding='utf-8') as f:
+        return f.read()
+
+
 setup(
     name='loadspiker',
     version='1.0.0',
     description='High-performance load testing tool with C engine and Python scripting',
-    long_description=open('README.md').read(),
+    long_description=read_readme(),
     long_description_content_type='text/markdown',
     author='LoadSpiker Team',
     author_email='team@loadspiker.com',
     url='https://github.com/loadspiker/loadspiker',
     packages=['loadspiker'],
     ext_modules=[loadspiker_c_extension],
+    cmdclass={'build_ext': BuildExtWithPGO},
     scripts=['cli.py'],
     entry_points={
         'console_scripts': [
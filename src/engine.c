@@ -598,10 +598,11 @@ static void* worker_thread_func(void* arg) {
         if (strlen(request.headers) > 0) {
             char* header_copy = strdup(request.headers);
             if (header_copy) {
-                char* token = strtok(header_copy, "\n");
+                char* saveptr = NULL;
+                char* token = strtok_r(header_copy, "\n", &saveptr);
                 while (token) {
                     header_list = curl_slist_append(header_list, token);
-                    token = strtok(NULL, "\n");
+                    token = strtok_r(NULL, "\n", &saveptr);
                 }
                 curl_easy_setopt(curl, CURLOPT_HTTPHEADER, header_list);
                 free(header_copy);
@@ -788,10 +789,12 @@ int engine_execute_request_sync(engine_t* engine, const http_request_t* request,
     if (strlen(request->headers) > 0) {
         char* header_copy = strdup(request->headers);
         if (header_copy) {
-            char* token = strtok(header_copy, "\n");
+            /* strtok_r: requests run on several threads at once, even without the GIL */
+            char* saveptr = NULL;
+            char* token = strtok_r(header_copy, "\n", &saveptr);
             while (token) {
                 header_list = curl_slist_append(header_list, token);
-                token = strtok(NULL, "\n");
+                token = strtok_r(NULL, "\n", &saveptr);
             }
             curl_easy_setopt(curl, CURLOPT_HTTPHEADER, header_list);
             free(header_copy);
@@ -890,13 +893,18 @@ void engine_get_metrics(engine_t* engine, metrics_t* metrics) {
 
     /* Percentile computation from histogram */
     if (metrics->total_requests > 0) {
+        uint64_t p50_target = (metrics->total_requests + 1) / 2;
         uint64_t p95_target = (uint64_t)(metrics->total_requests * 0.95);
         uint64_t p99_target = (uint64_t)(metrics->total_requests * 0.99);
         uint64_t cumulative = 0;
-        bool p95_set = false, p99_set = false;
+        bool p50_set = false, p95_set = false, p99_set = false;
 
         for (int i = 0; i < HISTOGRAM_BUCKET_COUNT; i++) {
             cumulative += metrics->histogram_buckets[i];
+            if (!p50_set && cumulative >= p50_target) {
+                metrics->p50_us = (uint64_t)(i + 1) * 1000;
+                p50_set = true;
+            }
             if (!p95_set && cumulative >= p95_target) {
                 metrics->p95_us = (uint64_t)(i + 1) * 1000;
                 p95_set = true;
@@ -908,9 +916,11 @@ void engine_get_metrics(engine_t* engine, metrics_t* metrics) {
             }
         }
         /* If not set (all in overflow bucket), use max */
+        if (!p50_set) metrics->p50_us = metrics->max_response_time_us;
         if (!p95_set) metrics->p95_us = metrics->max_response_time_us;
         if (!p99_set) metrics->p99_us = metrics->max_response_time_us;
     } else {
+        metrics->p50_us = 0;
         metrics->p95_us = 0;
         metrics->p99_us = 0;
     }
@@ -987,10 +997,11 @@ static void* load_test_worker_func(void* arg) {
         if (strlen(request.headers) > 0) {
             char* header_copy = strdup(request.headers);
             if (header_copy) {
-                char* token = strtok(header_copy, "\n");
+                char* saveptr = NULL;
+                char* token = strtok_r(header_copy, "\n", &saveptr);
                 while (token) {
                     header_list = curl_slist_append(header_list, token);
-                    token = strtok(NULL, "\n");
+                    token = strtok_r(NULL, "\n", &saveptr);
                 }
                 curl_easy_setopt(curl, CURLOPT_HTTPHEADER, header_list);
                 free(header_copy);
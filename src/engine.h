@@ -156,6 +156,7 @@ typedef struct {
        Bucket HISTOGRAM_OVERFLOW_INDEX is the overflow bucket for latency >= 9999ms. */
     uint64_t histogram_buckets[HISTOGRAM_BUCKET_COUNT];
     /* Precomputed percentiles (populated by engine_get_metrics) */
+    uint64_t p50_us;
     uint64_t p95_us;
     uint64_t p99_us;
 } metrics_t;
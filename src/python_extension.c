@@ -1,5 +1,6 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <unistd.h>
 #include "engine.h"
 
 typedef struct {
@@ -43,6 +44,92 @@ static int LoadTestEngine_init(LoadTestEngineObject* self, PyObject* args, PyObj
     return 0;
 }
 
+/* Store value under key and drop our reference; value may be NULL on error */
+static int set_dict_item(PyObject* dict, const char* key, PyObject* value) {
+    if (!value) return -1;
+    int result = PyDict_SetItemString(dict, key, value);
+    Py_DECREF(value);
+    return result;
+}
+
+static PyObject* http_response_to_dict(const http_response_t* response) {
+    PyObject* response_dict = PyDict_New();
+    if (!response_dict) return NULL;
+    
+    if (set_dict_item(response_dict, "status_code", PyLong_FromLong(response->status_code)) < 0 ||
+        set_dict_item(response_dict, "headers", PyUnicode_FromString(response->headers)) < 0 ||
+        set_dict_item(response_dict, "body", PyUnicode_FromString(response->body)) < 0 ||
+        set_dict_item(response_dict, "response_time_us", PyLong_FromUnsignedLongLong(response->response_time_us)) < 0 ||
+        set_dict_item(response_dict, "success", PyBool_FromLong(response->success)) < 0 ||
+        set_dict_item(response_dict, "error_message", PyUnicode_FromString(response->error_message)) < 0) {
+        Py_DECREF(response_dict);
+        return NULL;
+    }
+    
+    return response_dict;
+}
+
+/* Copy len bytes of src into a zeroed fixed-size field, truncating to fit.
+ * Unlike strncpy this does not zero-fill the rest of the (up to 64KB) field. */
+static void copy_field(char* dst, size_t size, const char* src, Py_ssize_t len) {
+    size_t n = (size_t)len < size - 1 ? (size_t)len : size - 1;
+    memcpy(dst, src, n);
+    dst[n] = '\0';
+}
+
+/* Copy a str object into a fixed-size field; returns -1 with an exception set */
+static int copy_unicode_field(char* dst, size_t size, PyObject* obj) {
+    Py_ssize_t len;
+    const char* value = PyUnicode_AsUTF8AndSize(obj, &len);
+    if (!value) return -1;
+    copy_field(dst, size, value, len);
+    return 0;
+}
+
+/* Fill request from a {"url", "method", "headers", "body", "timeout_ms"} dict.
+ * Sets a Python exception and returns -1 on invalid input. */
+static int http_request_from_dict(PyObject* req_dict, http_request_t* request) {
+    if (!PyDict_Check(req_dict)) {
+        PyErr_SetString(PyExc_TypeError, "Each request must be a dictionary");
+        return -1;
+    }
+    
+    memset(request, 0, sizeof(http_request_t));
+    
+    PyObject* method_obj = PyDict_GetItemString(req_dict, "method");
+    if (method_obj && PyUnicode_Check(method_obj)) {
+        if (copy_unicode_field(request->method, sizeof(request->method), method_obj) < 0) return -1;
+    } else {
+        strcpy(request->method, "GET");
+    }
+    
+    PyObject* url_obj = PyDict_GetItemString(req_dict, "url");
+    if (!url_obj || !PyUnicode_Check(url_obj)) {
+        PyErr_SetString(PyExc_ValueError, "Each request must have a 'url' field");
+        return -1;
+    }
+    if (copy_unicode_field(request->url, sizeof(request->url), url_obj) < 0) return -1;
+    
+    PyObject* headers_obj = PyDict_GetItemString(req_dict, "headers");
+    if (headers_obj && PyUnicode_Check(headers_obj)) {
+        if (copy_unicode_field(request->headers, sizeof(request->headers), headers_obj) < 0) return -1;
+    }
+    
+    PyObject* body_obj = PyDict_GetItemString(req_dict, "body");
+    if (body_obj && PyUnicode_Check(body_obj)) {
+        if (copy_unicode_field(request->body, sizeof(request->body), body_obj) < 0) return -1;
+    }
+    
+    PyObject* timeout_obj = PyDict_GetItemString(req_dict, "timeout_ms");
+    if (timeout_obj && PyLong_Check(timeout_obj)) {
+        request->timeout_ms = PyLong_AsLong(timeout_obj);
+    } else {
+        request->timeout_ms = 30000;
+    }
+    
+    return 0;
+}
+
 static PyObject* LoadTestEngine_execute_request(LoadTestEngineObject* self, PyObject* args, PyObject* kwds) {
     const char* method = "GET";
     const char* url;
@@ -58,29 +145,109 @@ static PyObject* LoadTestEngine_execute_request(LoadTestEngineObject* self, PyOb
     }
     
     http_request_t request = {0};
-    strncpy(request.method, method, sizeof(request.method) - 1);
-    strncpy(request.url, url, sizeof(request.url) - 1);
-    strncpy(request.headers, headers, sizeof(request.headers) - 1);
-    strncpy(request.body, body, sizeof(request.body) - 1);
+    copy_field(request.method, sizeof(request.method), method, strlen(method));
+    copy_field(request.url, sizeof(request.url), url, strlen(url));
+    copy_field(request.headers, sizeof(request.headers), headers, strlen(headers));
+    copy_field(request.body, sizeof(request.body), body, strlen(body));
     request.timeout_ms = timeout_ms;
     
     http_response_t response = {0};
-    int result = engine_execute_request_sync(self->engine, &request, &response);
+    int result;
+    /* The request runs on its own curl handle, so other threads may run meanwhile */
+    Py_BEGIN_ALLOW_THREADS
+    result = engine_execute_request_sync(self->engine, &request, &response);
+    Py_END_ALLOW_THREADS
     
     if (result != 0) {
         PyErr_SetString(PyExc_RuntimeError, "Failed to execute request");
         return NULL;
     }
     
-    PyObject* response_dict = PyDict_New();
-    PyDict_SetItemString(response_dict, "status_code", PyLong_FromLong(response.status_code));
-    PyDict_SetItemString(response_dict, "headers", PyUnicode_FromString(response.headers));
-    PyDict_SetItemString(response_dict, "body", PyUnicode_FromString(response.body));
-    PyDict_SetItemString(response_dict, "response_time_us", PyLong_FromUnsignedLongLong(response.response_time_us));
-    PyDict_SetItemString(response_dict, "success", PyBool_FromLong(response.success));
-    PyDict_SetItemString(response_dict, "error_message", PyUnicode_FromString(response.error_message));
+    return http_response_to_dict(&response);
+}
+
+static PyObject* LoadTestEngine_execute_requests(LoadTestEngineObject* self, PyObject* args, PyObject* kwds) {
+    PyObject* requests_list;
     
-    return response_dict;
+    static char* kwlist[] = {"requests", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!", kwlist, &PyList_Type, &requests_list)) {
+        return NULL;
+    }
+    
+    Py_ssize_t num_requests = PyList_GET_SIZE(requests_list);
+    if (num_requests == 0) {
+        return PyList_New(0);
+    }
+    
+    http_request_t* requests = malloc(sizeof(http_request_t) * num_requests);
+    http_response_t* responses = calloc(num_requests, sizeof(http_response_t));
+    double* delays_ms = calloc(num_requests, sizeof(double));
+    if (!requests || !responses || !delays_ms) {
+        free(requests);
+        free(responses);
+        free(delays_ms);
+        return PyErr_NoMemory();
+    }
+    
+    PyObject* result_list = NULL;
+    Py_ssize_t completed = 0;
+    
+    for (Py_ssize_t i = 0; i < num_requests; i++) {
+        PyObject* req_dict = PyList_GET_ITEM(requests_list, i);
+        if (http_request_from_dict(req_dict, &requests[i]) < 0) {
+            goto cleanup;
+        }
+        PyObject* delay_obj = PyDict_GetItemString(req_dict, "delay_ms");
+        if (delay_obj && (PyLong_Check(delay_obj) || PyFloat_Check(delay_obj))) {
+            delays_ms[i] = PyFloat_AsDouble(delay_obj);
+            if (delays_ms[i] == -1.0 && PyErr_Occurred()) goto cleanup;
+        }
+    }
+    
+    /* Run the whole session with the GIL released, in order, pausing
+     * delay_ms after each request like create_user_session(). The session
+     * stops at the first request the engine fails to execute. */
+    Py_BEGIN_ALLOW_THREADS
+    for (; completed < num_requests; completed++) {
+        if (engine_execute_request_sync(self->engine, &requests[completed], &responses[completed]) != 0) {
+            break;
+        }
+        if (delays_ms[completed] > 0) {
+            usleep((useconds_t)(delays_ms[completed] * 1000.0));
+        }
+    }
+    Py_END_ALLOW_THREADS
+    
+    result_list = PyList_New(completed);
+    if (!result_list) goto cleanup;
+    
+    for (Py_ssize_t i = 0; i < completed; i++) {
+        PyObject* response_dict = http_response_to_dict(&responses[i]);
+        if (!response_dict) {
+            Py_CLEAR(result_list);
+            goto cleanup;
+        }
+        PyList_SET_ITEM(result_list, i, response_dict);
+    }
+    
+    if (completed < num_requests) {
+        /* Keep the responses that did complete on the exception */
+        PyObject* exc = PyObject_CallFunction(PyExc_RuntimeError, "s", "Failed to execute request");
+        if (exc) {
+            if (PyObject_SetAttrString(exc, "responses", result_list) == 0) {
+                PyErr_SetObject(PyExc_RuntimeError, exc);
+            }
+            Py_DECREF(exc);
+        }
+        Py_CLEAR(result_list);
+    }
+    
+cleanup:
+    free(requests);
+    free(responses);
+    free(delays_ms);
+    return result_list;
 }
 
 static PyObject* LoadTestEngine_start_load_test(LoadTestEngineObject* self, PyObject* args, PyObject* kwds) {
@@ -113,50 +280,10 @@ static PyObject* LoadTestEngine_start_load_test(LoadTestEngineObject* self, PyOb
     }
     
     for (Py_ssize_t i = 0; i < num_requests; i++) {
-        PyObject* req_dict = PyList_GetItem(requests_list, i);
-        if (!PyDict_Check(req_dict)) {
-            free(requests);
-            PyErr_SetString(PyExc_TypeError, "Each request must be a dictionary");
-            return NULL;
-        }
-        
-        memset(&requests[i], 0, sizeof(http_request_t));
-        
-        PyObject* method_obj = PyDict_GetItemString(req_dict, "method");
-        if (method_obj && PyUnicode_Check(method_obj)) {
-            const char* method = PyUnicode_AsUTF8(method_obj);
-            strncpy(requests[i].method, method, sizeof(requests[i].method) - 1);
-        } else {
-            strcpy(requests[i].method, "GET");
-        }
-        
-        PyObject* url_obj = PyDict_GetItemString(req_dict, "url");
-        if (!url_obj || !PyUnicode_Check(url_obj)) {
+        if (http_request_from_dict(PyList_GetItem(requests_list, i), &requests[i]) < 0) {
             free(requests);
-            PyErr_SetString(PyExc_ValueError, "Each request must have a 'url' field");
             return NULL;
         }
-        const char* url = PyUnicode_AsUTF8(url_obj);
-        strncpy(requests[i].url, url, sizeof(requests[i].url) - 1);
-        
-        PyObject* headers_obj = PyDict_GetItemString(req_dict, "headers");
-        if (headers_obj && PyUnicode_Check(headers_obj)) {
-            const char* headers = PyUnicode_AsUTF8(headers_obj);
-            strncpy(requests[i].headers, headers, sizeof(requests[i].headers) - 1);
-        }
-        
-        PyObject* body_obj = PyDict_GetItemString(req_dict, "body");
-        if (body_obj && PyUnicode_Check(body_obj)) {
-            const char* body = PyUnicode_AsUTF8(body_obj);
-            strncpy(requests[i].body, body, sizeof(requests[i].body) - 1);
-        }
-        
-        PyObject* timeout_obj = PyDict_GetItemString(req_dict, "timeout_ms");
-        if (timeout_obj && PyLong_Check(timeout_obj)) {
-            requests[i].timeout_ms = PyLong_AsLong(timeout_obj);
-        } else {
-            requests[i].timeout_ms = 30000;
-        }
     }
     
     Py_BEGIN_ALLOW_THREADS
@@ -180,6 +307,7 @@ static PyObject* LoadTestEngine_get_metrics(LoadTestEngineObject* self, PyObject
     PyDict_SetItemString(metrics_dict, "min_response_time_us", PyLong_FromUnsignedLongLong(metrics.min_response_time_us));
     PyDict_SetItemString(metrics_dict, "max_response_time_us", PyLong_FromUnsignedLongLong(metrics.max_response_time_us));
     PyDict_SetItemString(metrics_dict, "requests_per_second", PyFloat_FromDouble(metrics.requests_per_second));
+    PyDict_SetItemString(metrics_dict, "p50_us", PyLong_FromUnsignedLongLong(metrics.p50_us));
     PyDict_SetItemString(metrics_dict, "p95_us", PyLong_FromUnsignedLongLong(metrics.p95_us));
     PyDict_SetItemString(metrics_dict, "p99_us", PyLong_FromUnsignedLongLong(metrics.p99_us));
 
@@ -303,6 +431,8 @@ static PyObject* LoadTestEngine_websocket_close(LoadTestEngineObject* self, PyOb
 static PyMethodDef LoadTestEngine_methods[] = {
     {"execute_request", (PyCFunction)(void(*)(void))LoadTestEngine_execute_request, METH_VARARGS | METH_KEYWORDS,
      "Execute a single HTTP request"},
+    {"execute_requests", (PyCFunction)(void(*)(void))LoadTestEngine_execute_requests, METH_VARARGS | METH_KEYWORDS,
+     "Execute a list of HTTP requests in order"},
     {"start_load_test", (PyCFunction)(void(*)(void))LoadTestEngine_start_load_test, METH_VARARGS | METH_KEYWORDS,
      "Start a load test with multiple requests"},
     {"get_metrics", (PyCFunction)LoadTestEngine_get_metrics, METH_NOARGS,
@@ -331,11 +461,102 @@ static PyTypeObject LoadTestEngineType = {
     .tp_methods = LoadTestEngine_methods,
 };
 
+/* Resolve one ${name} reference the same way Scenario._lookup_variable does.
+ * user_data is the flat {"source.field": value} dict, or NULL when empty. */
+static PyObject* lookup_template_variable(PyObject* name, PyObject* user_data, PyObject* variables) {
+    PyObject* value;
+    
+    if (user_data != NULL) {
+        value = PyDict_GetItemWithError(user_data, name);
+        if (value != NULL) {
+            return value == Py_None ? PyUnicode_FromStringAndSize("", 0) : PyObject_Str(value);
+        }
+        if (PyErr_Occurred()) {
+            return NULL;
+        }
+    }
+    
+    value = PyDict_GetItemWithError(variables, name);
+    if (value != NULL) {
+        return PyObject_Str(value);
+    }
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    
+    /* Unknown names are left in place */
+    return PyUnicode_FromFormat("${%U}", name);
+}
+
+static PyObject* loadspiker_render_template(PyObject* Py_UNUSED(module), PyObject* args) {
+    PyObject* parts;
+    PyObject* user_data;
+    PyObject* variables;
+    
+    if (!PyArg_ParseTuple(args, "O!OO!", &PyTuple_Type, &parts, &user_data, &PyDict_Type, &variables)) {
+        return NULL;
+    }
+    
+    Py_ssize_t count = PyTuple_GET_SIZE(parts);
+    if (count == 1) {
+        PyObject* literal = PyTuple_GET_ITEM(parts, 0);
+        Py_INCREF(literal);
+        return literal;
+    }
+    
+    if (!PyDict_Check(user_data) || PyDict_GET_SIZE(user_data) == 0) {
+        user_data = NULL;
+    }
+    
+    PyObject* pieces = PyList_New(count);
+    if (pieces == NULL) {
+        return NULL;
+    }
+    
+    /* Even indexes are literals, odd indexes are variable names */
+    for (Py_ssize_t i = 0; i < count; i++) {
+        PyObject* item = PyTuple_GET_ITEM(parts, i);
+        if (!PyUnicode_Check(item)) {
+            PyErr_SetString(PyExc_TypeError, "template parts must be str");
+            Py_DECREF(pieces);
+            return NULL;
+        }
+        if (i % 2 == 0) {
+            Py_INCREF(item);
+            PyList_SET_ITEM(pieces, i, item);
+            continue;
+        }
+        PyObject* value = lookup_template_variable(item, user_data, variables);
+        if (value == NULL) {
+            Py_DECREF(pieces);
+            return NULL;
+        }
+        PyList_SET_ITEM(pieces, i, value);
+    }
+    
+    PyObject* separator = PyUnicode_FromStringAndSize("", 0);
+    if (separator == NULL) {
+        Py_DECREF(pieces);
+        return NULL;
+    }
+    PyObject* result = PyUnicode_Join(separator, pieces);
+    Py_DECREF(separator);
+    Py_DECREF(pieces);
+    return result;
+}
+
+static PyMethodDef loadspiker_c_functions[] = {
+    {"render_template", loadspiker_render_template, METH_VARARGS,
+     "Render template parts (literal, name, literal, ...) with user data and scenario variables"},
+    {NULL, NULL, 0, NULL}
+};
+
 static PyModuleDef loadspiker_c_module = {
     PyModuleDef_HEAD_INIT,
     .m_name = "loadspiker_c",
     .m_doc = "High-performance load testing C module",
     .m_size = -1,
+    .m_methods = loadspiker_c_functions,
 };
 
 PyMODINIT_FUNC PyInit_loadspiker_c(void) {
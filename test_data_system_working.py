@@ -55,20 +55,28 @@ def test_csv_system():
         print("\n5. Testing variable substitution...")
         import re
         
-        def substitute_variables(text, user_data):
-            def replace_var(match):
-                var_name = match.group(1)
-                if '.' in var_name:
-                    source_name, field_name = var_name.split('.', 1)
-                    if source_name in user_data and field_name in user_data[source_name]:
-                        return str(user_data[source_name][field_name])
-                return match.group(0)
-            return re.sub(r'\$\{([^}]+)\}', replace_var, text)
+        def compile_template(text):
+            # Split once into literals (even indexes) and (source, field) slots
+            parts = re.split(r'\$\{([^}]+)\}', text)
+            return parts[0::2], [tuple(name.split('.', 1)) if '.' in name else (name, None)
+                                 for name in parts[1::2]]
+        
+        def substitute_variables(compiled, user_data):
+            literals, slots = compiled
+            out = [literals[0]]
+            for (source_name, field_name), literal in zip(slots, literals[1:]):
+                row = user_data.get(source_name)
+                if field_name is not None and row and field_name in row:
+                    out.append(str(row[field_name]))
+                else:
+                    out.append(f"${{{source_name}.{field_name}}}" if field_name else f"${{{source_name}}}")
+                out.append(literal)
+            return ''.join(out)
         
         # Simulate user data context
         user_data = {"data": distributor.get_data_for_user(0)}
         template = '{"username": "${data.username}", "user_id": "${data.user_id}"}'
-        result = substitute_variables(template, user_data)
+        result = substitute_variables(compile_template(template), user_data)
         print(f"   Template: {template}")
         print(f"   Result:   {result}")
         
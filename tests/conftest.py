@@ -23,22 +23,36 @@ from loadspiker import Engine
 # Engine fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def engine():
-    """Provide a fresh LoadSpiker engine with default settings."""
+@pytest.fixture(scope="session")
+def _session_engine():
+    """One default engine per test session; its worker threads are started once."""
     eng = Engine(max_connections=10, worker_threads=2)
     yield eng
     del eng
 
 
-@pytest.fixture
-def engine_large():
-    """Provide a LoadSpiker engine with larger capacity for stress tests."""
+@pytest.fixture(scope="session")
+def _session_engine_large():
+    """One large engine per test session."""
     eng = Engine(max_connections=50, worker_threads=4)
     yield eng
     del eng
 
 
+@pytest.fixture
+def engine(_session_engine):
+    """Provide the shared LoadSpiker engine with its metrics reset."""
+    _session_engine.reset_metrics()
+    return _session_engine
+
+
+@pytest.fixture
+def engine_large(_session_engine_large):
+    """Provide the shared large LoadSpiker engine with its metrics reset."""
+    _session_engine_large.reset_metrics()
+    return _session_engine_large
+
+
 # ---------------------------------------------------------------------------
 # Mock TCP Server
 # ---------------------------------------------------------------------------
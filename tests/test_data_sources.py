@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for data sources
+"""
+
+import sys
+import os
+import threading
+
+import pytest
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadspiker import data_sources
+from loadspiker.data_sources import CSVDataSource, DataDistributor, DataStrategy
+
+
+class TestCSVDataSource:
+    """Test CSV loading"""
+
+    def test_cell_conversion(self, tmp_path):
+        """Test cells become None, bool, int, float or stay strings"""
+        path = tmp_path / "users.csv"
+        path.write_text(" id , name,score,active,note\n"
+                        "007,alice,1.5,TRUE,\n"
+                        "2,bob,-3,false,1.2.3\n")
+
+        rows = CSVDataSource(str(path)).load_data()
+
+        assert rows == [
+            {"id": 7, "name": "alice", "score": 1.5, "active": True, "note": None, "_row_number": 1},
+            {"id": 2, "name": "bob", "score": "-3", "active": False, "note": "1.2.3", "_row_number": 2},
+        ]
+
+    def test_blank_and_empty_rows(self, tmp_path):
+        """Test blank lines are ignored and all-empty rows follow skip_empty_rows"""
+        path = tmp_path / "rows.csv"
+        path.write_text('a,b\n\n1,2\n,\n"x, y",3\n')
+
+        assert [row["_row_number"] for row in CSVDataSource(str(path)).load_data()] == [1, 3]
+        rows = CSVDataSource(str(path), skip_empty_rows=False).load_data()
+        assert rows[1] == {"a": None, "b": None, "_row_number": 2}
+        assert rows[2]["a"] == "x, y"
+
+    def test_header_only(self, tmp_path):
+        """Test a file with only a header loads no rows"""
+        path = tmp_path / "header.csv"
+        path.write_text("a,b\n")
+
+        assert CSVDataSource(str(path)).load_data() == []
+
+    def test_parse_cached_until_file_changes(self, tmp_path):
+        """Test repeat loads reuse the parse, get their own rows and see edits"""
+        path = tmp_path / "cached.csv"
+        path.write_text("a\n1\n")
+        first = CSVDataSource(str(path)).load_data()
+        hits = data_sources._parse_csv.cache_info().hits
+
+        second = CSVDataSource(str(path)).load_data()
+        assert data_sources._parse_csv.cache_info().hits == hits + 1
+        assert second == first and second[0] is not first[0]
+
+        first[0]["a"] = "changed"
+        assert CSVDataSource(str(path)).load_data()[0]["a"] == 1
+
+        path.write_text("a\n1\n22\n")
+        assert [row["a"] for row in CSVDataSource(str(path)).load_data()] == [1, 22]
+
+
+def _distributor(tmp_path, strategy, rows=3):
+    """Distributor over a one-column CSV of user0..userN"""
+    path = tmp_path / "users.csv"
+    path.write_text("name\n" + "".join(f"user{i}\n" for i in range(rows)))
+    return DataDistributor(CSVDataSource(str(path)), strategy)
+
+
+class TestDataDistributor:
+    """Test row distribution strategies"""
+
+    def test_rows_shared_without_copying(self, tmp_path):
+        """Test users drawing the same row receive the cached row object"""
+        distributor = _distributor(tmp_path, DataStrategy.SEQUENTIAL)
+
+        assert distributor.get_data_for_user(1) is distributor.get_data_for_user(4)
+        assert distributor.get_data_for_user(1) is distributor.data_source.data[1]
+
+    def test_unique_rows_in_order_then_exhausted(self, tmp_path):
+        """Test unique rows are handed out once each, in file order"""
+        distributor = _distributor(tmp_path, DataStrategy.UNIQUE)
+
+        assert [distributor.get_data_for_user(9)["name"] for _ in range(3)] == ["user0", "user1", "user2"]
+        assert distributor.get_stats()["used_indices_count"] == 3
+        with pytest.raises(ValueError, match="No more unique data"):
+            distributor.get_data_for_user(9)
+
+    def test_circular_rows_across_threads(self, tmp_path):
+        """Test concurrent circular draws hand out each position exactly once"""
+        distributor = _distributor(tmp_path, DataStrategy.CIRCULAR, rows=4)
+        names = []
+
+        def draw():
+            names.extend(distributor.get_data_for_user(0)["name"] for _ in range(1000))
+
+        threads = [threading.Thread(target=draw) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert {name: names.count(name) for name in set(names)} == {f"user{i}": 2000 for i in range(4)}
@@ -285,6 +285,25 @@ class TestDatabaseScenario(unittest.TestCase):
         self.assertEqual(operations[3]["type"], "database_disconnect")
         
         print("   ✅ Database operations built correctly")
+    
+    def test_database_operations_share_user_row(self):
+        """Test all queries for one user are filled from the same data row"""
+        import tempfile
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, "users.csv")
+            with open(csv_path, "w") as f:
+                f.write("id\n1\n2\n3\n")
+            
+            scenario = DatabaseScenario(self.connection_string, "Test DB Scenario")
+            scenario.load_data_file(csv_path, name="users", strategy="circular")
+            scenario.add_query("SELECT * FROM users WHERE id = ${users.id}")
+            scenario.add_query("UPDATE users SET seen = 1 WHERE id = ${users.id}")
+            
+            operations = scenario.build_database_operations()
+        
+        self.assertTrue(operations[1]["query"].endswith("id = 1"))
+        self.assertTrue(operations[2]["query"].endswith("id = 1"))
 
 class TestMixedProtocolScenario(unittest.TestCase):
     """Test mixed protocol scenarios including database"""
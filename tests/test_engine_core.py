@@ -12,8 +12,11 @@ Tests for the core engine functionality including:
 
 import sys
 import os
+import json
 import pytest
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -96,6 +99,26 @@ class TestMetrics:
         assert metrics['successful_requests'] == 0
         assert metrics['failed_requests'] == 0
 
+    def test_metrics_version_tracks_changes(self):
+        """version should only change when a metric value changes."""
+        class _StubBackend:
+            total_requests = 0
+
+            def get_metrics(self):
+                return {'total_requests': self.total_requests}
+
+        engine = Engine(max_connections=1, worker_threads=1)
+        engine._engine = backend = _StubBackend()
+
+        first = engine.get_metrics()
+        second = engine.get_metrics()
+        assert first.version == second.version
+        assert first == {'total_requests': 0}
+
+        backend.total_requests = 1
+        third = engine.get_metrics()
+        assert third.version > second.version
+
     def test_metrics_after_request(self, engine):
         """Metrics should update after executing a request."""
         engine.reset_metrics()
@@ -187,6 +210,59 @@ class TestHTTPRequests:
         assert 'status_code' in response
 
 
+    def test_execute_requests_batch(self, engine):
+        """A batch of requests should return one response per request, in order."""
+        start = time.monotonic()
+        responses = engine.execute_requests([
+            {"url": "http://127.0.0.1:1/a", "headers": {"Accept": "text/html"}, "delay_ms": 100},
+            {"url": "http://127.0.0.1:1/b", "method": "POST", "body": "x", "timeout_ms": 1000},
+        ])
+        assert len(responses) == 2
+        assert all(isinstance(r, dict) and r['success'] is False for r in responses)
+        assert time.monotonic() - start >= 0.1
+        assert engine.execute_requests([]) == []
+
+    def test_concurrent_requests_keep_their_headers(self, engine):
+        """Requests from several threads should each send exactly their own headers."""
+        if not engine._using_c_extension:
+            pytest.skip("C extension not built")
+
+        class EchoHeaders(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps({k: v for k, v in self.headers.items() if k.startswith('X-')}).encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHeaders)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/"
+        mismatches = []
+
+        def worker(n):
+            for i in range(25):
+                headers = {f"X-H{j}": f"{n}-{i}-{j}" for j in range(4)}
+                response = engine.execute_request(url, headers=headers, timeout_ms=5000)
+                if json.loads(response['body'] or '{}') != headers:
+                    mismatches.append(response['body'])
+
+        try:
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert mismatches == []
+
+
 class TestWebSocketProtocol:
     """Test WebSocket protocol methods via engine (simulated)."""
 
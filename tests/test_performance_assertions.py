@@ -501,16 +501,27 @@ class TestPerformanceAssertionGroup:
         assert isinstance(group.failed_assertions[0][0], ThroughputAssertion)
     
     def test_check_all_metrics_and_all_fail(self):
-        """Test AND group where all assertions fail"""
+        """Test AND group stops at the first failing assertion"""
         group = PerformanceAssertionGroup("AND")
         group.add(ThroughputAssertion(15.0))  # This will fail
-        group.add(ErrorRateAssertion(1.0))    # This will fail (2% > 1%)
+        group.add(ErrorRateAssertion(1.0))    # This would fail (2% > 1%)
         
         metrics = {'requests_per_second': 10.0, 'total_requests': 100, 'failed_requests': 2}
         result = group.check_all_metrics(metrics)
         
         assert result is False
-        assert len(group.failed_assertions) == 2
+        assert len(group.failed_assertions) == 1
+        assert isinstance(group.failed_assertions[0][0], ThroughputAssertion)
+    
+    def test_check_all_metrics_and_short_circuits(self):
+        """Test AND group does not evaluate assertions after a failure"""
+        calls = []
+        group = PerformanceAssertionGroup("AND")
+        group.add(ThroughputAssertion(15.0))  # This will fail
+        group.add(CustomPerformanceAssertion(lambda m: calls.append(m) or True))
+        
+        assert group.check_all_metrics({'requests_per_second': 10.0}) is False
+        assert calls == []
     
     def test_check_all_metrics_or_all_pass(self):
         """Test OR group where all assertions pass"""
@@ -534,7 +545,17 @@ class TestPerformanceAssertionGroup:
         result = group.check_all_metrics(metrics)
         
         assert result is True
-        assert len(group.failed_assertions) == 1  # Still tracks failures
+        assert len(group.failed_assertions) == 0  # Passing group has nothing to report
+    
+    def test_check_all_metrics_or_short_circuits(self):
+        """Test OR group does not evaluate assertions after a pass"""
+        calls = []
+        group = PerformanceAssertionGroup("OR")
+        group.add(ThroughputAssertion(5.0))  # This will pass
+        group.add(CustomPerformanceAssertion(lambda m: calls.append(m) or True))
+        
+        assert group.check_all_metrics({'requests_per_second': 10.0}) is True
+        assert calls == []
     
     def test_check_all_metrics_or_all_fail(self):
         """Test OR group where all assertions fail"""
@@ -549,14 +570,9 @@ class TestPerformanceAssertionGroup:
         assert len(group.failed_assertions) == 2
     
     def test_invalid_logic(self):
-        """Test invalid logic operator"""
-        group = PerformanceAssertionGroup("INVALID")
-        group.add(ThroughputAssertion(10.0))
-        
-        metrics = {'requests_per_second': 15.0}
-        
+        """Test invalid logic operator is rejected at construction"""
         with pytest.raises(ValueError, match="Unknown logic operator: INVALID"):
-            group.check_all_metrics(metrics)
+            PerformanceAssertionGroup("INVALID")
     
     def test_get_failure_report_no_failures(self):
         """Test failure report with no failures"""
@@ -565,7 +581,7 @@ class TestPerformanceAssertionGroup:
     
     def test_get_failure_report_with_failures(self):
         """Test failure report with failures"""
-        group = PerformanceAssertionGroup("AND")
+        group = PerformanceAssertionGroup("OR")
         group.add(ThroughputAssertion(15.0, "High throughput"))
         group.add(ErrorRateAssertion(1.0, "Low error rate"))
         
@@ -573,7 +589,7 @@ class TestPerformanceAssertionGroup:
         group.check_all_metrics(metrics)
         
         report = group.get_failure_report()
-        assert "Performance assertion group (AND) failed:" in report
+        assert "Performance assertion group (OR) failed:" in report
         assert "1. High throughput" in report
         assert "2. Low error rate" in report
     
@@ -726,6 +742,111 @@ class TestRunPerformanceAssertions:
         
         assert success is False
         assert len(failures) == 1
+    
+    def test_metric_read_once_per_assertion(self):
+        """Test a failing assertion reads a versioned snapshot once for check and message"""
+        class CountingMetrics(dict):
+            reads = 0
+            def get(self, key, default=None):
+                if key == 'requests_per_second':
+                    CountingMetrics.reads += 1
+                return super().get(key, default)
+        
+        metrics = CountingMetrics(requests_per_second=5.0)
+        metrics.version = 1
+        success, failures = run_performance_assertions(metrics, [ThroughputAssertion(10.0)])
+        
+        assert success is False
+        assert "5.00 RPS" in failures[0]
+        assert CountingMetrics.reads == 1
+    
+    def test_legacy_subclass_without_evaluate(self):
+        """Test subclasses overriding only check_metrics still run"""
+        class LegacyAssertion(PerformanceAssertion):
+            def check_metrics(self, metrics):
+                return metrics.get('ok', False)
+            def get_metrics_error_message(self, metrics):
+                return f"not ok: {sorted(metrics)}"
+        
+        success, failures = run_performance_assertions({'other': 1}, [LegacyAssertion()])
+        
+        assert success is False
+        assert failures == ["not ok: ['other']"]
+
+    
+    def test_result_cached_per_metrics_version(self):
+        """Test an unchanged metrics version reuses the previous result"""
+        class CountingMetrics(dict):
+            reads = 0
+            def __init__(self, version, **metrics):
+                super().__init__(**metrics)
+                self.version = version
+            def get(self, key, default=None):
+                if key == 'requests_per_second':
+                    CountingMetrics.reads += 1
+                return super().get(key, default)
+        
+        assertion = ThroughputAssertion(10.0)
+        assert assertion.check_metrics(CountingMetrics(7, requests_per_second=5.0)) is False
+        assert assertion.check_metrics(CountingMetrics(7, requests_per_second=5.0)) is False
+        assert CountingMetrics.reads == 1
+        
+        assert assertion.check_metrics(CountingMetrics(8, requests_per_second=50.0)) is True
+        assert CountingMetrics.reads == 2
+        
+        assert assertion.check_metrics({'requests_per_second': 5.0, 'version': 8}) is False
+    
+    def test_custom_assertion_not_cached(self):
+        """Test custom assertion functions run on every check"""
+        class VersionedMetrics(dict):
+            version = 3
+        
+        calls = []
+        assertion = CustomPerformanceAssertion(lambda m: calls.append(1) or True)
+        metrics = VersionedMetrics()
+        
+        run_performance_assertions(metrics, [assertion])
+        run_performance_assertions(metrics, [assertion])
+        
+        assert len(calls) == 2
+    
+    def test_subclasses_not_cached_unless_opted_in(self):
+        """Test subclasses of built-in assertions re-evaluate every snapshot"""
+        class VersionedMetrics(dict):
+            version = 5
+        
+        class StatefulThroughput(ThroughputAssertion):
+            def _evaluate_metrics(self, metrics):
+                self.min_rps += 10
+                return super()._evaluate_metrics(metrics)
+        
+        assertion = StatefulThroughput(0.0)
+        metrics = VersionedMetrics(requests_per_second=15.0)
+        assert assertion.check_metrics(metrics) is True
+        assert assertion.check_metrics(metrics) is False
+    
+    def test_runner_uses_overridden_check_metrics(self):
+        """Test the runner and groups call check_metrics and get_metrics_error_message"""
+        class InvertedThroughput(ThroughputAssertion):
+            def check_metrics(self, metrics):
+                return not super().check_metrics(metrics)
+            def get_metrics_error_message(self, metrics):
+                return "inverted"
+        
+        metrics = {'requests_per_second': 50.0}
+        assert run_performance_assertions(metrics, [InvertedThroughput(10.0)]) == (False, ["inverted"])
+        
+        group = PerformanceAssertionGroup("AND").add(InvertedThroughput(10.0))
+        assert group.check_all_metrics(metrics) is False
+        assert group.get_failure_report().endswith("1. inverted")
+        
+        class DuckAssertion:
+            def check_metrics(self, metrics):
+                return False
+            def get_metrics_error_message(self, metrics):
+                return "duck"
+        
+        assert run_performance_assertions(metrics, [DuckAssertion()]) == (False, ["duck"])
 
 
 class TestEdgeCases:
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Tests for result reporters
+"""
+
+import sys
+import os
+import json
+import pytest
+from datetime import datetime
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadspiker.reporters import (
+    BaseReporter, JSONReporter, HTMLReporter, ConsoleReporter, MultiReporter,
+    FixedWidthHistogram
+)
+
+
+SAMPLE_METRICS = {
+    'total_requests': 100,
+    'successful_requests': 98,
+    'failed_requests': 2,
+    'requests_per_second': 50.0,
+    'avg_response_time_ms': 12.5,
+}
+
+
+class TestJSONReporter:
+    """Test JSON report output"""
+
+    def _run(self, reporter, progress_ticks=3):
+        reporter.start_reporting()
+        for tick in range(progress_ticks):
+            reporter.report_progress(float(tick), dict(SAMPLE_METRICS, total_requests=tick))
+        reporter.report_metrics(SAMPLE_METRICS)
+        reporter.end_reporting()
+
+    def test_progress_streamed_as_ndjson(self, tmp_path):
+        """Test progress entries are written one JSON object per line"""
+        output = str(tmp_path / "results.json")
+        reporter = JSONReporter(output)
+        self._run(reporter)
+
+        with open(reporter.progress_file) as f:
+            lines = [json.loads(line) for line in f]
+        assert [entry['metrics']['total_requests'] for entry in lines] == [0, 1, 2]
+
+        with open(output) as f:
+            data = json.load(f)
+        assert data['final_metrics'] == SAMPLE_METRICS
+        assert data['progress_file'] == reporter.progress_file
+        assert data['test_info']['start_time'] == datetime.fromtimestamp(
+            data['test_info']['start_timestamp']).isoformat()
+        assert isinstance(data['test_info']['start_timestamp'], float)
+        assert 'progress' not in data
+
+    def test_embed_progress(self, tmp_path):
+        """Test progress can be rolled into the final document"""
+        output = str(tmp_path / "results.json")
+        self._run(JSONReporter(output, embed_progress=True))
+
+        with open(output) as f:
+            data = json.load(f)
+        assert [entry['elapsed_time'] for entry in data['progress']] == [0.0, 1.0, 2.0]
+
+    def test_no_progress_file_without_progress(self, tmp_path):
+        """Test no progress file is created when progress is never reported"""
+        output = str(tmp_path / "results.json")
+        reporter = JSONReporter(output)
+        self._run(reporter, progress_ticks=0)
+
+        assert not os.path.exists(reporter.progress_file)
+        with open(output) as f:
+            assert 'progress_file' not in json.load(f)
+
+    def test_metrics_json_accepts(self, tmp_path):
+        """Test metrics with int keys and very large integers are still written"""
+        output = str(tmp_path / "results.json")
+        metrics = dict(SAMPLE_METRICS, total_response_time_us=2 ** 70, status_codes={200: 98})
+        reporter = JSONReporter(output)
+        reporter.start_reporting()
+        reporter.report_progress(0.0, metrics)
+        reporter.report_metrics(metrics)
+        reporter.end_reporting()
+
+        with open(output) as f:
+            data = json.load(f)
+        assert data['final_metrics']['total_response_time_us'] == 2 ** 70
+        assert data['final_metrics']['status_codes'] == {"200": 98}
+        with open(reporter.progress_file) as f:
+            assert json.loads(f.readline())['metrics']['total_response_time_us'] == 2 ** 70
+
+
+class TestHTMLReporter:
+    """Test HTML report output"""
+
+    def test_progress_data_embedded(self, tmp_path):
+        """Test progress data is written into the chart script"""
+        output = str(tmp_path / "report.html")
+        reporter = HTMLReporter(output)
+        reporter.start_reporting()
+        reporter.report_progress(1.0, SAMPLE_METRICS)
+        reporter.end_reporting()
+        reporter.report_metrics(SAMPLE_METRICS)
+
+        with open(output) as f:
+            html = f.read()
+        prefix = 'const progressData = '
+        start = html.index(prefix) + len(prefix)
+        end = html.index(';\n', start)
+        assert json.loads(html[start:end]) == {
+            'time': [1.0],
+            'requests_per_second': [50.0],
+            'avg_response_time': [12.5],
+            'total_requests': [100.0],
+        }
+        assert html.rstrip().endswith('</html>')
+        assert "new Chart(rpsCtx, {" in html
+
+    def test_progress_data_rows(self, tmp_path):
+        """Test packed progress columns can still be read back as rows"""
+        reporter = HTMLReporter(str(tmp_path / "report.html"))
+        reporter.report_progress(1.0, SAMPLE_METRICS)
+        reporter.report_progress(2.0, {})
+
+        assert reporter.progress_data == [
+            {'time': 1.0, 'requests_per_second': 50.0,
+             'avg_response_time': 12.5, 'total_requests': 100.0},
+            {'time': 2.0, 'requests_per_second': 0.0,
+             'avg_response_time': 0.0, 'total_requests': 0.0},
+        ]
+
+    def test_progress_summary(self, tmp_path):
+        """Test aggregate statistics over progress samples"""
+        reporter = HTMLReporter(str(tmp_path / "report.html"))
+        assert reporter.progress_summary()['rps_max'] == 0.0
+
+        for tick, (rps, rt) in enumerate([(10.0, 5.0), (30.0, 1.0), (20.0, 9.0)]):
+            reporter.report_progress(float(tick), {
+                'requests_per_second': rps,
+                'avg_response_time_ms': rt,
+                'total_requests': tick * 20,
+            })
+
+        summary = reporter.progress_summary()
+        assert summary['rps_mean'] == pytest.approx(20.0)
+        assert summary['rps_std'] == pytest.approx((200 / 3) ** 0.5)
+        assert summary['rps_max'] == 30.0
+        assert summary['avg_response_time_min'] == 1.0
+        assert summary['avg_response_time_max'] == 9.0
+        assert summary['avg_response_time_p99'] == 9.0
+        assert summary['window_rps'] == pytest.approx(20.0)
+
+
+class TestConsoleReporter:
+    """Test console summary output"""
+
+    @pytest.mark.parametrize("successful,status", [
+        (100, "EXCELLENT"), (92, "GOOD"), (85, "FAIR"), (10, "POOR"),
+    ])
+    def test_status_tiers(self, capsys, successful, status):
+        """Test the status line follows the success rate thresholds"""
+        metrics = dict(SAMPLE_METRICS, total_requests=100, successful_requests=successful)
+        ConsoleReporter(show_progress=False).report_metrics(metrics)
+
+        output = capsys.readouterr().out
+        assert output.rstrip().endswith(f"Test Status: {status}")
+        assert "Total Requests:     100" in output
+
+
+class TestFixedWidthHistogram:
+    """Test bounded percentile histogram"""
+
+    def test_empty_percentile(self):
+        """Test percentiles of an empty histogram are zero"""
+        assert FixedWidthHistogram().percentile(99) == 0.0
+
+    def test_percentiles_close_to_exact(self):
+        """Test percentiles stay within one bucket of the exact value"""
+        histogram = FixedWidthHistogram()
+        for us in range(1, 10001):
+            histogram.record(us * 100)
+
+        for p, exact in ((50, 500000), (95, 950000), (99, 990000)):
+            value = histogram.percentile(p)
+            assert exact <= value <= exact * 1.02
+
+    def test_out_of_range_samples_are_clamped(self):
+        """Test samples above the expected maximum land in the last bucket"""
+        histogram = FixedWidthHistogram(max_expected_us=1000, bucket_count=10)
+        histogram.record(10 ** 9)
+        histogram.record(-5)
+
+        assert histogram.count == 2
+        assert histogram.counts[-1] == 1
+        assert histogram.counts[0] == 1
+        assert histogram.percentile(100) == 1000
+
+    def test_console_reporter_prints_recorded_percentiles(self, capsys):
+        """Test ConsoleReporter uses recorded samples for percentiles"""
+        reporter = ConsoleReporter(show_progress=False)
+        for _ in range(100):
+            reporter.record_response_time(2000)
+        reporter.report_metrics(SAMPLE_METRICS)
+
+        output = capsys.readouterr().out
+        assert "P50 Response Time:" in output
+        assert "P99 Response Time:  2.04 ms" in output
+
+    def test_console_reporter_engine_percentiles(self, capsys):
+        """Test engine percentiles are printed and a missing P50 is left out"""
+        reporter = ConsoleReporter(show_progress=False)
+        reporter.report_metrics(dict(SAMPLE_METRICS, p95_us=8000, p99_us=9000))
+        output = capsys.readouterr().out
+        assert "P50" not in output
+        assert "P95 Response Time:  8.00 ms" in output
+
+        reporter.report_metrics(dict(SAMPLE_METRICS, p50_us=3000, p95_us=8000, p99_us=9000))
+        assert "P50 Response Time:  3.00 ms" in capsys.readouterr().out
+
+
+class _RecordingReporter(BaseReporter):
+    """Reporter that remembers what it was sent"""
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.calls = []
+
+    def report_metrics(self, metrics):
+        if self.fail:
+            raise RuntimeError("reporter failed")
+        self.calls.append(('metrics', metrics))
+
+    def report_progress(self, elapsed_time, metrics):
+        self.calls.append(('progress', elapsed_time))
+
+
+class TestMultiReporter:
+    """Test fan-out to child reporters"""
+
+    def test_all_children_receive_calls(self):
+        """Test progress and metrics reach every child reporter"""
+        children = [_RecordingReporter() for _ in range(3)]
+        multi = MultiReporter(children)
+        multi.start_reporting()
+        multi.report_progress(1.0, SAMPLE_METRICS)
+        multi.report_metrics(SAMPLE_METRICS)
+        multi.end_reporting()
+
+        for child in children:
+            assert child.calls == [('progress', 1.0), ('metrics', SAMPLE_METRICS)]
+        assert multi._pool is None
+
+    def test_child_errors_propagate(self):
+        """Test an exception in a child reporter is re-raised"""
+        multi = MultiReporter([_RecordingReporter(), _RecordingReporter(fail=True)])
+        with pytest.raises(RuntimeError):
+            multi.report_metrics(SAMPLE_METRICS)
+        multi.end_reporting()
+
+    def test_output_in_reporter_order(self, tmp_path, capsys):
+        """Test file writes overlap but output follows reporter order"""
+        first, second = tmp_path / "first.json", tmp_path / "second.json"
+        multi = MultiReporter([
+            JSONReporter(str(first)), ConsoleReporter(show_progress=False), JSONReporter(str(second))
+        ])
+        multi.start_reporting()
+        multi.report_progress(1.0, SAMPLE_METRICS)
+        assert multi._pool is None
+        multi.report_metrics(SAMPLE_METRICS)
+        assert multi._pool is not None
+        multi.end_reporting()
+
+        out = capsys.readouterr().out
+        assert out.index(str(first)) < out.index("Final Test Results") < out.index(str(second))
+        for path in (first, second):
+            assert json.loads(path.read_text())["final_metrics"]["total_requests"] == 100
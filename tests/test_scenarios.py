@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Tests for scenario request building and variable substitution
+"""
+
+import sys
+import os
+import json
+
+import pytest
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadspiker.scenarios import (
+    Scenario, HTTPRequest, RESTAPIScenario, WebsiteScenario, TCPScenario,
+    create_scenario_from_har, _template_parts
+)
+
+
+class TestHTTPRequest:
+    """Test HTTPRequest conversion to engine dicts"""
+
+    def test_to_dict_joins_headers(self):
+        """Test headers are serialized one per line"""
+        request = HTTPRequest("https://example.com", "post",
+                              {"Accept": "application/json", "X-Trace": "1"}, "{}", 5000)
+        assert request.to_dict() == {
+            "url": "https://example.com",
+            "method": "POST",
+            "headers": "Accept: application/json\nX-Trace: 1",
+            "body": "{}",
+            "timeout_ms": 5000,
+            "think_time_ms": 0
+        }
+
+    def test_no_instance_dict(self):
+        """Test requests use slots rather than a per-instance dict"""
+        request = HTTPRequest("https://example.com")
+        assert not hasattr(request, "__dict__")
+
+    def test_method_interned(self):
+        """Test requests share one method string regardless of input case"""
+        first = HTTPRequest("https://example.com/a", "post")
+        second = HTTPRequest("https://example.com/b", "".join(["PO", "ST"]))
+        assert first.method is second.method
+
+    def test_to_dict_returns_independent_copies(self):
+        """Test mutating a returned dict does not leak into later calls"""
+        request = HTTPRequest("https://example.com")
+        first = request.to_dict()
+        first["url"] = "mutated"
+        assert request.to_dict()["url"] == "https://example.com"
+
+    def test_equality_and_hash(self):
+        """Test requests with the same engine fields compare equal"""
+        first = HTTPRequest("https://example.com", "get", {"Accept": "*/*"})
+        second = HTTPRequest("https://example.com", "GET", {"Accept": "*/*"})
+        other = HTTPRequest("https://example.com", "POST", {"Accept": "*/*"})
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert first != other
+        assert len({first, second, other}) == 2
+
+
+class TestBuildRequestsCache:
+    """Test reuse of processed requests between builds"""
+
+    def test_static_requests_are_not_substituted(self):
+        """Test requests without placeholders are emitted as-is"""
+        request = HTTPRequest("https://example.com/static", "GET", {"Accept": "text/html"})
+        assert request._has_vars is False
+
+        scenario = Scenario("static").add_request(request)
+        built = scenario.build_requests()
+
+        assert built == [request.to_dict()]
+
+    def test_repeat_build_reuses_cached_result(self):
+        """Test a second build returns equal but independent dicts"""
+        scenario = Scenario("cached")
+        scenario.set_variable("id", 42)
+        scenario.get("https://example.com/items/${id}")
+
+        first = scenario.build_requests()
+        second = scenario.build_requests()
+
+        assert first == second
+        assert first[0]["url"] == "https://example.com/items/42"
+        assert first[0] is not second[0]
+
+        second[0]["url"] = "mutated"
+        assert scenario.build_requests()[0]["url"] == "https://example.com/items/42"
+
+    def test_duplicate_requests_substituted_once(self):
+        """Test identical templated requests share one substitution"""
+        scenario = Scenario("dupes")
+        scenario.set_variable("id", 5)
+        for _ in range(3):
+            scenario.get("https://example.com/items/${id}")
+
+        calls = []
+        original = scenario._render_request
+        scenario._render_request = lambda *args: calls.append(1) or original(*args)
+        built = scenario.build_requests()
+
+        assert len(calls) == 1
+        assert [r["url"] for r in built] == ["https://example.com/items/5"] * 3
+        assert built[0] is not built[1]
+
+    def test_nothing_to_substitute_skips_rendering(self):
+        """Test templates pass through untouched without variables or data"""
+        scenario = Scenario("bare")
+        scenario.get("https://example.com/${id}")
+        scenario._render_request = None
+
+        assert scenario.build_requests()[0]["url"] == "https://example.com/${id}"
+        assert scenario._substitute_variables("${id}", {}) == "${id}"
+
+    def test_set_variable_invalidates_cache(self):
+        """Test changing a variable produces a fresh build"""
+        scenario = Scenario("invalidate")
+        scenario.set_variable("id", 1)
+        scenario.get("https://example.com/items/${id}")
+        assert scenario.build_requests()[0]["url"] == "https://example.com/items/1"
+
+        scenario.set_variable("id", 2)
+        assert scenario.build_requests()[0]["url"] == "https://example.com/items/2"
+
+    def test_added_request_invalidates_cache(self):
+        """Test adding a request after a build is reflected"""
+        scenario = Scenario("grow")
+        scenario.get("https://example.com/a")
+        assert len(scenario.build_requests()) == 1
+
+        scenario.get("https://example.com/b")
+        assert [r["url"] for r in scenario.build_requests()] == [
+            "https://example.com/a", "https://example.com/b"
+        ]
+
+    def test_replaced_requests_invalidate_cache(self):
+        """Test swapping or re-adding requests after a build is reflected"""
+        scenario = Scenario("swap")
+        scenario.get("https://example.com/a")
+        scenario.build_requests()
+
+        scenario.requests[0] = HTTPRequest("https://example.com/b")
+        assert scenario.build_requests()[0]["url"] == "https://example.com/b"
+
+        scenario.requests.clear()
+        scenario.get("https://example.com/c")
+        assert scenario.build_requests()[0]["url"] == "https://example.com/c"
+
+    def test_direct_variable_changes_invalidate_cache(self):
+        """Test variables changed without set_variable(), e.g. by setup, are used"""
+        scenario = Scenario("direct")
+        scenario.set_variable("id", 1)
+        scenario.get("https://example.com/items/${id}")
+        assert scenario.build_requests()[0]["url"] == "https://example.com/items/1"
+
+        scenario.variables["id"] = 2
+        assert scenario.build_requests()[0]["url"] == "https://example.com/items/2"
+
+        counter = iter(range(3, 10))
+        scenario.setup(lambda s: s.variables.update(id=next(counter)))
+        assert [scenario.build_requests()[0]["url"] for _ in range(2)] == [
+            "https://example.com/items/3", "https://example.com/items/4"
+        ]
+
+
+class TestCompiledBuild:
+    """Test the generated request builder"""
+
+    def _scenario(self, tmp_path):
+        csv_file = tmp_path / "users.csv"
+        csv_file.write_text("username,token\nalice,t1\nbob,t2\n")
+        scenario = Scenario("compiled")
+        scenario.load_data_file(str(csv_file), name="users")
+        scenario.set_variable("host", "example.com")
+        scenario.get("https://example.com/static", {"Accept": "*/*"})
+        scenario.post("https://${host}/login", '{"u": "${users.username}", "x": "${missing}"}',
+                      {"Authorization": "Bearer ${users.token}", "Accept": "*/*", "X-User": "${users.username}"})
+        scenario.add_request(HTTPRequest("https://${host}/", "GET", {"Accept": "*/*"}, "", 5000, 250))
+        return scenario
+
+    def test_matches_generic_build(self, tmp_path):
+        """Test compiled output equals the generic path for every user"""
+        scenario = self._scenario(tmp_path)
+        expected = [scenario.build_requests(user_id) for user_id in range(3)]
+
+        scenario.compile()
+        assert [scenario.build_requests(user_id) for user_id in range(3)] == expected
+        assert expected[1][1]["headers"] == "Authorization: Bearer t2\nAccept: */*\nX-User: bob"
+
+    def test_added_requests_fall_back_to_generic_path(self, tmp_path):
+        """Test requests added after compile() are still built"""
+        scenario = self._scenario(tmp_path).compile()
+        scenario.get("https://${host}/late")
+
+        assert scenario.build_requests(0)[-1]["url"] == "https://example.com/late"
+
+    def test_replaced_request_falls_back_to_generic_path(self, tmp_path):
+        """Test a request swapped in after compile() is built, not the compiled one"""
+        scenario = self._scenario(tmp_path).compile()
+        scenario.requests[0] = HTTPRequest("https://${host}/swapped")
+
+        assert scenario.build_requests(0)[0]["url"] == "https://example.com/swapped"
+
+
+class TestVariableSubstitution:
+    """Test ${var} template rendering"""
+
+    def test_template_parts_alternate_literals_and_names(self):
+        """Test templates split into literal/name pairs"""
+        assert _template_parts("/users/${id}/posts/${post}") == ("/users/", "id", "/posts/", "post", "")
+        assert _template_parts("/static") == ("/static",)
+
+    def test_plain_text_returned_unchanged(self):
+        """Test text without placeholders is returned as the same object"""
+        scenario = Scenario("plain")
+        text = "SELECT * FROM users WHERE name = '{literal}'"
+        assert scenario._substitute_variables(text, {}) is text
+        assert scenario._substitute_variables("", {}) == ""
+
+    def test_scenario_and_data_source_variables(self):
+        """Test scenario variables and source.field references are resolved"""
+        scenario = Scenario("subst")
+        scenario.set_variable("host", "example.com")
+        user_data = {"users.name": "ada", "users.email": None}
+
+        text = "https://${host}/u/${users.name}?e=${users.email}&x=${missing}"
+        assert scenario._substitute_variables(text, user_data) == \
+            "https://example.com/u/ada?e=&x=${missing}"
+
+    def test_process_request_renders_all_fields(self):
+        """Test url, headers and body are all substituted"""
+        scenario = Scenario("subst")
+        scenario.set_variable("token", "abc")
+        scenario.set_variable("id", 7)
+        request = HTTPRequest("https://example.com/items/${id}", "PUT",
+                              {"Authorization": "Bearer ${token}", "Accept": "*/*"},
+                              '{"id": ${id}}')
+
+        processed = scenario._process_request(request, {})
+
+        assert processed.url == "https://example.com/items/7"
+        assert processed.headers == {"Authorization": "Bearer abc", "Accept": "*/*"}
+        assert processed.body == '{"id": 7}'
+
+    def test_static_headers_shared(self):
+        """Test header dicts without placeholders are not rebuilt"""
+        scenario = Scenario("subst")
+        scenario.set_variable("id", 7)
+        templated = HTTPRequest("https://example.com/items/${id}", headers={"Accept": "*/*"})
+        static = HTTPRequest("https://example.com/items")
+
+        assert templated._header_parts is None
+        assert scenario._process_request(templated, {}).headers is templated.headers
+        assert scenario._render_request(templated, {})["headers"] == "Accept: */*"
+        assert scenario._process_request(static, {}) is static
+
+    def test_render_request_matches_processed_request(self):
+        """Test the direct engine dict equals rendering via a new HTTPRequest"""
+        scenario = Scenario("subst")
+        scenario.set_variable("token", "abc")
+        request = HTTPRequest("https://example.com/${token}", "POST",
+                              {"Authorization": "Bearer ${token}", "Accept": "*/*"},
+                              "t=${token}", 1000, 50)
+
+        assert scenario._render_request(request, {}) == \
+            scenario._process_request(request, {}).to_dict()
+
+    def test_native_renderer_matches_python(self, monkeypatch):
+        """Test the C renderer agrees with the pure-Python fallback"""
+        from loadspiker import scenarios
+        if scenarios._c_render_template is None:
+            pytest.skip("C extension not built")
+
+        scenario = Scenario("subst")
+        scenario.set_variable("host", "example.com")
+        scenario.set_variable("port", 8080)
+        user_data = {"users.name": "ada", "orders.id": 3, "orders.note": None}
+        text = "https://${host}:${port}/u/${users.name}/${orders.id}?n=${orders.note}&x=${missing}"
+
+        native = scenario._substitute_variables(text, user_data)
+        monkeypatch.setattr(scenarios, "_c_render_template", None)
+        assert native == scenario._substitute_variables(text, user_data)
+        assert native == "https://example.com:8080/u/ada/3?n=&x=${missing}"
+
+
+class TestDataSourceSubstitution:
+    """Test request building with CSV data sources"""
+
+    def _write_csv(self, tmp_path):
+        csv_file = tmp_path / "users.csv"
+        csv_file.write_text("username,password\nalice,a1\nbob,b2\ncarol,c3\n")
+        return str(csv_file)
+
+    def test_sequential_source_read_by_user(self, tmp_path):
+        """Test sequential rows are picked by user id"""
+        scenario = Scenario("data")
+        scenario.load_data_file(self._write_csv(tmp_path), name="users")
+        scenario.get("https://example.com/login?u=${users.username}&p=${users.password}")
+
+        urls = [scenario.build_requests(user_id)[0]["url"] for user_id in range(4)]
+        assert urls == [
+            "https://example.com/login?u=alice&p=a1",
+            "https://example.com/login?u=bob&p=b2",
+            "https://example.com/login?u=carol&p=c3",
+            "https://example.com/login?u=alice&p=a1",
+        ]
+
+    def test_unique_source_uses_data_manager(self, tmp_path):
+        """Test stateful strategies still hand out rows through the data manager"""
+        scenario = Scenario("data")
+        scenario.load_data_file(self._write_csv(tmp_path), name="users", strategy="unique")
+        scenario.get("https://example.com/${users.username}")
+
+        urls = [scenario.build_requests(0)[0]["url"] for _ in range(3)]
+        assert urls == ["https://example.com/alice", "https://example.com/bob",
+                        "https://example.com/carol"]
+
+    def test_primed_rows_used_once(self, tmp_path):
+        """Test primed rows are drawn in one batch and consumed by the next build"""
+        scenario = Scenario("data")
+        scenario.load_data_file(self._write_csv(tmp_path), name="users", strategy="circular")
+        scenario.get("https://example.com/${users.username}")
+
+        scenario.prime_user_data([5, 6])
+        assert scenario.build_requests(6)[0]["url"] == "https://example.com/bob"
+        assert scenario.build_requests(5)[0]["url"] == "https://example.com/alice"
+        assert scenario.build_requests(5)[0]["url"] == "https://example.com/carol"
+
+    def test_build_requests_batch(self, tmp_path):
+        """Test a batch build matches per-user builds and draws one row per user"""
+        batch = Scenario("data")
+        single = Scenario("data")
+        for scenario in (batch, single):
+            scenario.load_data_file(self._write_csv(tmp_path), name="users", strategy="circular")
+            scenario.post("https://example.com/login", body='{"u": "${users.username}"}')
+        batch.compile()
+
+        assert batch.build_requests_batch([3, 1, 2]) == [single.build_requests(u) for u in (3, 1, 2)]
+        assert batch.build_requests(0)[0]["body"] == single.build_requests(0)[0]["body"]
+
+
+class TestOperationBuilding:
+    """Test protocol operation building"""
+
+    def test_only_templated_fields_substituted(self):
+        """Test templated fields are rendered and others copied as-is"""
+        scenario = TCPScenario("${host}", 9000)
+        scenario.set_variable("host", "10.0.0.1")
+        scenario.set_variable("name", "ada")
+        scenario.add_connect().add_send("HELLO ${name}").add_send("PING")
+
+        ops = scenario.build_tcp_operations()
+
+        assert [op["hostname"] for op in ops] == ["10.0.0.1"] * 3
+        assert [op.get("data") for op in ops] == [None, "HELLO ada", "PING"]
+        assert scenario.tcp_operations[1]["data"] == "HELLO ${name}"
+
+    def test_static_operations_shared_between_builds(self):
+        """Test operations without templates are emitted without copying"""
+        scenario = TCPScenario("localhost", 9000)
+        scenario.set_variable("n", 1)
+        scenario.add_connect().add_send("${n}")
+
+        first = scenario.build_tcp_operations(0)
+        second = scenario.build_tcp_operations(1)
+
+        assert first[0] is second[0] is scenario.tcp_operations[0]
+        assert first[1] is not second[1]
+
+    def test_hostname_normalized_to_str(self):
+        """Test non-string hosts are stored as strings up front"""
+        import ipaddress
+        scenario = TCPScenario(ipaddress.ip_address("127.0.0.1"), 9000).add_connect()
+
+        assert scenario.hostname == "127.0.0.1"
+        assert scenario.build_tcp_operations()[0]["hostname"] == "127.0.0.1"
+
+    def test_data_source_fields_substituted(self, tmp_path):
+        """Test operations read source.field values from the flat user data"""
+        csv_file = tmp_path / "users.csv"
+        csv_file.write_text("username\nalice\nbob\n")
+        scenario = TCPScenario("localhost", 9000)
+        scenario.load_data_file(str(csv_file), name="users")
+        scenario.add_send("LOGIN ${users.username}")
+
+        assert [scenario.build_tcp_operations(user_id)[0]["data"] for user_id in range(3)] == \
+            ["LOGIN alice", "LOGIN bob", "LOGIN alice"]
+
+    def test_operations_added_after_build(self):
+        """Test a later build picks up newly added operations"""
+        scenario = TCPScenario("localhost", 9000)
+        scenario.set_variable("n", 1)
+        scenario.add_send("${n}")
+        assert len(scenario.build_tcp_operations()) == 1
+
+        scenario.add_send("${n}${n}")
+        assert [op["data"] for op in scenario.build_tcp_operations()] == ["1", "11"]
+
+
+class TestRESTAPIScenario:
+    """Test REST helper request construction"""
+
+    def test_create_resource_json_body(self):
+        """Test data is serialized to JSON with a JSON content type"""
+        scenario = RESTAPIScenario("https://api.example.com/")
+        scenario.create_resource("/users", {"name": "Ada", "id": 1})
+
+        request = scenario.requests[0]
+        assert request.url == "https://api.example.com/users"
+        assert request.method == "POST"
+        assert json.loads(request.body) == {"name": "Ada", "id": 1}
+        assert request.headers == {"Content-Type": "application/json"}
+
+    def test_preserialized_body_sent_as_is(self):
+        """Test string payloads are not serialized again"""
+        scenario = RESTAPIScenario("https://api.example.com")
+        payload = '{"name":"Ada"}'
+        scenario.create_resource("users", payload).update_resource("users/1", payload)
+
+        assert [r.body for r in scenario.requests] == [payload, payload]
+
+    def test_extra_headers_do_not_leak(self):
+        """Test caller headers are merged without touching other requests"""
+        scenario = RESTAPIScenario("https://api.example.com")
+        scenario.update_resource("users/1", {"name": "Ada"}, {"Authorization": "Bearer t"})
+        scenario.update_resource("users/2", {"name": "Bob"})
+
+        assert scenario.requests[0].headers == {
+            "Content-Type": "application/json", "Authorization": "Bearer t"
+        }
+        assert scenario.requests[1].headers == {"Content-Type": "application/json"}
+
+    def test_default_headers_not_shared(self):
+        """Test editing one request's headers leaves later requests untouched"""
+        first = RESTAPIScenario("https://api.example.com").create_resource("a", {"n": 1})
+        first.requests[0].headers["X-Trace"] = "1"
+
+        second = RESTAPIScenario("https://api.example.com")
+        second.create_resource("b", {"n": 2}).update_resource("b/1", {"n": 3})
+
+        assert [r.headers for r in second.requests] == [{"Content-Type": "application/json"}] * 2
+
+    def test_bodies_json_accepts(self):
+        """Test int keys and integers wider than 64 bits serialize as with json"""
+        scenario = RESTAPIScenario("https://api.example.com")
+        scenario.create_resource("a", {1: "x"}).update_resource("a/1", {"big": 2 ** 70})
+
+        assert scenario.requests[0].body == '{"1":"x"}'
+        assert json.loads(scenario.requests[1].body) == {"big": 2 ** 70}
+
+
+class TestWebsiteScenario:
+    """Test website browsing helpers"""
+
+    def test_browse_page_records_think_time(self):
+        """Test think time is attached to the request instead of sleeping"""
+        scenario = WebsiteScenario("https://example.com")
+        scenario.browse_page("/", think_time=2.5).browse_page("/about")
+
+        built = scenario.build_requests()
+        assert [r["think_time_ms"] for r in built] == [2500, 0]
+        assert built[0]["headers"] == "User-Agent: LoadTest/1.0"
+
+
+class TestHARImport:
+    """Test building scenarios from HAR captures"""
+
+    def test_entries_become_requests(self, tmp_path):
+        """Test each HAR entry is turned into a request"""
+        har = {"log": {"entries": [
+            {"request": {"url": "https://example.com/", "method": "GET",
+                         "headers": [{"name": "Accept", "value": "text/html"}]}},
+            {"request": {"url": "https://example.com/api", "method": "POST",
+                         "headers": [],
+                         "postData": {"mimeType": "application/json", "text": "{\"a\": 1}"}}},
+        ]}}
+        har_file = tmp_path / "capture.har"
+        har_file.write_text(json.dumps(har))
+
+        scenario = create_scenario_from_har(str(har_file))
+
+        assert [r.to_dict() for r in scenario.requests] == [
+            {"url": "https://example.com/", "method": "GET",
+             "headers": "Accept: text/html", "body": "", "timeout_ms": 30000, "think_time_ms": 0},
+            {"url": "https://example.com/api", "method": "POST",
+             "headers": "", "body": "{\"a\": 1}", "timeout_ms": 30000, "think_time_ms": 0},
+        ]
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Tests for session storage, request header preparation and response extraction
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadspiker import session_manager
+from loadspiker.session_manager import SessionManager, SessionStore, ResponseExtractor
+
+
+class TestSessionStore:
+    """Test session storage"""
+
+    def test_cookie_header_tracks_cookies(self):
+        """Test the joined Cookie header follows set and clear calls"""
+        session = SessionStore()
+        assert session.get_cookie_header() == ""
+
+        session.set_cookie("sid", "abc")
+        session.set_cookie("theme", "dark")
+        session.set_cookie("sid", "def")
+        assert session.get_cookie_header() == "sid=def; theme=dark"
+
+        session.clear_cookies()
+        assert session.get_cookie_header() == ""
+
+        session.set_cookie("sid", "abc")
+        session.clear()
+        assert session.get_cookie_header() == ""
+
+
+class TestSessionCleanup:
+    """Test expiry of idle sessions"""
+
+    def test_idle_sessions_expire(self, monkeypatch):
+        """Test sessions idle past the timeout are dropped and recent ones kept"""
+        now = [0.0]
+        monkeypatch.setattr(session_manager.time, "time", lambda: now[0])
+        manager = SessionManager()
+        for user_id in range(3):
+            manager.get_session(user_id)
+
+        now[0] = 3000.0
+        manager.get_session(1)
+        now[0] = 3700.0
+        kept = manager.get_session(3)
+
+        assert list(manager._sessions) == ["1", "3"]
+        assert manager.get_session(3) is kept
+
+    def test_store_use_keeps_session_without_blocking_expiry(self, monkeypatch):
+        """Test a session used only through its store survives and older ones behind it expire"""
+        now = [0.0]
+        monkeypatch.setattr(session_manager.time, "time", lambda: now[0])
+        manager = SessionManager()
+        held = manager.get_session("A")
+        manager.get_session("B")
+
+        now[0] = 3000.0
+        manager.get_session("C")
+        now[0] = 3700.0
+        held.set_cookie("sid", "x")
+        now[0] = 4000.0
+        manager.get_session("D")
+
+        assert list(manager._sessions) == ["A", "C", "D"]
+
+
+class TestSessionStats:
+    """Test running cookie and token totals"""
+
+    def test_totals_follow_session_changes(self):
+        """Test totals track new keys, overwrites, clears and removed sessions"""
+        manager = SessionManager()
+        first, second = manager.get_session(1), manager.get_session(2)
+        first.set_cookie("sid", "a")
+        first.set_cookie("sid", "b")
+        first.set_cookie("theme", "dark")
+        second.set_cookie("sid", "c")
+        first.set_token("bearer", "t")
+        second.set_token("bearer", "t")
+        second.set_token("csrf", "x")
+
+        stats = manager.get_session_stats()
+        assert (stats["active_sessions"], stats["total_cookies"], stats["total_tokens"]) == (2, 3, 3)
+
+        second.clear_tokens()
+        first.clear_cookies()
+        assert (manager.get_session_stats()["total_cookies"], manager.get_session_stats()["total_tokens"]) == (1, 1)
+
+        manager.clear_session(2)
+        second.set_cookie("late", "1")
+        stats = manager.get_session_stats()
+        assert (stats["active_sessions"], stats["total_cookies"], stats["total_tokens"]) == (1, 0, 1)
+
+        manager.clear_all_sessions()
+        stats = manager.get_session_stats()
+        assert (stats["active_sessions"], stats["total_cookies"], stats["total_tokens"]) == (0, 0, 0)
+
+class TestPrepareRequestHeaders:
+    """Test session cookies and tokens are applied to request headers"""
+
+    def test_cookies_and_tokens_added(self):
+        """Test cookies, bearer, API key and custom tokens become headers"""
+        manager = SessionManager()
+        session = manager.get_session(1)
+        session.set_cookie("sid", "abc")
+        session.set_cookie("theme", "dark")
+        session.set_token("bearer", "tok")
+        session.set_token("api_key", "key")
+        session.set_token("csrf", "xyz")
+
+        headers = manager.prepare_request_headers(1, {"Accept": "*/*", "Cookie": "a=1"})
+
+        assert headers == {
+            "Accept": "*/*",
+            "Cookie": "a=1; sid=abc; theme=dark",
+            "Authorization": "Bearer tok",
+            "X-API-Key": "key",
+            "X-Csrf-Token": "xyz",
+        }
+
+    def test_base_headers_not_modified(self):
+        """Test the caller's headers and the cached session headers stay intact"""
+        manager = SessionManager()
+        manager.get_session(1).set_cookie("sid", "abc")
+        base = {"Cookie": "a=1"}
+
+        manager.prepare_request_headers(1, base)["X-Extra"] = "1"
+
+        assert base == {"Cookie": "a=1"}
+        assert manager.prepare_request_headers(1) == {"Cookie": "sid=abc"}
+
+    def test_session_changes_invalidate_cache(self):
+        """Test headers reflect cookies and tokens set after a previous call"""
+        manager = SessionManager()
+        session = manager.get_session(1)
+        session.set_cookie("sid", "abc")
+        assert manager.prepare_request_headers(1) == {"Cookie": "sid=abc"}
+
+        session.set_cookie("sid", "def")
+        session.set_token("bearer", "tok")
+        assert manager.prepare_request_headers(1) == {"Cookie": "sid=def", "Authorization": "Bearer tok"}
+
+        session.clear_tokens()
+        assert manager.prepare_request_headers(1) == {"Cookie": "sid=def"}
+
+    def test_expired_token_dropped_from_cached_headers(self, monkeypatch):
+        """Test a cached bearer token stops being sent once it expires"""
+        now = [1000.0]
+        monkeypatch.setattr(session_manager.time, "time", lambda: now[0])
+        manager = SessionManager()
+        manager.get_session(1).set_token("bearer", "tok", expires_at=1010.0)
+
+        assert manager.prepare_request_headers(1) == {"Authorization": "Bearer tok"}
+
+        now[0] = 1011.0
+        assert manager.prepare_request_headers(1) == {}
+
+
+class TestProcessResponse:
+    """Test extraction rules applied to responses"""
+
+    def test_rules_store_session_values(self):
+        """Test each rule type stores its value and the response is untouched"""
+        manager = SessionManager()
+        response = {
+            "status_code": 200,
+            "body": '{"user": {"id": 7}}',
+            "headers": "Content-Type: application/json\nX-Request-Id: r1\nSet-Cookie: sid=abc; Path=/",
+        }
+        manager.process_response(1, response, [
+            {"type": "json_path", "path": "user.id", "variable": "user_id"},
+            {"type": "header", "header_name": "X-Request-Id", "variable": "request_id"},
+            {"type": "cookie", "cookie_name": "sid", "variable": "sid"},
+            {"type": "status_code", "variable": "status"},
+        ])
+
+        session = manager.get_session(1)
+        assert [session.get(k) for k in ("user_id", "request_id", "sid", "status")] == [7, "r1", "abc", 200]
+        assert isinstance(response["headers"], str)
+
+    def test_unknown_rule_type_rejected(self):
+        """Test an unknown extraction type raises ValueError"""
+        with pytest.raises(ValueError, match="Unknown extraction type"):
+            SessionManager()._extract_value_by_rule({}, {"type": "xpath"})
+
+
+class TestAutoHandleCookies:
+    """Test cookies are harvested from Set-Cookie headers"""
+
+    def test_string_headers(self):
+        """Test every Set-Cookie line is stored with its attributes"""
+        manager = SessionManager()
+        manager.auto_handle_cookies(1, {"headers": (
+            "Content-Type: text/html\n"
+            "Set-Cookie: sid=abc=; Path=/app; Domain=example.com; HttpOnly\n"
+            "set-cookie: theme=dark\n"
+            "Set-Cookie: broken"
+        )})
+
+        session = manager.get_session(1)
+        assert session.get_all_cookies() == {"sid": "abc=", "theme": "dark"}
+        assert session.get("_cookie_meta_sid") == {"domain": "example.com", "path": "/app"}
+        assert session.get("_cookie_meta_theme") is None
+
+    def test_dict_headers_and_quoted_values(self):
+        """Test list-valued headers and quoted cookie values"""
+        manager = SessionManager()
+        manager.auto_handle_cookies(1, {"headers": {
+            "Set-Cookie": ["a=1", 'b="two words"; Path=/']
+        }})
+
+        assert manager.get_session(1).get_all_cookies() == {"a": "1", "b": "two words"}
+
+
+class TestResponseExtractor:
+    """Test value extraction from responses"""
+
+    def test_compile_path(self):
+        """Test paths compile to (key, index) steps"""
+        assert ResponseExtractor.compile_path("items[0].id") == (("items", 0), ("id", None))
+        assert ResponseExtractor.compile_path("[2].name") == ((None, 2), ("name", None))
+
+    def test_extract_json_path(self):
+        """Test nested keys and list indexes are followed"""
+        body = '{"user": {"name": "ada"}, "items": [{"id": 1}, {"id": 2}], "rows": [[5, 6]]}'
+
+        assert ResponseExtractor.extract_json_path(body, "user.name") == "ada"
+        assert ResponseExtractor.extract_json_path(body, "items[1].id") == 2
+        assert ResponseExtractor.extract_json_path(body, "rows[0]") == [5, 6]
+        assert ResponseExtractor.extract_json_path(body, "items[5].id") is None
+        assert ResponseExtractor.extract_json_path(body, "user.missing") is None
+
+    def test_extract_regex(self):
+        """Test groups are returned and bad patterns yield None"""
+        body = '<input name="csrf" value="t0k3n">'
+
+        assert ResponseExtractor.extract_regex(body, r'value="(\w+)"') == "t0k3n"
+        assert ResponseExtractor.extract_regex(body, r'value="\w+"', 0) == 'value="t0k3n"'
+        assert ResponseExtractor.extract_regex(body, r'missing="(\w+)"') is None
+        assert ResponseExtractor.extract_regex(body, r'(unclosed') is None
+
+    def test_extract_url_parameter(self):
+        """Test query values are decoded and blank values skipped"""
+        url = "https://example.com/cb?code=a%2Fb+c&empty=&state=x&state=y&my%20key=1#frag?code=z"
+
+        assert ResponseExtractor.extract_url_parameter(url, "code") == "a/b c"
+        assert ResponseExtractor.extract_url_parameter(url, "state") == "x"
+        assert ResponseExtractor.extract_url_parameter(url, "my key") == "1"
+        assert ResponseExtractor.extract_url_parameter(url, "empty") is None
+        assert ResponseExtractor.extract_url_parameter("https://example.com/", "code") is None
+
+    def test_extract_cookie_from_headers(self):
+        """Test a named cookie is found and attributes are not mistaken for cookies"""
+        headers = {"set-cookie": "sid=abc; Path=/; HttpOnly; theme=dark"}
+
+        assert ResponseExtractor.extract_cookie_from_headers(headers, "sid") == "abc"
+        assert ResponseExtractor.extract_cookie_from_headers(headers, "theme") == "dark"
+        assert ResponseExtractor.extract_cookie_from_headers(headers, "Path") is None
+        assert ResponseExtractor.extract_cookie_from_headers(headers, "missing") is None
+        assert ResponseExtractor.extract_cookie_from_headers(
+            "Set-Cookie: token=\"a b\"; Path=/", "token") == "a b"
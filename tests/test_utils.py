@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Tests for load testing utility functions
+"""
+
+import sys
+import os
+
+import pytest
+from unittest.mock import Mock
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadspiker import utils
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "pure-python"])
+def numpy_toggle(request, monkeypatch):
+    """Run a test with and without the optional numpy path"""
+    if request.param and not utils._numpy_available:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(utils, "_numpy_available", request.param)
+
+
+class TestCalculatePercentiles:
+    """Test percentile calculation"""
+
+    def test_order_statistics(self, numpy_toggle):
+        """Test each percentile picks the expected order statistic"""
+        values = [float(v) for v in range(100, 0, -1)]
+
+        assert utils.calculate_percentiles(values) == {50: 50.0, 90: 90.0, 95: 95.0, 99: 99.0}
+        assert utils.calculate_percentiles(values, [0, 100]) == {0: 1.0, 100: 100.0}
+
+    def test_empty_values(self, numpy_toggle):
+        """Test no values yields zeros"""
+        assert utils.calculate_percentiles([], [50, 99]) == {50: 0.0, 99: 0.0}
+
+
+class TestCalculatePercentilesBatch:
+    """Test percentiles for several metrics at once"""
+
+    def test_matches_single_metric(self, numpy_toggle):
+        """Test each metric's result equals calculate_percentiles on it alone"""
+        metrics = {
+            "latency": [float((i * 37) % 101) for i in range(200)],
+            "ttfb": utils.LatencyAccumulator(float((i * 13) % 97) for i in range(200)),
+            "bytes": [float(i) for i in range(50, 0, -1)],
+            "empty": [],
+        }
+
+        result = utils.calculate_percentiles_batch(metrics, [50, 95, 99])
+
+        assert list(result) == list(metrics)
+        for name, values in metrics.items():
+            assert result[name] == utils.calculate_percentiles(values, [50, 95, 99])
+
+
+class TestLatencyAccumulator:
+    """Test the float64 latency sample store"""
+
+    def test_percentiles_match_list(self, numpy_toggle):
+        """Test percentiles of accumulated samples equal those of a plain list"""
+        values = [float((i * 37) % 101) for i in range(500)]
+        acc = utils.LatencyAccumulator(values[:100])
+        for v in values[100:400]:
+            acc.add(v)
+        acc.extend(values[400:])
+
+        assert len(acc) == 500
+        assert utils.calculate_percentiles(acc) == utils.calculate_percentiles(values)
+
+    def test_clear(self):
+        """Test a cleared accumulator reports zero percentiles"""
+        acc = utils.LatencyAccumulator([1.0, 2.0])
+        acc.clear()
+
+        assert len(acc) == 0
+        assert utils.calculate_percentiles(acc, [50]) == {50: 0.0}
+
+
+class TestLoadPatterns:
+    """Test load pattern generators"""
+
+    def test_ramp_up_steps_are_exact(self):
+        """Test ramp steps interpolate without float drift"""
+        steps = list(utils.ramp_up(0, 5, 47, 3))
+        assert [users for users, _ in steps[:-1]] == [5 * i // 15 for i in range(15)]
+        assert steps[-1] == (5, 2)
+        assert list(utils.ramp_up(100, 10, 30, 10)) == [(100, 10), (70, 10), (40, 10)]
+
+    def test_stress_test_steps(self):
+        """Test stress steps climb by step_size without passing max_users"""
+        assert list(utils.stress_test(35, 10, 5)) == [(10, 5), (20, 5), (30, 5)]
+        assert list(utils.stress_test(5, 10, 5)) == []
+
+
+class TestParseLoadPattern:
+    """Test load pattern string parsing"""
+
+    def test_supported_patterns(self):
+        """Test each pattern type yields its (users, duration) steps"""
+        assert list(utils.parse_load_pattern("constant:100:60")) == [(100, 60)]
+        assert list(utils.parse_load_pattern("RAMP:10:30:10")) == [(10, 5), (20, 5)]
+        assert list(utils.parse_load_pattern("spike:50:200:30")) == [(50, 30), (200, 30), (50, 30)]
+        assert list(utils.parse_load_pattern("spike:50:200:30:20")) == [(50, 10), (200, 30), (50, 10)]
+
+    def test_repeated_pattern_yields_fresh_generator(self):
+        """Test a cached pattern string still produces a full pattern each time"""
+        first = list(utils.parse_load_pattern("constant:5:10"))
+        assert list(utils.parse_load_pattern("constant:5:10")) == first
+
+    @pytest.mark.parametrize("pattern", [
+        "constant:100", "constant:100:60:5", "ramp:10:100", "spike:1:2:3:4:5", "ramp:a:b:c", "ramp",
+    ])
+    def test_malformed_patterns_rejected(self, pattern):
+        """Test wrong field counts and non-numeric fields raise ValueError"""
+        with pytest.raises(ValueError, match="Invalid load pattern"):
+            utils.parse_load_pattern(pattern)
+
+    def test_unknown_pattern_type(self):
+        """Test an unknown pattern type raises ValueError"""
+        with pytest.raises(ValueError, match="Unknown load pattern type"):
+            utils.parse_load_pattern("wave:1:2")
+
+
+class TestGenerateTestData:
+    """Test templated test data generation"""
+
+    def test_placeholders_substituted(self):
+        """Test placeholders are filled per row and other values copied"""
+        rows = utils.generate_test_data(3, {
+            "name": "user_${INDEX}",
+            "ids": "${UUID}/${UUID}",
+            "score": "${RANDOM_INT}",
+            "plain": "no placeholders ${OTHER}",
+            "age": 30,
+        })
+
+        assert [row["name"] for row in rows] == ["user_0", "user_1", "user_2"]
+        first, second = rows[0]["ids"].split("/")
+        assert first == second and len(first) == 36
+        assert rows[0]["ids"] != rows[1]["ids"]
+        assert all(1 <= int(row["score"]) <= 1000 for row in rows)
+        assert all(row["plain"] == "no placeholders ${OTHER}" and row["age"] == 30 for row in rows)
+        assert list(rows[0]) == ["name", "ids", "score", "plain", "age"]
+
+    def test_time_placeholders(self):
+        """Test timestamp and datetime placeholders render current time"""
+        row = utils.generate_test_data(1, {"ts": "${TIMESTAMP}", "dt": "at ${DATETIME}"})[0]
+
+        assert abs(int(row["ts"]) - int(utils.time.time())) <= 1
+        assert row["dt"].startswith("at 20")
+
+    def test_time_snapshot(self, monkeypatch):
+        """Test rows share one timestamp unless fresh_datetime is set"""
+        now = [1000.0]
+
+        def clock():
+            now[0] += 1
+            return now[0]
+
+        monkeypatch.setattr(utils.time, "time", clock)
+        template = {"ts": "${TIMESTAMP}"}
+
+        assert [row["ts"] for row in utils.generate_test_data(3, template)] == ["1001"] * 3
+        assert [row["ts"] for row in utils.generate_test_data(3, template, fresh_datetime=True)] == [
+            "1002", "1003", "1004"]
+
+
+class TestValidateResponses:
+    """Test batch response validation"""
+
+    RESPONSES = [
+        {"status_code": 200, "body": "ok", "response_time_us": 1000},
+        {"status_code": 200, "body": "error", "response_time_us": 1000},
+        {"status_code": 200, "body": "ok", "response_time_us": 6000},
+        {"status_code": 500, "body": "ok", "response_time_us": 1000},
+        {},
+    ]
+
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"expected_content": "ok"},
+        {"max_response_time_ms": 5},
+        {"expected_status": 500, "expected_content": "ok", "max_response_time_ms": 5},
+    ])
+    def test_matches_validate_response(self, kwargs):
+        """Test each result equals validate_response for the same response"""
+        expected = [utils.validate_response(r, **kwargs) for r in self.RESPONSES]
+        assert utils.validate_responses(self.RESPONSES, **kwargs) == expected
+
+
+class TestWaitForCondition:
+    """Test polling for a condition"""
+
+    def test_fast_condition_detected_quickly(self):
+        """Test a condition that becomes true soon is seen well before a full interval"""
+        calls = []
+        start = utils.time.monotonic()
+
+        assert utils.wait_for_condition(lambda: calls.append(1) or len(calls) >= 3,
+                                        timeout=5, check_interval=1.0)
+        assert utils.time.monotonic() - start < 0.5
+
+    def test_timeout(self):
+        """Test a condition that never holds returns False after the timeout"""
+        start = utils.time.monotonic()
+
+        assert not utils.wait_for_condition(lambda: False, timeout=0.2, check_interval=0.05)
+        assert 0.2 <= utils.time.monotonic() - start < 1.0
+
+
+class _SlowEngine:
+    """Engine stand-in whose requests take a fixed time"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+
+    def execute_request(self, url, method="GET", headers=None, body="", timeout_ms=30000):
+        self.calls.append(url)
+        utils.time.sleep(self.delay)
+        return {"url": url, "method": method}
+
+
+class TestCreateUserSession:
+    """Test the sequential user session helper"""
+
+    def _batch_engine(self):
+        """Engine whose backend records the batches it is sent"""
+        class _BatchBackend:
+            def __init__(self):
+                self.batches = []
+
+            def execute_requests(self, requests):
+                self.batches.append(requests)
+                return [{"url": r["url"], "body": r["body"]} for r in requests]
+
+        engine = utils.Engine(max_connections=1, worker_threads=1)
+        engine._engine = _BatchBackend()
+        return engine
+
+    def test_engine_gets_whole_session(self):
+        """Test an Engine receives the session in one execute_requests call"""
+        engine = self._batch_engine()
+        requests = [{"url": "/a"}, {"url": "/b", "headers": {"Accept": "*/*"}, "delay_ms": 5}]
+
+        assert [r["url"] for r in utils.create_user_session(engine, requests)] == ["/a", "/b"]
+        assert len(engine._engine.batches) == 1
+        assert engine._engine.batches[0][1] == {
+            "url": "/b", "method": "GET", "headers": "Accept: */*", "body": "",
+            "timeout_ms": 30000, "delay_ms": 5}
+
+    def test_dict_bodies_serialized(self):
+        """Test dict and list bodies are sent as JSON strings"""
+        requests = [{"url": "/a", "body": {"n": 1}}, {"url": "/b", "body": [1, 2]}, {"url": "/c", "body": "raw"}]
+
+        responses = utils.create_user_session(self._batch_engine(), requests)
+
+        assert [r["body"].replace(" ", "") for r in responses] == ['{"n":1}', "[1,2]", "raw"]
+        assert requests[0]["body"] == {"n": 1}
+
+    def test_other_engines_called_per_request(self):
+        """Test engine objects other than Engine are called per request"""
+        engine = Mock()
+        engine.execute_request.side_effect = lambda **kwargs: {"url": kwargs["url"]}
+
+        responses = utils.create_user_session(engine, [{"url": "/a"}, {"url": "/b", "body": {"n": 1}}])
+
+        assert responses == [{"url": "/a"}, {"url": "/b"}]
+        assert not engine.execute_requests.called
+        assert engine.execute_request.call_args.kwargs["body"].replace(" ", "") == '{"n":1}'
+
+    def test_per_request_fallback(self):
+        """Test engines without execute_requests are called per request"""
+        engine = _SlowEngine(0)
+        responses = utils.create_user_session(engine, [{"url": "/a"}, {"url": "/b", "method": "POST"}])
+
+        assert responses == [{"url": "/a", "method": "GET"}, {"url": "/b", "method": "POST"}]
+
+    def test_failure_keeps_completed_responses(self):
+        """Test a failed request raises with the earlier responses attached"""
+        engine = Mock()
+        engine.execute_request.side_effect = [{"url": "/a"}, RuntimeError("Failed to execute request")]
+
+        with pytest.raises(RuntimeError) as excinfo:
+            utils.create_user_session(engine, [{"url": "/a"}, {"url": "/b"}, {"url": "/c"}])
+
+        assert excinfo.value.responses == [{"url": "/a"}]
+        assert engine.execute_request.call_count == 2
+
+
+class TestCreateUserSessionAsync:
+    """Test the concurrent user session helper"""
+
+    def test_parallel_requests_overlap_and_keep_order(self):
+        """Test flagged requests run together and responses stay in request order"""
+        import asyncio
+        engine = _SlowEngine(0.2)
+        requests = [{"url": "/login", "method": "POST"}] + \
+            [{"url": f"/item/{i}", "parallel": True} for i in range(4)] + [{"url": "/logout"}]
+
+        start = utils.time.monotonic()
+        responses = asyncio.run(utils.create_user_session_async(engine, requests))
+        elapsed = utils.time.monotonic() - start
+
+        assert [r["url"] for r in responses] == [r["url"] for r in requests]
+        assert responses[0]["method"] == "POST"
+        assert engine.calls[0] == "/login" and engine.calls[-1] == "/logout"
+        assert elapsed < 1.0